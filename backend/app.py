@@ -3,15 +3,34 @@
 음성 주문 시스템 백엔드 - FastAPI + SQLite
 분리된 모듈들을 사용하는 메인 애플리케이션
 """
+import asyncio
+import hmac
+import os
 import uvicorn
-from fastapi import FastAPI
+from fastapi import FastAPI, Depends, Header, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 
 from database import DatabaseManager
+from async_database import AsyncDatabaseManager
+from catalog import CatalogStore, MenuCatalog
+from http_cache import quote_etag, etag_matches
+from voice_guide import VoiceGuideCache
+from menu_io import parse_menu, format_menu
+from voice_match import NameIndexCache
+from menu_search import parse_terms, build_match, describe_results
+from pagination import encode_cursor, decode_cursor
+from order_events import OrderEventBroker, ORDER_CREATED, ORDER_STATUS_CHANGED
+from order_status import STATUSES, ACTIVE_STATUSES
+from order_export import EXPORT_FORMATS, export_chunks
+from idempotency import IdempotencyStore, IdempotencyConflict, IDEMPOTENCY_KEY_MAX_LENGTH, request_fingerprint
+from order_numbers import OrderNumberAllocator
+from order_writer import GroupCommitWriter
+from order_pricing import PricingError, price_order
+from metrics import MetricsMiddleware, RequestMetrics, PROMETHEUS_CONTENT_TYPE
 from models import *
-from typing import List, Dict, Any, Optional
-from datetime import datetime
-import uuid
+from typing import List, Dict, Any, AsyncIterator, Iterator, Optional, Tuple
+from datetime import date, datetime, timedelta, timezone
 from fastapi import HTTPException
 
 # FastAPI 애플리케이션
@@ -26,45 +45,139 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 요청 지표 (/metrics, Prometheus 텍스트 형식) - METRICS_ENABLED=0이면 수집하지 않는다
+request_metrics = RequestMetrics()
+if os.environ.get("METRICS_ENABLED", "1") == "1":
+    app.add_middleware(MetricsMiddleware, metrics=request_metrics)
+
 # 데이터베이스 매니저 인스턴스
-db_manager = DatabaseManager()
+db_manager = DatabaseManager(pool_size=int(os.environ.get("DB_POOL_SIZE", "5")))
+
+# 비동기 DB 접근 (DB 작업은 전용 스레드 풀에서 실행)
+async_db = AsyncDatabaseManager(db_manager, max_workers=int(os.environ.get("DB_MAX_WORKERS", "0")) or None)
+
+# 메뉴 카탈로그 (메뉴 조회는 메모리 스냅샷에서 처리)
+catalog_store = CatalogStore(db_manager)
+
+# 메뉴 응답 캐시 정책 (기본값은 매번 ETag로 재검증)
+MENU_CACHE_CONTROL = os.environ.get("MENU_CACHE_CONTROL", "no-cache")
+
+# 음성 안내 캐시 (메뉴 버전이 바뀔 때만 다시 생성)
+voice_guide_cache = VoiceGuideCache(async_db)
+
+# 음성 명령 매칭용 메뉴 이름 색인 (카탈로그 버전마다 한 번 생성)
+name_index_cache = NameIndexCache()
+
+# 주방 화면 등으로 보내는 주문 이벤트 (SSE)
+order_events = OrderEventBroker(
+    history_size=int(os.environ.get("ORDER_EVENT_HISTORY", "1000")),
+    max_queue=int(os.environ.get("ORDER_EVENT_QUEUE", "256"))
+)
+SSE_KEEPALIVE_SECONDS = 15.0
+
+# 주문 Idempotency-Key (같은 키로 다시 보낸 주문은 처음 응답을 그대로 돌려준다)
+IDEMPOTENCY_TTL_SECONDS = float(os.environ.get("IDEMPOTENCY_TTL_SECONDS", "86400"))
+idempotency_store = IdempotencyStore(
+    max_entries=int(os.environ.get("IDEMPOTENCY_CACHE_SIZE", "10000")),
+    ttl=IDEMPOTENCY_TTL_SECONDS
+)
+
+# 주문 그룹 커밋 (ORDER_GROUP_COMMIT=1이면 동시에 들어온 주문을 쓰기 스레드가 모아서 한 번에 커밋)
+order_writer: Optional[GroupCommitWriter] = None
+if os.environ.get("ORDER_GROUP_COMMIT", "0") == "1":
+    order_writer = GroupCommitWriter(
+        db_manager,
+        max_batch=int(os.environ.get("ORDER_GROUP_COMMIT_BATCH", "32")),
+        max_delay_ms=float(os.environ.get("ORDER_GROUP_COMMIT_DELAY_MS", "5"))
+    )
+
+# 주문 번호 발급 (매장/날짜별 번호를 워커마다 ORDER_NUMBER_BLOCK개씩 DB에서 예약)
+order_numbers = OrderNumberAllocator(
+    lambda store_id, day, count: async_db.reserve_order_numbers(store_id, day, count),
+    store_id=os.environ.get("STORE_ID", "A"),
+    block_size=int(os.environ.get("ORDER_NUMBER_BLOCK", "20"))
+)
+
+# 관리자 API 토큰 (설정하지 않으면 관리자 API를 쓸 수 없다)
+ADMIN_TOKEN = os.environ.get("ADMIN_TOKEN") or None
+
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    if ADMIN_TOKEN is None:
+        raise HTTPException(status_code=503, detail="관리자 API가 꺼져 있습니다. ADMIN_TOKEN 환경 변수를 설정해주세요.")
+    if x_admin_token is None or not hmac.compare_digest(x_admin_token.encode(), ADMIN_TOKEN.encode()):
+        raise HTTPException(status_code=401, detail="관리자 토큰이 올바르지 않습니다.")
+
+async def current_catalog() -> MenuCatalog:
+    """현재 카탈로그 조회 (버전 확인이 필요하면 DB 스레드 풀에서 실행)"""
+    if catalog_store.check_due():
+        return await async_db.run(catalog_store.refresh)
+    return catalog_store.current
+
+def catalog_headers(catalog: MenuCatalog) -> Dict[str, str]:
+    return {"ETag": quote_etag(catalog.etag), "Cache-Control": MENU_CACHE_CONTROL}
+
+async def menu_catalog(request: Request, response: Response) -> MenuCatalog:
+    """메뉴 조회용 의존성 - ETag가 일치하면 핸들러 실행 없이 304 응답"""
+    catalog = await current_catalog()
+    headers = catalog_headers(catalog)
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        raise HTTPException(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return catalog
+
+@app.on_event("shutdown")
+async def shutdown():
+    if order_writer is not None:
+        order_writer.close()
+    async_db.close()
 
 @app.get("/")
 async def root():
     return {"message": "음성 주문 시스템 API"}
 
+@app.get("/db/stats")
+async def get_db_stats():
+    """DB 커넥션 풀, DB 스레드 풀, 주문 멱등성 키 캐시, 주문 번호 발급, 주문 그룹 커밋 통계 조회"""
+    return {
+        "pool": db_manager.pool_stats(),
+        "executor": async_db.stats(),
+        "idempotency": idempotency_store.stats(),
+        "order_numbers": order_numbers.stats(),
+        "order_writer": order_writer.stats() if order_writer is not None else None
+    }
+
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    """라우트별 요청 수, 처리 중인 요청 수, 지연 시간, 요청당 DB 쿼리 수/시간 (Prometheus 텍스트 형식)"""
+    # media_type으로 주면 charset이 한 번 더 붙으므로 헤더로 직접 지정한다
+    return Response(content=request_metrics.render(), headers={"Content-Type": PROMETHEUS_CONTENT_TYPE})
+
+@app.get("/catalog", response_model=CatalogResponse)
+async def get_catalog(catalog: MenuCatalog = Depends(menu_catalog)):
+    """카테고리, 판매 중인 메뉴, 옵션 그룹을 한 번에 조회 (키오스크 초기 로딩용)"""
+    return Response(content=catalog.bootstrap_body, media_type="application/json", headers=catalog_headers(catalog))
+
 @app.get("/categories", response_model=List[CategoryResponse])
-async def get_categories():
+async def get_categories(catalog: MenuCatalog = Depends(menu_catalog)):
     """모든 카테고리 조회"""
-    return db_manager.get_categories()
+    return catalog.get_categories()
 
 @app.get("/categories/{category_id}/menu", response_model=List[MenuItemResponse])
-async def get_menu_by_category(category_id: int):
+async def get_menu_by_category(category_id: int, catalog: MenuCatalog = Depends(menu_catalog)):
     """특정 카테고리의 메뉴 조회"""
-    menu_items = db_manager.get_menu_items_by_category(category_id)
+    menu_items = catalog.get_menu_items_by_category(category_id)
     if not menu_items:
         raise HTTPException(status_code=404, detail="카테고리를 찾을 수 없습니다.")
     return menu_items
 
 @app.get("/menu/{item_id}", response_model=MenuItemDetailResponse)
-async def get_menu_item_detail(item_id: int):
+async def get_menu_item_detail(item_id: int, catalog: MenuCatalog = Depends(menu_catalog)):
     """특정 메뉴 아이템의 상세 정보 조회 (옵션 포함)"""
-    menu_item = db_manager.get_menu_item_by_id(item_id)
+    menu_item = catalog.get_menu_item_by_id(item_id)
     if not menu_item:
         raise HTTPException(status_code=404, detail="메뉴 아이템을 찾을 수 없습니다.")
     
-    # 카테고리에 따른 옵션 타입 결정
-    category_name = menu_item['category_name']
-    if category_name == "돈카츠,카레":
-        option_type = "donkatsu"
-    elif category_name == "1인정식":
-        option_type = "set_meal"
-    else:
-        option_type = None
-    
-    available_options = []
-    if option_type:
-        available_options = db_manager.get_options_by_type(option_type)
+    available_options = catalog.get_options_for_item(menu_item)
     
     return MenuItemDetailResponse(
         **menu_item,
@@ -72,113 +185,328 @@ async def get_menu_item_detail(item_id: int):
     )
 
 @app.get("/options/{option_type}", response_model=List[OptionResponse])
-async def get_options_by_type(option_type: str):
+async def get_options_by_type(option_type: str, catalog: MenuCatalog = Depends(menu_catalog)):
     """옵션 타입별 옵션 조회"""
     if option_type not in ["donkatsu", "set_meal"]:
         raise HTTPException(status_code=400, detail="올바른 옵션 타입을 입력해주세요. (donkatsu, set_meal)")
     
-    return db_manager.get_options_by_type(option_type)
+    return catalog.get_options_by_type(option_type)
 
 @app.post("/orders", response_model=OrderResponse)
-async def create_order(order_request: CreateOrderRequest):
-    """주문 생성"""
-    order_number = f"ORD-{datetime.now().strftime('%Y%m%d%H%M%S')}-{str(uuid.uuid4())[:8]}"
+async def create_order(order_request: CreateOrderRequest, response: Response,
+                       idempotency_key: Optional[str] = Header(None)):
+    """주문 생성 (Idempotency-Key 헤더를 주면 같은 키로 다시 보내도 주문은 한 번만 생성)"""
+    if idempotency_key is None:
+        return (await place_new_order(order_request))['response']
+    if not idempotency_key or len(idempotency_key) > IDEMPOTENCY_KEY_MAX_LENGTH:
+        raise HTTPException(status_code=400, detail=f"Idempotency-Key는 1~{IDEMPOTENCY_KEY_MAX_LENGTH}자여야 합니다.")
+    request_hash = request_fingerprint(order_request.model_dump(mode="json"))
     
+    async def create():
+        # 메모리 캐시에 없으면 DB 기록을 먼저 확인해서 가격 계산 없이 처음 응답을 돌려준다
+        record = await async_db.get_idempotency_record(idempotency_key, IDEMPOTENCY_TTL_SECONDS)
+        if record is None:
+            record = await place_new_order(order_request, {
+                'key': idempotency_key,
+                'request_hash': request_hash,
+                'ttl': IDEMPOTENCY_TTL_SECONDS
+            })
+        else:
+            record['replayed'] = True
+        return record['request_hash'], record['response'], record['replayed']
+    
+    try:
+        result, replayed = await idempotency_store.run(idempotency_key, request_hash, create)
+    except IdempotencyConflict as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    if idempotency_store.purge_due():
+        await async_db.purge_idempotency_keys(IDEMPOTENCY_TTL_SECONDS)
+    if replayed:
+        response.headers["Idempotent-Replayed"] = "true"
+    return result
+
+async def place_new_order(order_request: CreateOrderRequest,
+                          idempotency: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """가격을 계산해서 주문을 저장하고 이벤트를 발행 - {'request_hash', 'response', 'replayed'} 반환
+
+    idempotency={'key', 'request_hash', 'ttl'}가 DB에 이미 있으면 저장된 응답을 반환한다.
+    """
     # 총 금액 계산
-    total_amount = 0
-    order_items_data = []
-    
-    for item in order_request.items:
-        menu_item = db_manager.get_menu_item_by_id(item.menu_item_id)
-        if not menu_item:
-            raise HTTPException(status_code=404, detail=f"메뉴 아이템 ID {item.menu_item_id}를 찾을 수 없습니다.")
-        
-        # 메뉴 아이템 기본 가격
-        item_total = menu_item['price'] * item.quantity
-        
-        # 옵션 가격 추가
-        for option in item.options:
-            options = db_manager.get_options_by_type("donkatsu" if menu_item['category_name'] == "돈카츠,카레" else "set_meal")
-            option_data = next((opt for opt in options if opt['id'] == option.option_id), None)
-            if not option_data:
-                raise HTTPException(status_code=404, detail=f"옵션 ID {option.option_id}를 찾을 수 없습니다.")
-            item_total += option_data['price'] * option.quantity
-        
-        total_amount += item_total
-        order_items_data.append({
-            'menu_item_id': item.menu_item_id,
-            'quantity': item.quantity,
-            'item_price': menu_item['price'],
-            'total_price': item_total,
-            'options': item.options
+    catalog = await current_catalog()
+    try:
+        total_amount, order_items_data, order_options_data = price_order(catalog, order_request.items)
+    except PricingError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    
+    created_at = datetime.now()
+    # 가격 계산에 실패한 요청은 번호를 쓰지 않는다
+    order_number = await order_numbers.allocate(created_at)
+    if idempotency is not None:
+        # 주문과 함께 저장할 응답 (id는 저장할 때 채운다)
+        idempotency = dict(idempotency, response={
+            'order_number': order_number,
+            'total_amount': total_amount,
+            'status': 'pending',
+            'created_at': created_at.isoformat()
         })
     
-    # 주문 생성
-    order_id = db_manager.create_order({
-        'order_number': order_number,
-        'total_amount': total_amount,
-        'status': 'pending'
-    })
+    # 주문, 주문 아이템, 옵션을 한 트랜잭션으로 저장 (그룹 커밋이면 다른 주문과 같은 트랜잭션)
+    place_order = order_writer.place_order if order_writer is not None else async_db.place_order
+    order_ids = await place_order(
+        {
+            'order_number': order_number,
+            'total_amount': total_amount,
+            'status': 'pending'
+        },
+        order_items_data,
+        order_options_data,
+        idempotency
+    )
+    record = order_ids.get('idempotency_record')
+    if record is not None and record['replayed']:
+        return record
+    order_id = order_ids['order_id']
     
-    # 주문 아이템들 추가
-    for item_data in order_items_data:
-        order_item_id = db_manager.add_order_item(order_id, item_data)
-        
-        # 옵션들 추가
-        for option in item_data['options']:
-            option_data = next((opt for opt in db_manager.get_options_by_type("donkatsu" if menu_item['category_name'] == "돈카츠,카레" else "set_meal") if opt['id'] == option.option_id), None)
-            if option_data:
-                db_manager.add_order_item_option(order_item_id, {
-                    'option_id': option.option_id,
-                    'quantity': option.quantity,
-                    'option_price': option_data['price']
-                })
-    
-    return OrderResponse(
+    response = OrderResponse(
         id=order_id,
         order_number=order_number,
         total_amount=total_amount,
         status='pending',
-        created_at=datetime.now()
+        created_at=created_at
     )
+    order_events.publish(ORDER_CREATED, dict(
+        response.model_dump(mode="json"),
+        items=[
+            {
+                'menu_item_id': item['menu_item_id'],
+                'name': catalog.get_menu_item_by_id(item['menu_item_id'])['name'],
+                'quantity': item['quantity'],
+                'options': [
+                    catalog.get_option_by_id(option['option_id'])['name']
+                    for option in order_options_data if option['item_index'] == index
+                ]
+            }
+            for index, item in enumerate(order_items_data)
+        ]
+    ))
+    if record is not None:
+        return record
+    return {'request_hash': None, 'response': response.model_dump(mode="json"), 'replayed': False}
 
-@app.get("/voice-guide", response_model=VoiceGuideResponse)
-async def get_voice_guide():
-    """음성 안내를 위한 카테고리 및 샘플 메뉴 정보"""
-    categories = db_manager.get_categories()
+def to_db_timestamp(value: Optional[datetime]) -> Optional[str]:
+    """created_at(CURRENT_TIMESTAMP, UTC)과 비교할 수 있는 문자열로 변환"""
+    if value is None:
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.strftime("%Y-%m-%d %H:%M:%S")
+
+@app.get("/orders", response_model=OrderListResponse)
+async def list_orders(status: Optional[str] = None, since: Optional[datetime] = None,
+                      until: Optional[datetime] = None, cursor: Optional[str] = None,
+                      limit: int = 50):
+    """주문 목록 최신순 조회 (since 이상, until 미만 / 다음 페이지는 next_cursor로 조회)"""
+    limit = min(max(limit, 1), 200)
+    before = None
+    if cursor:
+        try:
+            before = decode_cursor(cursor, 2)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    
+    page = await async_db.list_orders(status, to_db_timestamp(since), to_db_timestamp(until), before, limit)
+    return {
+        "orders": page['orders'],
+        "next_cursor": encode_cursor(page['next_before']) if page['next_before'] else None
+    }
+
+@app.get("/orders/active", response_model=List[OrderDetailResponse])
+async def list_active_orders(status: Optional[str] = None, limit: int = 50):
+    """진행 중인 주문을 오래된 순으로 조회 (주방 작업 대기열)
+
+    다음에 부를 주문은 status=ready&limit=1로 조회한다.
+    """
+    if status is not None and status not in ACTIVE_STATUSES:
+        raise HTTPException(status_code=400, detail=f"진행 중인 상태를 입력해주세요. ({', '.join(ACTIVE_STATUSES)})")
+    return await async_db.list_active_orders(status, min(max(limit, 1), 200))
+
+@app.post("/orders/{order_number}/status", response_model=OrderResponse)
+async def update_order_status(order_number: str, update_request: OrderStatusUpdateRequest):
+    """주문 상태 변경 (pending → accepted → cooking → ready → picked_up, 완료 전에는 cancelled 가능)"""
+    if update_request.status not in STATUSES:
+        raise HTTPException(status_code=400, detail=f"올바른 주문 상태를 입력해주세요. ({', '.join(STATUSES)})")
+    try:
+        order = await async_db.transition_order(order_number, update_request.status, update_request.note)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if not order:
+        raise HTTPException(status_code=404, detail="주문을 찾을 수 없습니다.")
+    
+    order_events.publish(ORDER_STATUS_CHANGED, {
+        'id': order['id'],
+        'order_number': order['order_number'],
+        'from_status': order['from_status'],
+        'status': order['status'],
+        'note': update_request.note,
+        'changed_at': order['changed_at']
+    })
+    return order
+
+@app.get("/orders/{order_number}/history", response_model=List[OrderStatusHistoryEntry])
+async def get_order_status_history(order_number: str):
+    """주문 상태 변경 기록"""
+    history = await async_db.get_order_status_history(order_number)
+    if history is None:
+        raise HTTPException(status_code=404, detail="주문을 찾을 수 없습니다.")
+    return history
+
+@app.get("/events/orders")
+async def stream_order_events(last_event_id: Optional[str] = Header(None)):
+    """주문 생성/상태 변경 이벤트 스트림 (Server-Sent Events)
+
+    다시 연결할 때 Last-Event-ID 헤더를 보내면 놓친 이벤트부터 이어서 받는다.
+    """
+    subscription = order_events.subscribe(last_event_id)
     
-    # 각 카테고리별 샘플 메뉴 (최대 3개)
-    sample_menus = {}
-    for category in categories:
-        menu_items = db_manager.get_menu_items_by_category(category['id'])
-        sample_menus[category['display_name']] = [item['name'] for item in menu_items[:3]]
+    async def event_stream():
+        try:
+            yield b"retry: 3000\n\n"
+            while not subscription.dropped:
+                events = await subscription.next_batch(SSE_KEEPALIVE_SECONDS)
+                if events:
+                    yield b"".join(event.frame for event in events)
+                else:
+                    yield b": keepalive\n\n"
+            # 큐가 넘친 구독자는 연결을 끊는다 (클라이언트가 Last-Event-ID로 다시 연결)
+        finally:
+            order_events.unsubscribe(subscription)
     
-    return VoiceGuideResponse(
-        categories=categories,
-        sample_menus=sample_menus
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
     )
 
+@app.get("/events/orders/stats")
+async def get_order_event_stats():
+    """주문 이벤트 구독자/발행 통계"""
+    return order_events.stats()
+
+@app.get("/orders/{order_number}", response_model=OrderDetailResponse)
+async def get_order(order_number: str):
+    """주문 번호로 주문 상세 조회 (아이템, 옵션 포함)"""
+    order = await async_db.get_order_by_number(order_number)
+    if not order:
+        raise HTTPException(status_code=404, detail="주문을 찾을 수 없습니다.")
+    return order
+
+@app.get("/voice-guide", response_model=VoiceGuideResponse)
+async def get_voice_guide(catalog: MenuCatalog = Depends(menu_catalog)):
+    """음성 안내를 위한 카테고리 및 샘플 메뉴 정보"""
+    guide = await voice_guide_cache.get(catalog.version)
+    return Response(content=guide.json_body, media_type="application/json", headers=catalog_headers(catalog))
+
 @app.get("/voice-guide/text")
-async def get_voice_guide_text():
+async def get_voice_guide_text(catalog: MenuCatalog = Depends(menu_catalog)):
     """음성 안내 텍스트 생성"""
-    categories = db_manager.get_categories()
-    
-    guide_text = "안녕하세요. 반갑습니다. 주문하고 싶은 메뉴가 있으시면 메뉴명을 말씀해주시고, 못 정하셨으면 '메뉴'라고 말해 주세요.\n\n"
-    guide_text += "저희 매장에는 다음과 같은 메뉴가 있습니다:\n\n"
-    
-    for category in categories:
-        menu_items = db_manager.get_menu_items_by_category(category['id'])
-        sample_menus = [item['name'] for item in menu_items[:3]]
-        
-        guide_text += f"• {category['display_name']} 탭을 누르시면 "
-        if sample_menus:
-            guide_text += f"{', '.join(sample_menus)} 등의 메뉴가 있습니다.\n"
-        else:
-            guide_text += "다양한 메뉴가 있습니다.\n"
+    guide = await voice_guide_cache.get(catalog.version)
+    return Response(content=guide.text_body, media_type="application/json", headers=catalog_headers(catalog))
+
+@app.post("/voice/match", response_model=VoiceMatchResponse)
+async def match_voice_command(match_request: VoiceMatchRequest):
+    """음성 인식 문장과 비슷한 메뉴/옵션 후보를 점수순으로 조회"""
+    catalog = await current_catalog()
+    limit = min(max(match_request.limit, 1), 20)
+    return name_index_cache.get(catalog).match(match_request.transcript, limit, match_request.menu_item_id)
+
+@app.get("/search", response_model=SearchResponse)
+async def search_menu(q: str, limit: int = 10):
+    """메뉴/옵션 이름과 설명 검색 (FTS5, BM25 순)"""
+    limit = min(max(limit, 1), 50)
+    trigram_match, short_match = build_match(parse_terms(q))
+    # 카탈로그에 없거나 판매 중지된 결과를 걸러 낼 여유분까지 조회
+    hits = await async_db.search_menu(trigram_match, short_match, limit * 2)
+    catalog = await current_catalog()
+    return {"query": q, "results": describe_results(catalog, hits, limit)}
+
+def report_range(since: Optional[date], until: Optional[date]) -> Tuple[str, str]:
+    """보고서 날짜 범위 (since 이상, until 미만 / 기본값은 오늘 하루, UTC)"""
+    since = since or datetime.now(timezone.utc).date()
+    until = until or since + timedelta(days=1)
+    if until <= since:
+        raise HTTPException(status_code=400, detail="until은 since보다 뒤의 날짜여야 합니다.")
+    return since.isoformat(), until.isoformat()
+
+@app.get("/reports/hourly", response_model=List[HourlySales], dependencies=[Depends(require_admin)])
+async def get_hourly_report(since: Optional[date] = None, until: Optional[date] = None):
+    """시간대별 주문 수, 수량, 매출 (취소 제외)"""
+    return await async_db.get_hourly_sales(*report_range(since, until))
+
+@app.get("/reports/menu-items", response_model=List[MenuItemSales], dependencies=[Depends(require_admin)])
+async def get_menu_item_report(since: Optional[date] = None, until: Optional[date] = None):
+    """메뉴별 수량과 매출 (옵션 제외, 취소 제외)"""
+    return await async_db.get_menu_item_sales(*report_range(since, until))
+
+@app.get("/reports/options", response_model=List[OptionSales], dependencies=[Depends(require_admin)])
+async def get_option_report(since: Optional[date] = None, until: Optional[date] = None):
+    """옵션별 수량과 매출 (취소 제외)"""
+    return await async_db.get_option_sales(*report_range(since, until))
+
+@app.get("/reports/status", response_model=List[StatusSales], dependencies=[Depends(require_admin)])
+async def get_status_report(since: Optional[date] = None, until: Optional[date] = None):
+    """현재 상태별 주문 수와 금액"""
+    return await async_db.get_status_sales(*report_range(since, until))
+
+EXPORT_MEDIA_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}  # text/* 에는 charset이 자동으로 붙는다
+
+# 동시에 DB를 읽는 주문 내보내기 수 (나머지는 차례를 기다린다)
+export_slots = asyncio.Semaphore(int(os.environ.get("EXPORT_CONCURRENCY", "2")))
+
+async def limited_export(chunks: Iterator[bytes]) -> AsyncIterator[bytes]:
+    """내보내기 자리가 나면 chunks를 DB 스레드 풀에서 한 조각씩 진행"""
+    async with export_slots:
+        async for chunk in async_db.iterate(chunks):
+            yield chunk
+
+@app.get("/exports/orders", dependencies=[Depends(require_admin)])
+async def export_orders(day: date = Query(..., alias="date"), format: str = "csv", gzip: bool = False):
+    """하루치 주문/아이템/옵션을 CSV 또는 NDJSON으로 스트리밍 (정산용, UTC 기준 날짜)"""
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"올바른 형식을 입력해주세요. ({', '.join(EXPORT_FORMATS)})")
     
-    guide_text += "\n주문하고 싶은 메뉴가 있으시면 메뉴명을 말씀해주세요."
+    batches = db_manager.iter_order_export_rows(day.isoformat(), (day + timedelta(days=1)).isoformat())
+    filename = f"orders-{day.isoformat()}.{format}" + (".gz" if gzip else "")
+    return StreamingResponse(
+        limited_export(export_chunks(batches, format, gzip)),
+        media_type="application/gzip" if gzip else EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+@app.post("/admin/menu/import", dependencies=[Depends(require_admin)])
+async def import_menu(request: Request, format: str = "json", deactivate_missing: bool = False):
+    """메뉴 일괄 가져오기 (JSON/CSV 본문, 기존 메뉴와 비교해 바뀐 행만 반영)"""
+    body = await request.body()
+    try:
+        menu = parse_menu(body.decode("utf-8-sig"), format)
+        result = await async_db.import_menu(menu, deactivate_missing)
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="메뉴 파일은 UTF-8로 인코딩되어 있어야 합니다.")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    # 새 메뉴 버전을 바로 반영
+    await async_db.run(catalog_store.refresh)
+    return result
+
+@app.get("/admin/menu/export", dependencies=[Depends(require_admin)])
+async def export_menu(format: str = "json"):
+    """메뉴 일괄 내보내기"""
+    if format not in ["json", "csv"]:
+        raise HTTPException(status_code=400, detail="올바른 형식을 입력해주세요. (json, csv)")
     
-    return {"guide_text": guide_text}
+    menu = await async_db.export_menu()
+    media_type = "application/json" if format == "json" else "text/csv; charset=utf-8"
+    return Response(content=format_menu(menu, format), media_type=media_type)
 
 if __name__ == "__main__":
     print("🍽️ 음성 주문 시스템 백엔드 서버를 시작합니다...")
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+주문 보관 - 완료된 오래된 주문을 월별 SQLite 파일로 옮겨 운영 DB를 작게 유지한다
+
+보관 파일은 archive/orders-YYYY-MM.db 형식이며, 과거 주문 조회는 필요한 달의 파일만
+ATTACH DATABASE로 붙여서 운영 DB와 함께 조회한다.
+
+사용법:
+    python archive.py run --before 2024-05-01 [--db menu.db] [--vacuum]
+    python archive.py list [--db menu.db]
+"""
+import argparse
+import os
+import re
+import sqlite3
+import sys
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from order_status import CANCELLED, PICKED_UP
+
+# 보관 대상 테이블 (부모 -> 자식 순서)
+ARCHIVE_TABLES = ("orders", "order_items", "order_item_options", "order_status_history")
+ARCHIVE_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS {schema}.idx_orders_created_at ON orders (created_at)",
+    "CREATE INDEX IF NOT EXISTS {schema}.idx_orders_status_created_at ON orders (status, created_at)",
+    "CREATE INDEX IF NOT EXISTS {schema}.idx_order_items_order_id ON order_items (order_id)",
+    "CREATE INDEX IF NOT EXISTS {schema}.idx_order_item_options_order_item_id ON order_item_options (order_item_id)",
+    "CREATE INDEX IF NOT EXISTS {schema}.idx_order_status_history_order_id ON order_status_history (order_id)",
+)
+
+# 더 이상 상태가 바뀌지 않는 주문만 보관한다
+CLOSED_STATUS_CONDITION = f"status IN ('{PICKED_UP}', '{CANCELLED}')"
+
+# 한 쿼리에서 함께 붙이는 보관 파일 수 (SQLite 기본 ATTACH 한도는 10개)
+MAX_ATTACHED_ARCHIVES = 6
+
+_ARCHIVE_FILE = re.compile(r"^orders-(\d{4}-\d{2})\.db$")
+_CREATE_TABLE = re.compile(r"^CREATE TABLE (\"?\w+\"?)", re.IGNORECASE)
+
+def default_archive_dir(db_path: str) -> str:
+    return os.path.join(os.path.dirname(os.path.abspath(db_path)), "archive")
+
+def archive_path(archive_dir: str, month: str) -> str:
+    return os.path.join(archive_dir, f"orders-{month}.db")
+
+def archive_schema(month: str) -> str:
+    return f"archive_{month.replace('-', '_')}"
+
+def month_bounds(month: str) -> Tuple[str, str]:
+    """'YYYY-MM' -> ('YYYY-MM-01', 다음 달 1일)"""
+    year, mon = int(month[:4]), int(month[5:7])
+    year, mon = (year + 1, 1) if mon == 12 else (year, mon + 1)
+    return f"{month}-01", f"{year:04d}-{mon:02d}-01"
+
+def list_archive_months(archive_dir: str) -> List[str]:
+    """보관 파일이 있는 달 목록 (오래된 순)"""
+    if not os.path.isdir(archive_dir):
+        return []
+    months = []
+    for name in os.listdir(archive_dir):
+        match = _ARCHIVE_FILE.match(name)
+        if match:
+            months.append(match.group(1))
+    return sorted(months)
+
+def months_in_range(months: List[str], since: Optional[str], until: Optional[str]) -> List[str]:
+    """[since, until) 기간과 겹치는 달 (created_at 문자열과 같은 형식으로 비교)"""
+    selected = []
+    for month in months:
+        start, end = month_bounds(month)
+        if (since is None or end > since) and (until is None or start < until):
+            selected.append(month)
+    return selected
+
+@contextmanager
+def attached_archives(conn: sqlite3.Connection, archive_dir: str, months: List[str]) -> Iterator[List[str]]:
+    """보관 파일을 붙이고 스키마 이름 목록을 반환, 끝나면 떼어 낸다 (트랜잭션 밖에서 호출)"""
+    schemas = []
+    try:
+        for month in months:
+            schema = archive_schema(month)
+            conn.execute(f"ATTACH DATABASE ? AS {schema}", (archive_path(archive_dir, month),))
+            schemas.append(schema)
+        yield schemas
+    finally:
+        if conn.in_transaction:
+            conn.rollback()
+        for schema in schemas:
+            conn.execute(f"DETACH DATABASE {schema}")
+
+def union_source(table: str, schemas: List[str], columns: str = "*") -> str:
+    """운영 DB와 보관 파일의 같은 테이블을 합친 FROM 절 (보관 파일이 없으면 테이블 이름 그대로)"""
+    if not schemas:
+        return table
+    parts = [f"SELECT {columns} FROM main.{table}"] + [f"SELECT {columns} FROM {schema}.{table}" for schema in schemas]
+    return "(" + " UNION ALL ".join(parts) + ")"
+
+def _create_archive_tables(conn: sqlite3.Connection, schema: str):
+    # 운영 DB의 테이블 정의를 그대로 복사 (id를 그대로 옮기므로 운영 DB와 겹치지 않는다)
+    for table in ARCHIVE_TABLES:
+        sql = conn.execute(
+            "SELECT sql FROM main.sqlite_master WHERE type = 'table' AND name = ?", (table,)
+        ).fetchone()[0]
+        conn.execute(_CREATE_TABLE.sub(f"CREATE TABLE IF NOT EXISTS {schema}.\\1", sql, count=1))
+    for index in ARCHIVE_INDEXES:
+        conn.execute(index.format(schema=schema))
+
+def _archive_month(conn: sqlite3.Connection, archive_dir: str, month: str, before: str) -> Dict[str, int]:
+    """한 달치 완료 주문을 보관 파일로 복사하고 운영 DB에서 지운다 (한 트랜잭션)"""
+    start, end = month_bounds(month)
+    end = min(end, before)
+    schema = archive_schema(month)
+    conn.execute(f"ATTACH DATABASE ? AS {schema}", (archive_path(archive_dir, month),))
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        _create_archive_tables(conn, schema)
+        conn.execute("DROP TABLE IF EXISTS temp.archive_order_ids")
+        conn.execute(
+            f"CREATE TEMP TABLE archive_order_ids AS SELECT id FROM main.orders "
+            f"WHERE {CLOSED_STATUS_CONDITION} AND created_at >= ? AND created_at < ?",
+            (start, end)
+        )
+        order_ids = "SELECT id FROM temp.archive_order_ids"
+        item_ids = f"SELECT id FROM main.order_items WHERE order_id IN ({order_ids})"
+        conditions = {
+            "orders": f"id IN ({order_ids})",
+            "order_items": f"order_id IN ({order_ids})",
+            "order_item_options": f"order_item_id IN ({item_ids})",
+            "order_status_history": f"order_id IN ({order_ids})",
+        }
+        counts = {}
+        # id를 그대로 옮긴다 (AUTOINCREMENT라 운영 DB에서 같은 id가 다시 쓰이지 않는다)
+        for table in ARCHIVE_TABLES:
+            # 보관 파일을 만든 뒤 운영 DB에 열이 추가돼도 되도록 보관 파일의 열만 옮긴다
+            columns = ", ".join(row[1] for row in conn.execute(f"PRAGMA {schema}.table_info({table})"))
+            cursor = conn.execute(
+                f"INSERT OR IGNORE INTO {schema}.{table} ({columns}) "
+                f"SELECT {columns} FROM main.{table} WHERE {conditions[table]}"
+            )
+            counts[table] = cursor.rowcount
+        # 자식 -> 부모 순서로 삭제
+        for table in reversed(ARCHIVE_TABLES):
+            conn.execute(f"DELETE FROM main.{table} WHERE {conditions[table]}")
+        conn.execute("DROP TABLE temp.archive_order_ids")
+        conn.commit()
+        return counts
+    except BaseException:
+        if conn.in_transaction:
+            conn.rollback()
+        raise
+    finally:
+        conn.execute(f"DETACH DATABASE {schema}")
+
+def archive_orders(db_manager, before: str) -> Dict[str, Dict[str, int]]:
+    """before(날짜) 이전에 생성된 완료 주문을 달마다 보관 파일로 옮긴다"""
+    os.makedirs(db_manager.archive_dir, exist_ok=True)
+    with db_manager.get_connection() as conn:
+        months = [
+            row[0] for row in conn.execute(
+                f"SELECT DISTINCT substr(created_at, 1, 7) FROM orders "
+                f"WHERE {CLOSED_STATUS_CONDITION} AND created_at < ? ORDER BY 1",
+                (before,)
+            ).fetchall()
+        ]
+        return {month: _archive_month(conn, db_manager.archive_dir, month, before) for month in months}
+
+def main():
+    parser = argparse.ArgumentParser(description="완료된 주문 월별 보관")
+    parser.add_argument("command", choices=["run", "list"])
+    parser.add_argument("--db", default="menu.db", help="SQLite DB 경로")
+    parser.add_argument("--before", help="이 날짜(YYYY-MM-DD, UTC) 전에 생성된 주문을 보관")
+    parser.add_argument("--vacuum", action="store_true", help="보관 후 운영 DB 파일 크기를 줄인다")
+    args = parser.parse_args()
+
+    from database import DatabaseManager
+    db_manager = DatabaseManager(args.db)
+    if args.command == "list":
+        for month in list_archive_months(db_manager.archive_dir):
+            path = archive_path(db_manager.archive_dir, month)
+            print(f"  - {month}: {path} ({os.path.getsize(path) // 1024}KB)")
+    else:
+        if not args.before or not re.match(r"^\d{4}-\d{2}-\d{2}$", args.before):
+            parser.error("--before YYYY-MM-DD 를 입력해주세요.")
+        started = time.perf_counter()
+        result = archive_orders(db_manager, args.before)
+        elapsed = (time.perf_counter() - started) * 1000
+        print(f"✅ 주문 보관 완료 ({elapsed:.1f}ms, {len(result)}개월)")
+        for month, counts in result.items():
+            print(f"  - {month}: " + ", ".join(f"{table} {count}" for table, count in counts.items()))
+        if args.vacuum:
+            with db_manager.get_connection() as conn:
+                conn.execute("VACUUM")
+        with db_manager.get_connection() as conn:
+            page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+            page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+        print(f"📦 운영 DB 크기: {page_count * page_size // 1024}KB")
+    db_manager.close()
+
+if __name__ == "__main__":
+    try:
+        main()
+    except sqlite3.Error as e:
+        print(f"❌ {e}")
+        sys.exit(1)
@@ -0,0 +1,169 @@
+"""
+비동기 데이터 접근 계층
+동기 DatabaseManager 호출을 전용 스레드 풀에서 실행해 이벤트 루프를 막지 않는다
+"""
+import asyncio
+import contextvars
+import functools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple
+
+from database import DatabaseManager
+
+class AsyncDatabaseManager:
+    """DatabaseManager의 await 가능한 래퍼
+
+    max_workers개의 스레드로 동시에 실행되는 DB 작업 수를 제한한다.
+    커넥션 풀 크기보다 크게 잡으면 스레드가 커넥션을 기다리게 되므로
+    기본값은 풀 크기와 같다.
+    """
+
+    def __init__(self, db_manager: DatabaseManager, max_workers: Optional[int] = None):
+        self.db_manager = db_manager
+        self.max_workers = max_workers or db_manager.pool.size
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="db")
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._peak_pending = 0
+        self._completed = 0
+        self._queue_time = 0.0
+        self._run_time = 0.0
+
+    def _call(self, submitted: float, func: Callable[..., Any], *args, **kwargs) -> Any:
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            finished = time.perf_counter()
+            with self._lock:
+                self._pending -= 1
+                self._completed += 1
+                self._queue_time += started - submitted
+                self._run_time += finished - started
+
+    async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """임의의 동기 함수를 DB 스레드 풀에서 실행"""
+        with self._lock:
+            self._pending += 1
+            self._peak_pending = max(self._peak_pending, self._pending)
+        loop = asyncio.get_running_loop()
+        # 요청 컨텍스트(요청별 DB 사용량 등)를 DB 스레드로 넘긴다
+        call = functools.partial(contextvars.copy_context().run, self._call, time.perf_counter(), func, *args, **kwargs)
+        return await loop.run_in_executor(self._executor, call)
+
+    async def iterate(self, iterator: Iterator[Any]) -> AsyncIterator[Any]:
+        """동기 이터레이터(커넥션을 잡고 있는 제너레이터 등)를 DB 스레드 풀에서 한 단계씩 진행"""
+        lock = threading.Lock()
+        done = object()
+
+        def step():
+            with lock:
+                return next(iterator, done)
+
+        def close():
+            with lock:
+                iterator.close()
+
+        try:
+            while True:
+                item = await self.run(step)
+                if item is done:
+                    return
+                yield item
+        finally:
+            # 클라이언트가 중간에 끊어도 진행 중인 단계가 끝난 뒤 닫아서 커넥션을 반납한다
+            self._executor.submit(close)
+
+    async def get_categories(self) -> List[Dict[str, Any]]:
+        return await self.run(self.db_manager.get_categories)
+
+    async def get_menu_items_by_category(self, category_id: int) -> List[Dict[str, Any]]:
+        return await self.run(self.db_manager.get_menu_items_by_category, category_id)
+
+    async def get_options_by_type(self, option_type: str) -> List[Dict[str, Any]]:
+        return await self.run(self.db_manager.get_options_by_type, option_type)
+
+    async def get_menu_item_by_id(self, item_id: int) -> Dict[str, Any]:
+        return await self.run(self.db_manager.get_menu_item_by_id, item_id)
+
+    async def get_menu_version(self) -> int:
+        return await self.run(self.db_manager.get_menu_version)
+
+    async def load_menu_snapshot(self) -> Dict[str, Any]:
+        return await self.run(self.db_manager.load_menu_snapshot)
+
+    async def get_voice_guide_data(self, sample_size: int = 3) -> List[Dict[str, Any]]:
+        return await self.run(self.db_manager.get_voice_guide_data, sample_size)
+
+    async def search_menu(self, trigram_match: Optional[str], short_match: Optional[str],
+                          limit: int = 10) -> List[Dict[str, Any]]:
+        return await self.run(self.db_manager.search_menu, trigram_match, short_match, limit)
+
+    async def import_menu(self, menu: Dict[str, List[Dict[str, Any]]],
+                          deactivate_missing: bool = False) -> Dict[str, Any]:
+        return await self.run(self.db_manager.import_menu, menu, deactivate_missing)
+
+    async def export_menu(self) -> Dict[str, List[Dict[str, Any]]]:
+        return await self.run(self.db_manager.export_menu)
+
+    async def place_order(self, order: Dict[str, Any], items: List[Dict[str, Any]],
+                          options: List[Dict[str, Any]],
+                          idempotency: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        return await self.run(self.db_manager.place_order, order, items, options, idempotency)
+
+    async def reserve_order_numbers(self, store_id: str, day: str, count: int) -> int:
+        return await self.run(self.db_manager.reserve_order_numbers, store_id, day, count)
+
+    async def get_idempotency_record(self, key: str, ttl: float) -> Optional[Dict[str, Any]]:
+        return await self.run(self.db_manager.get_idempotency_record, key, ttl)
+
+    async def purge_idempotency_keys(self, ttl: float) -> int:
+        return await self.run(self.db_manager.purge_idempotency_keys, ttl)
+
+    async def list_orders(self, status: Optional[str] = None, since: Optional[str] = None,
+                          until: Optional[str] = None, before: Optional[Tuple[str, int]] = None,
+                          limit: int = 50) -> Dict[str, Any]:
+        return await self.run(self.db_manager.list_orders, status, since, until, before, limit)
+
+    async def get_order_by_number(self, order_number: str) -> Optional[Dict[str, Any]]:
+        return await self.run(self.db_manager.get_order_by_number, order_number)
+
+    async def transition_order(self, order_number: str, new_status: str,
+                               note: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        return await self.run(self.db_manager.transition_order, order_number, new_status, note)
+
+    async def list_active_orders(self, status: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        return await self.run(self.db_manager.list_active_orders, status, limit)
+
+    async def get_order_status_history(self, order_number: str) -> Optional[List[Dict[str, Any]]]:
+        return await self.run(self.db_manager.get_order_status_history, order_number)
+
+    async def get_hourly_sales(self, since: str, until: str) -> List[Dict[str, Any]]:
+        return await self.run(self.db_manager.get_hourly_sales, since, until)
+
+    async def get_menu_item_sales(self, since: str, until: str) -> List[Dict[str, Any]]:
+        return await self.run(self.db_manager.get_menu_item_sales, since, until)
+
+    async def get_option_sales(self, since: str, until: str) -> List[Dict[str, Any]]:
+        return await self.run(self.db_manager.get_option_sales, since, until)
+
+    async def get_status_sales(self, since: str, until: str) -> List[Dict[str, Any]]:
+        return await self.run(self.db_manager.get_status_sales, since, until)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            completed = self._completed
+            return {
+                "max_workers": self.max_workers,
+                "pending": self._pending,
+                "peak_pending": self._peak_pending,
+                "completed": completed,
+                "avg_queue_ms": round(self._queue_time * 1000 / completed, 3) if completed else 0.0,
+                "avg_run_ms": round(self._run_time * 1000 / completed, 3) if completed else 0.0,
+            }
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        self.db_manager.close()
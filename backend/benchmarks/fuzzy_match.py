@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+음성 명령 매칭 벤치마크 - STT 오인식 문장 모음으로 정확도와 지연 시간을 잰다
+
+사용법:
+    python benchmarks/fuzzy_match.py [--corpus stt_corpus.json] [--repeat 50] [--distractors 0]
+
+--distractors N 을 주면 임의로 만든 메뉴 N개를 카탈로그에 더해서 메뉴가 많은 매장을 흉내 낸다.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import List, Dict, Any
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from catalog import MenuCatalog
+from database import DatabaseManager
+from voice_match import MenuNameIndex
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "stt_corpus.json")
+
+_SYLLABLES = "가나다라마바사아자차카타파하고노도로모보소오조초코토포호구누두루무부수우주추쿠투푸후"
+
+def load_catalog(distractors: int, seed: int) -> MenuCatalog:
+    """기본 메뉴를 넣은 임시 DB로 카탈로그를 만들고, 필요하면 가짜 메뉴를 덧붙인다"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_manager = DatabaseManager(os.path.join(tmp, "bench.db"))
+        snapshot = db_manager.load_menu_snapshot()
+        db_manager.close()
+
+    categories = list(snapshot['categories'])
+    menu_items = list(snapshot['menu_items'])
+    if distractors:
+        rng = random.Random(seed)
+        category_id = max(category['id'] for category in categories) + 1
+        categories.append({'id': category_id, 'name': "벤치마크", 'display_name': "벤치마크",
+                           'description': None})
+        next_id = max(item['id'] for item in menu_items) + 1
+        for offset in range(distractors):
+            name = "".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(3, 8)))
+            menu_items.append({'id': next_id + offset, 'category_id': category_id, 'name': name,
+                               'price': 10000, 'description': None, 'is_available': True})
+    return MenuCatalog(snapshot['version'], categories, menu_items, snapshot['options'])
+
+def top_name(result: Dict[str, Any]) -> str:
+    candidates = result['menus'] + result['options']
+    if not candidates:
+        return ""
+    return max(candidates, key=lambda candidate: candidate['score'])['name']
+
+def percentile(samples: List[float], ratio: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * ratio))]
+
+def main():
+    parser = argparse.ArgumentParser(description="음성 명령 매칭 정확도/지연 시간 벤치마크")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS, help="오인식 문장 모음 JSON")
+    parser.add_argument("--repeat", type=int, default=50, help="문장마다 반복 횟수")
+    parser.add_argument("--distractors", type=int, default=0, help="추가할 가짜 메뉴 수")
+    parser.add_argument("--seed", type=int, default=1, help="가짜 메뉴 생성 시드")
+    parser.add_argument("--verbose", action="store_true", help="틀린 문장을 출력")
+    args = parser.parse_args()
+
+    import json
+    with open(args.corpus, encoding="utf-8") as f:
+        corpus = json.load(f)
+
+    catalog = load_catalog(args.distractors, args.seed)
+    started = time.perf_counter()
+    index = MenuNameIndex(catalog)
+    build_ms = (time.perf_counter() - started) * 1000
+
+    correct = 0
+    samples: List[float] = []
+    for case in corpus:
+        result = index.match(case['transcript'])
+        if top_name(result) == case['expected']:
+            correct += 1
+        elif args.verbose:
+            print(f"  ✗ {case['transcript']!r}: 기대 {case['expected']!r}, 결과 {top_name(result)!r}")
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            index.match(case['transcript'])
+            samples.append((time.perf_counter() - started) * 1000)
+
+    print(f"📊 후보 {len(index.entries)}개, 색인 생성 {build_ms:.1f}ms")
+    print(f"  정확도: {correct}/{len(corpus)} ({correct * 100 / len(corpus):.1f}%)")
+    print(f"  지연 시간: p50 {percentile(samples, 0.50):.3f}ms, "
+          f"p99 {percentile(samples, 0.99):.3f}ms, 최대 {max(samples):.3f}ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+"""
+키오스크 부하 시뮬레이터 - 가상 키오스크 수백 대가 실제 주문 흐름을 동시에 재생한다
+
+키오스크 한 대의 세션: 음성 안내 -> 카테고리 -> 카테고리별 메뉴 -> 메뉴 상세(1~3개) -> 주문
+엔드포인트별 처리량, p50/p95/p99 지연 시간, 오류율을 HdrHistogram 방식의 히스토그램으로 보고한다.
+
+사용법:
+    # 이미 떠 있는 서버에 키오스크 100대로 30초 동안 (세션이 끝나면 think-ms 쉬고 다시 시작)
+    python benchmarks/kiosk_load.py --base-url http://127.0.0.1:8000 --kiosks 100 --duration 30
+
+    # 초당 20세션이 포아송 분포로 도착 (동시 세션은 최대 --kiosks개)
+    python benchmarks/kiosk_load.py --rate 20 --duration 60
+
+    # 백엔드 진입점(app, main, backend, simple_backend)을 임시 폴더에서 직접 띄워서 측정
+    python benchmarks/kiosk_load.py --serve app --kiosks 200 --duration 20 --hdr
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from collections import defaultdict
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENTRY_POINTS = ("app", "main", "backend", "simple_backend")
+
+class LatencyHistogram:
+    """HdrHistogram 방식의 로그-선형 히스토그램 (마이크로초 단위)
+
+    2의 거듭제곱 구간마다 2^(sub_bucket_bits-1)개 버킷으로 나누므로 값의 상대 오차는
+    1/2^(sub_bucket_bits-1) 이하다 (기본 8비트 = 0.8% 이하, 유효숫자 약 2자리).
+    """
+
+    def __init__(self, sub_bucket_bits: int = 8):
+        self.sub_bucket_bits = sub_bucket_bits
+        self.counts: Dict[Tuple[int, int], int] = defaultdict(int)
+        self.total = 0
+        self.min = None
+        self.max = 0
+        self._sum = 0
+
+    def _key(self, value: int) -> Tuple[int, int]:
+        shift = max(value.bit_length() - self.sub_bucket_bits, 0)
+        return shift, value >> shift
+
+    @staticmethod
+    def _highest(key: Tuple[int, int]) -> int:
+        shift, mantissa = key
+        return ((mantissa + 1) << shift) - 1
+
+    def record(self, seconds: float):
+        value = max(int(seconds * 1_000_000), 0)
+        self.counts[self._key(value)] += 1
+        self.total += 1
+        self._sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = max(self.max, value)
+
+    def merge(self, other: "LatencyHistogram"):
+        for key, count in other.counts.items():
+            self.counts[key] += count
+        self.total += other.total
+        self._sum += other._sum
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def mean_ms(self) -> float:
+        return self._sum / self.total / 1000 if self.total else 0.0
+
+    def _iter_cumulative(self) -> Iterator[Tuple[int, int]]:
+        """(버킷 최댓값, 누적 개수)를 작은 값부터"""
+        cumulative = 0
+        for key in sorted(self.counts):
+            cumulative += self.counts[key]
+            yield min(self._highest(key), self.max), cumulative
+
+    def percentile_ms(self, percentile: float) -> float:
+        if not self.total:
+            return 0.0
+        target = max(int(self.total * percentile / 100 + 0.5), 1)
+        for value, cumulative in self._iter_cumulative():
+            if cumulative >= target:
+                return value / 1000
+        return self.max / 1000
+
+    def distribution(self, ticks_per_half_distance: int = 5) -> List[Tuple[float, float, int]]:
+        """HdrHistogram outputPercentileDistribution 형식 - (값 ms, 백분위 0~1, 누적 개수) 목록
+
+        100%까지 남은 거리가 반으로 줄 때마다 그 구간을 ticks_per_half_distance개 눈금으로 나눈다.
+        """
+        rows: List[Tuple[float, float, int]] = []
+        if not self.total:
+            return rows
+        cumulative_values = list(self._iter_cumulative())
+        index = 0
+        half_distances = 0
+        while True:
+            low, high = 1 - 0.5 ** half_distances, 1 - 0.5 ** (half_distances + 1)
+            for tick in range(ticks_per_half_distance):
+                percentile = low + (high - low) * tick / ticks_per_half_distance
+                target = max(int(self.total * percentile + 0.5), 1)
+                while cumulative_values[index][1] < target:
+                    index += 1
+                value, cumulative = cumulative_values[index]
+                rows.append((value / 1000, percentile, cumulative))
+                if cumulative >= self.total:
+                    rows.append((self.max / 1000, 1.0, self.total))
+                    return rows
+            half_distances += 1
+
+class EndpointStats:
+    def __init__(self):
+        self.histogram = LatencyHistogram()
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    @property
+    def requests(self) -> int:
+        return self.histogram.total
+
+class KioskFleet:
+    """가상 키오스크 세션을 실행하고 엔드포인트별 결과를 모은다"""
+
+    def __init__(self, client: httpx.AsyncClient, think_time: float, max_items: int, seed: int):
+        self.client = client
+        self.think_time = think_time
+        self.max_items = max_items
+        self.rng = random.Random(seed)
+        self.stats: Dict[str, EndpointStats] = defaultdict(EndpointStats)
+        self.sessions = 0
+        self.failed_sessions = 0
+        self.active = 0
+        self.peak_active = 0
+
+    async def _call(self, name: str, method: str, path: str, not_found: Any = None, **kwargs) -> Optional[Any]:
+        """요청 하나를 보내고 지연 시간을 기록 (실패하면 None, not_found를 주면 404는 오류가 아니라 그 값)"""
+        stats = self.stats[name]
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, path, **kwargs)
+            body = response.json() if response.status_code < 400 else None
+        except (httpx.HTTPError, ValueError) as e:
+            stats.histogram.record(time.perf_counter() - started)
+            stats.errors[type(e).__name__] += 1
+            return None
+        stats.histogram.record(time.perf_counter() - started)
+        if response.status_code == 404 and not_found is not None:
+            return not_found
+        if response.status_code >= 400:
+            stats.errors[str(response.status_code)] += 1
+            return None
+        return body
+
+    async def session(self):
+        """키오스크 한 대가 손님 한 명의 주문을 처음부터 끝까지 진행"""
+        self.active += 1
+        self.peak_active = max(self.peak_active, self.active)
+        try:
+            ok = await self._session()
+        finally:
+            self.active -= 1
+        self.sessions += 1
+        if not ok:
+            self.failed_sessions += 1
+
+    async def _session(self) -> bool:
+        rng = self.rng
+        if await self._call("GET /voice-guide/text", "GET", "/voice-guide/text") is None:
+            return False
+        categories = await self._call("GET /categories", "GET", "/categories")
+        if not categories:
+            return False
+
+        menu_items = []
+        for category in categories:
+            # 판매 중인 메뉴가 없는 카테고리는 404
+            items = await self._call("GET /categories/{id}/menu", "GET", f"/categories/{category['id']}/menu",
+                                     not_found=[])
+            if items is None:
+                return False
+            menu_items.extend(item for item in items if item.get('is_available', True))
+        if not menu_items:
+            return False
+
+        order_items = []
+        for item in rng.sample(menu_items, min(rng.randint(1, self.max_items), len(menu_items))):
+            detail = await self._call("GET /menu/{id}", "GET", f"/menu/{item['id']}")
+            if detail is None:
+                return False
+            options = detail.get('available_options') or []
+            chosen = rng.sample(options, min(rng.randint(0, 2), len(options)))
+            order_items.append({
+                'menu_item_id': item['id'],
+                'quantity': rng.randint(1, 2),
+                'options': [{'option_id': option['id'], 'quantity': 1} for option in chosen],
+            })
+
+        order = await self._call(
+            "POST /orders", "POST", "/orders",
+            json={'items': order_items},
+            headers={'Idempotency-Key': str(uuid.uuid4())}
+        )
+        return order is not None
+
+    async def run_closed(self, kiosks: int, deadline: float):
+        """키오스크 kiosks대가 세션을 끝낼 때마다 think_time 쉬고 다음 손님을 받는다"""
+        async def kiosk(index: int):
+            # 키오스크마다 시작 시각을 흩뜨린다
+            await asyncio.sleep(self.rng.uniform(0, min(self.think_time, 1.0)))
+            while time.perf_counter() < deadline:
+                await self.session()
+                await asyncio.sleep(self.rng.expovariate(1 / self.think_time) if self.think_time else 0)
+        await asyncio.gather(*(kiosk(index) for index in range(kiosks)))
+
+    async def run_open(self, rate: float, max_active: int, deadline: float):
+        """초당 rate 세션이 포아송 분포로 도착 (동시 세션이 max_active면 도착한 손님은 건너뛴다)"""
+        tasks = set()
+        skipped = 0
+        next_arrival = time.perf_counter()
+        while True:
+            next_arrival += self.rng.expovariate(rate)
+            if next_arrival >= deadline:
+                break
+            await asyncio.sleep(max(next_arrival - time.perf_counter(), 0))
+            if self.active >= max_active:
+                skipped += 1
+                continue
+            task = asyncio.create_task(self.session())
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        if tasks:
+            await asyncio.gather(*tasks)
+        return skipped
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def start_server(entry_point: str, workers: int, env: Dict[str, str]) -> Tuple[subprocess.Popen, str, str]:
+    """진입점을 임시 폴더에서 실행 (menu.db가 작업 폴더에 새로 만들어져 실제 DB를 건드리지 않는다)"""
+    workdir = tempfile.mkdtemp(prefix="kiosk-load-")
+    port = free_port()
+    command = [
+        sys.executable, "-m", "uvicorn", f"{entry_point}:app",
+        "--app-dir", BACKEND_DIR, "--host", "127.0.0.1", "--port", str(port),
+        "--workers", str(workers), "--log-level", "warning",
+    ]
+    process = subprocess.Popen(command, cwd=workdir, env=dict(os.environ, **env))
+    return process, f"http://127.0.0.1:{port}", workdir
+
+async def wait_until_ready(base_url: str, timeout: float = 30.0):
+    deadline = time.perf_counter() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while True:
+            try:
+                if (await client.get("/categories")).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            if time.perf_counter() > deadline:
+                raise RuntimeError(f"{timeout}초 안에 서버가 시작되지 않았습니다: {base_url}")
+            await asyncio.sleep(0.2)
+
+def print_report(fleet: KioskFleet, elapsed: float, show_hdr: bool):
+    total = LatencyHistogram()
+    for stats in fleet.stats.values():
+        total.merge(stats.histogram)
+    print(f"\n📊 세션 {fleet.sessions}개 (실패 {fleet.failed_sessions}개), 최대 동시 세션 {fleet.peak_active}개, "
+          f"{elapsed:.1f}초, 전체 {total.total / elapsed:.1f} req/s")
+    header = f"{'엔드포인트':<28}{'요청':>8}{'req/s':>9}{'오류율':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}  (ms)"
+    print(header)
+    rows = sorted(fleet.stats.items()) + [("전체", None)]
+    for name, stats in rows:
+        histogram = total if stats is None else stats.histogram
+        if stats is None:
+            errors = sum(sum(endpoint.errors.values()) for endpoint in fleet.stats.values())
+        else:
+            errors = sum(stats.errors.values())
+        error_rate = errors / histogram.total * 100 if histogram.total else 0.0
+        print(f"{name:<30}{histogram.total:>8}{histogram.total / elapsed:>9.1f}{error_rate:>8.2f}%"
+              f"{histogram.percentile_ms(50):>9.2f}{histogram.percentile_ms(95):>9.2f}"
+              f"{histogram.percentile_ms(99):>9.2f}{histogram.max / 1000:>9.2f}")
+    for name, stats in sorted(fleet.stats.items()):
+        if stats.errors:
+            print(f"  ⚠️ {name}: " + ", ".join(f"{kind} x{count}" for kind, count in sorted(stats.errors.items())))
+
+    if show_hdr:
+        for name, stats in sorted(fleet.stats.items()) + [("전체", None)]:
+            histogram = total if stats is None else stats.histogram
+            print(f"\n# {name}")
+            print(f"{'Value(ms)':>12} {'Percentile':>14} {'TotalCount':>10} {'1/(1-Percentile)':>16}")
+            for value, percentile, count in histogram.distribution():
+                inverse = f"{1 / (1 - percentile):16.2f}" if percentile < 1 else f"{'inf':>16}"
+                print(f"{value:12.3f} {percentile:14.12f} {count:10d} {inverse}")
+            print(f"#[Mean = {histogram.mean_ms():.3f}, Max = {histogram.max / 1000:.3f}, "
+                  f"Total count = {histogram.total}]")
+
+def report_json(fleet: KioskFleet, elapsed: float) -> Dict[str, Any]:
+    return {
+        "elapsed_seconds": round(elapsed, 3),
+        "sessions": fleet.sessions,
+        "failed_sessions": fleet.failed_sessions,
+        "peak_active_sessions": fleet.peak_active,
+        "endpoints": {
+            name: {
+                "requests": stats.requests,
+                "throughput": round(stats.requests / elapsed, 2),
+                "errors": dict(stats.errors),
+                "mean_ms": round(stats.histogram.mean_ms(), 3),
+                **{f"p{p}_ms": round(stats.histogram.percentile_ms(p), 3) for p in (50, 95, 99)},
+                "max_ms": round(stats.histogram.max / 1000, 3),
+            }
+            for name, stats in sorted(fleet.stats.items())
+        },
+    }
+
+async def run(args) -> int:
+    process = workdir = None
+    base_url = args.base_url
+    if args.serve:
+        process, base_url, workdir = start_server(args.serve, args.workers, dict(kv.split("=", 1) for kv in args.env))
+        print(f"🚀 {args.serve}:app 실행 중 ({base_url}, 작업 폴더 {workdir})")
+    try:
+        await wait_until_ready(base_url)
+        limits = httpx.Limits(max_connections=args.kiosks, max_keepalive_connections=args.kiosks)
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=args.timeout) as client:
+            fleet = KioskFleet(client, args.think_ms / 1000, args.max_items, args.seed)
+            started = time.perf_counter()
+            deadline = started + args.duration
+            if args.rate:
+                print(f"⏱️ 초당 {args.rate}세션 도착, 동시 최대 {args.kiosks}개, {args.duration}초")
+                skipped = await fleet.run_open(args.rate, args.kiosks, deadline)
+                if skipped:
+                    print(f"⚠️ 동시 세션 한도로 건너뛴 도착 {skipped}건")
+            else:
+                print(f"⏱️ 키오스크 {args.kiosks}대, 세션 사이 평균 {args.think_ms}ms, {args.duration}초")
+                await fleet.run_closed(args.kiosks, deadline)
+            elapsed = time.perf_counter() - started
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(10)
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    print_report(fleet, elapsed, args.hdr)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report_json(fleet, elapsed), f, ensure_ascii=False, indent=2)
+
+    requests = sum(stats.requests for stats in fleet.stats.values())
+    errors = sum(sum(stats.errors.values()) for stats in fleet.stats.values())
+    if not requests or errors / requests > args.max_error_rate:
+        print(f"❌ 오류율이 허용치({args.max_error_rate:.1%})를 넘었습니다.")
+        return 1
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(description="키오스크 부하 시뮬레이터")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--base-url", default="http://127.0.0.1:8000", help="이미 실행 중인 서버 주소")
+    target.add_argument("--serve", choices=ENTRY_POINTS, help="이 진입점을 임시 폴더에서 직접 실행")
+    parser.add_argument("--workers", type=int, default=1, help="--serve로 띄울 uvicorn 워커 수")
+    parser.add_argument("--env", action="append", default=[], metavar="KEY=VALUE",
+                        help="--serve 서버 환경 변수 (예: ORDER_GROUP_COMMIT=1)")
+    parser.add_argument("--kiosks", type=int, default=100, help="동시 키오스크(세션) 수")
+    parser.add_argument("--rate", type=float, default=0.0, help="초당 세션 도착 수 (주면 개방형 부하)")
+    parser.add_argument("--duration", type=float, default=30.0, help="측정 시간 (초)")
+    parser.add_argument("--think-ms", type=float, default=1000.0, help="세션 사이 평균 대기 시간 (닫힌 부하)")
+    parser.add_argument("--max-items", type=int, default=3, help="주문당 최대 메뉴 수")
+    parser.add_argument("--timeout", type=float, default=10.0, help="요청 타임아웃 (초)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--hdr", action="store_true", help="엔드포인트별 백분위 분포 전체 출력")
+    parser.add_argument("--json", help="결과를 JSON 파일로 저장")
+    parser.add_argument("--max-error-rate", type=float, default=0.01, help="이 비율을 넘으면 종료 코드 1")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(run(args)))
+
+if __name__ == "__main__":
+    main()
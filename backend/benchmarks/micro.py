@@ -0,0 +1,447 @@
+#!/usr/bin/env python3
+"""
+핫 패스 마이크로 벤치마크 - DatabaseManager 메서드, 주문 가격 계산, response_model 직렬화
+
+임시 DB에 메뉴/주문을 원하는 만큼 채운 뒤 벤치마크마다 워밍업을 하고
+여러 번 반복 측정해서 호출 한 번당 시간(중앙값, 최소, 평균, 표준편차)을 보여준다.
+기준 결과(기본 benchmarks/baseline.json)와 비교해서 중앙값이 threshold 넘게 느려지면 종료 코드 1로 끝난다.
+
+사용법:
+    python benchmarks/micro.py [--menu-items 200] [--orders 5000] [--repeat 15] [--warmup 3] [--rounds 3] [--threshold 0.2]
+    python benchmarks/micro.py --save-baseline                      # benchmarks/baseline.json 갱신
+    python benchmarks/micro.py --baseline /tmp/before.json          # 다른 기준 결과와 비교
+    python benchmarks/micro.py --no-baseline --filter db.list --filter serialize --list
+
+기준 결과는 같은 머신, 같은 --menu-items/--orders 값으로 잰 것끼리만 비교한다.
+"""
+import argparse
+import fnmatch
+import gc
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from catalog import MenuCatalog
+from database import DatabaseManager
+from menu_search import build_match, parse_terms
+from models import (
+    CategoryResponse, CreateOrderRequest, HourlySales, MenuItemDetailResponse, MenuItemResponse,
+    OptionResponse, OrderDetailResponse, OrderListResponse, OrderResponse, OrderStatusHistoryEntry,
+)
+from order_numbers import format_order_number
+from order_pricing import price_order
+from order_status import CANCELLED, PENDING, PICKED_UP
+
+_SYLLABLES = "가나다라마바사아자차카타파하고노도로모보소오조초코토포호구누두루무부수우주추쿠투푸후"
+
+# 채워 넣는 주문의 기간 (오늘부터 과거로)
+ORDER_DAYS = 30
+REPORT_DAYS = 7
+
+class Benchmark:
+    """이름, 측정할 함수(인자 없음), 반복마다 먼저 실행할 준비 함수(호출 횟수를 받는다, 시간에 포함하지 않음)
+
+    writes=True는 DB에 행을 더하는 벤치마크 - 조회 벤치마크를 모든 라운드 다 잰 뒤에 잰다.
+    """
+
+    def __init__(self, name: str, func: Callable[[], Any],
+                 prepare: Optional[Callable[[int], None]] = None, writes: bool = False):
+        self.name = name
+        self.func = func
+        self.prepare = prepare
+        self.writes = writes
+
+    def _time(self, number: int) -> float:
+        if self.prepare is not None:
+            self.prepare(number)
+        func = self.func
+        # timeit처럼 측정하는 동안 GC를 끈다
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            started = time.perf_counter()
+            for _ in range(number):
+                func()
+            return time.perf_counter() - started
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+    def calibrate(self, min_time: float) -> int:
+        """반복 한 번이 min_time 이상 걸리는 호출 횟수 (1, 2, 5, 10, 20, ...)"""
+        number = 1
+        while True:
+            for multiplier in (1, 2, 5):
+                count = number * multiplier
+                if self._time(count) >= min_time:
+                    return count
+            number *= 10
+
+    def run(self, repeat: int, warmup: int, min_time: float) -> Dict[str, Any]:
+        number = self.calibrate(min_time)
+        for _ in range(warmup):
+            self._time(number)
+        samples = [self._time(number) / number * 1e6 for _ in range(repeat)]
+        return summarize(samples, number)
+
+def summarize(samples: List[float], number: int) -> Dict[str, Any]:
+    """호출 한 번당 시간(µs) 통계"""
+    ordered = sorted(samples)
+    quartiles = statistics.quantiles(ordered, n=4) if len(ordered) > 1 else [ordered[0]] * 3
+    return {
+        "median_us": round(statistics.median(ordered), 3),
+        "min_us": round(ordered[0], 3),
+        "mean_us": round(statistics.fmean(ordered), 3),
+        "stdev_us": round(statistics.stdev(ordered), 3) if len(ordered) > 1 else 0.0,
+        "iqr_us": round(quartiles[2] - quartiles[0], 3),
+        "repeat": len(ordered),
+        "number": number,
+    }
+
+class Fixture:
+    """벤치마크용 임시 DB - 가짜 메뉴 menu_items개와 최근 ORDER_DAYS일 동안의 주문 orders개를 채운다"""
+
+    def __init__(self, path: str, menu_items: int, orders: int, seed: int):
+        self.rng = random.Random(seed)
+        self.db = DatabaseManager(path)
+        self._add_menu_items(menu_items)
+        self.catalog = MenuCatalog.load(self.db)
+        self.sellable = [
+            item for item in self.catalog.menu_items_by_id.values() if item['is_available']
+        ]
+        self._sequence = 0
+        self._add_orders(orders)
+
+    def _add_menu_items(self, count: int):
+        if not count:
+            return
+        menu = self.db.export_menu()
+        categories = [category['name'] for category in menu['categories']]
+        for index in range(count):
+            name = "".join(self.rng.choice(_SYLLABLES) for _ in range(self.rng.randint(3, 8)))
+            menu['menu_items'].append({
+                'category': categories[index % len(categories)], 'name': f"{name}{index}",
+                'price': self.rng.randrange(5000, 20000, 500), 'description': None, 'is_available': True
+            })
+        self.db.import_menu(menu)
+
+    def next_order_number(self) -> str:
+        self._sequence += 1
+        return format_order_number("20000101", "BENCH", self._sequence)
+
+    def order_request(self, item_count: int = 3) -> CreateOrderRequest:
+        """옵션을 고를 수 있는 메뉴는 옵션도 하나씩 붙인 주문 요청"""
+        items = []
+        for _ in range(item_count):
+            menu_item = self.rng.choice(self.sellable)
+            options = [
+                {'option_id': option['id'], 'quantity': 1}
+                for option in self.catalog.get_options_for_item(menu_item)[:1]
+            ]
+            items.append({'menu_item_id': menu_item['id'], 'quantity': self.rng.randint(1, 3), 'options': options})
+        return CreateOrderRequest(items=items)
+
+    def new_order(self) -> tuple:
+        """place_order 인자 (order, items, options, idempotency)"""
+        total_amount, items, options = price_order(self.catalog, self.order_request().items)
+        order = {'order_number': self.next_order_number(), 'total_amount': total_amount, 'status': PENDING}
+        return order, items, options, None
+
+    def _add_orders(self, count: int):
+        for start in range(0, count, 500):
+            self.db.place_order_batch([self.new_order() for _ in range(min(500, count - start))])
+        # 생성 시각을 지난 ORDER_DAYS일에 흩뿌리고 대부분은 완료 상태로 둔 뒤 매출 집계를 다시 만든다
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        updates = []
+        for order_id in range(1, count + 1):
+            created_at = now - timedelta(seconds=self.rng.randrange(ORDER_DAYS * 86400))
+            roll = self.rng.random()
+            status = CANCELLED if roll < 0.1 else PICKED_UP if roll < 0.9 else PENDING
+            updates.append((created_at.strftime("%Y-%m-%d %H:%M:%S"), status, order_id))
+        with self.db.get_connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany("UPDATE orders SET created_at = ?, status = ? WHERE id = ?", updates)
+            conn.execute(
+                "UPDATE order_status_history SET changed_at = "
+                "(SELECT created_at FROM orders WHERE orders.id = order_status_history.order_id)"
+            )
+        self.db.rebuild_rollups()
+
+    def sample_order_number(self) -> str:
+        with self.db.get_connection() as conn:
+            return conn.execute(
+                "SELECT order_number FROM orders ORDER BY id LIMIT 1 OFFSET ?",
+                (self.rng.randrange(max(self._sequence, 1)),)
+            ).fetchone()[0]
+
+def serializer(response_model: Any) -> Callable[[Any], bytes]:
+    """FastAPI가 response_model로 응답을 만드는 과정 (검증 -> JSON 모드 dump -> JSONResponse 렌더링)"""
+    adapter = TypeAdapter(response_model)
+    render = JSONResponse(None).render
+
+    def serialize(content: Any) -> bytes:
+        value = adapter.validate_python(content)
+        return render(adapter.dump_python(value, mode="json"))
+    return serialize
+
+def build_benchmarks(fixture: Fixture) -> List[Benchmark]:
+    db = fixture.db
+    catalog = fixture.catalog
+    rng = fixture.rng
+    largest_category = max(catalog.menu_items_by_category, key=lambda key: len(catalog.menu_items_by_category[key]))
+    menu_item_id = fixture.sellable[0]['id']
+    order_number = fixture.sample_order_number()
+    today = datetime.now(timezone.utc).date()
+    report_since, report_until = str(today - timedelta(days=REPORT_DAYS)), str(today + timedelta(days=1))
+    export_since, export_until = str(today - timedelta(days=1)), str(today + timedelta(days=1))
+    trigram_match, short_match = build_match(parse_terms("돈카츠 정식"))
+    menu = db.export_menu()
+    order_request = fixture.order_request()
+
+    # 상태 변경은 되돌릴 수 없으므로 반복마다 새 주문을 미리 만들어 둔다
+    pending = deque()
+
+    def prepare_pending(number: int):
+        pending.clear()
+        for start in range(0, number, 500):
+            orders = [fixture.new_order() for _ in range(min(500, number - start))]
+            db.place_order_batch(orders)
+            pending.extend(order['order_number'] for order, *_ in orders)
+
+    def transition():
+        db.transition_order(pending.popleft(), CANCELLED)
+
+    def export_rows():
+        for _ in db.iter_order_export_rows(export_since, export_until):
+            pass
+
+    categories = db.get_categories()
+    menu_items = catalog.get_menu_items_by_category(largest_category)
+    menu_detail = MenuItemDetailResponse(
+        **catalog.get_menu_item_by_id(menu_item_id),
+        available_options=catalog.get_options_for_item(catalog.get_menu_item_by_id(menu_item_id))
+    )
+    order_page = db.list_orders(limit=50)
+    active_orders = db.list_active_orders(limit=50)
+    order = db.get_order_by_number(order_number)
+    history = db.get_order_status_history(order_number)
+    hourly_sales = db.get_hourly_sales(report_since, report_until)
+    serialize_categories = serializer(List[CategoryResponse])
+    serialize_menu = serializer(List[MenuItemResponse])
+    serialize_options = serializer(List[OptionResponse])
+    serialize_detail = serializer(MenuItemDetailResponse)
+    serialize_order = serializer(OrderResponse)
+    serialize_order_detail = serializer(OrderDetailResponse)
+    serialize_order_list = serializer(OrderListResponse)
+    serialize_active = serializer(List[OrderDetailResponse])
+    serialize_history = serializer(List[OrderStatusHistoryEntry])
+    serialize_hourly = serializer(List[HourlySales])
+    created = {'id': 1, 'order_number': order_number, 'total_amount': 12000, 'status': PENDING,
+               'created_at': datetime.now()}
+
+    return [
+        # DatabaseManager - 메뉴
+        Benchmark("db.get_categories", db.get_categories),
+        Benchmark("db.get_menu_items_by_category", lambda: db.get_menu_items_by_category(largest_category)),
+        Benchmark("db.get_menu_item_by_id", lambda: db.get_menu_item_by_id(menu_item_id)),
+        Benchmark("db.get_options_by_type", lambda: db.get_options_by_type("donkatsu")),
+        Benchmark("db.get_menu_version", db.get_menu_version),
+        Benchmark("db.load_menu_snapshot", db.load_menu_snapshot),
+        Benchmark("db.get_voice_guide_data", db.get_voice_guide_data),
+        Benchmark("db.search_menu", lambda: db.search_menu(trigram_match, short_match, 20)),
+        Benchmark("db.search_menu[short]", lambda: db.search_menu(*build_match(parse_terms("국수")), 20)),
+        Benchmark("db.export_menu", db.export_menu),
+        # DatabaseManager - 주문 조회
+        Benchmark("db.get_idempotency_record", lambda: db.get_idempotency_record("bench-missing-key", 86400)),
+        Benchmark("db.list_orders", lambda: db.list_orders(limit=50)),
+        Benchmark("db.list_orders[status]", lambda: db.list_orders(status=PICKED_UP, limit=50)),
+        Benchmark("db.list_active_orders", lambda: db.list_active_orders(limit=50)),
+        Benchmark("db.get_order_by_number", lambda: db.get_order_by_number(order_number)),
+        Benchmark("db.get_order_status_history", lambda: db.get_order_status_history(order_number)),
+        # DatabaseManager - 보고서/정산
+        Benchmark("db.get_hourly_sales", lambda: db.get_hourly_sales(report_since, report_until)),
+        Benchmark("db.get_menu_item_sales", lambda: db.get_menu_item_sales(report_since, report_until)),
+        Benchmark("db.get_option_sales", lambda: db.get_option_sales(report_since, report_until)),
+        Benchmark("db.get_status_sales", lambda: db.get_status_sales(report_since, report_until)),
+        Benchmark("db.iter_order_export_rows", export_rows),
+        Benchmark("db.rebuild_rollups", db.rebuild_rollups),
+        # 주문 가격 계산 (POST /orders)
+        Benchmark("pricing.price_order", lambda: price_order(catalog, order_request.items)),
+        Benchmark("pricing.validate_request", lambda: CreateOrderRequest.model_validate(
+            order_request.model_dump())),
+        Benchmark("catalog.load", lambda: MenuCatalog.load(db)),
+        # response_model 직렬화
+        Benchmark("serialize.categories", lambda: serialize_categories(categories)),
+        Benchmark("serialize.category_menu", lambda: serialize_menu(menu_items)),
+        Benchmark("serialize.options", lambda: serialize_options(catalog.get_options_by_type("donkatsu"))),
+        Benchmark("serialize.menu_detail", lambda: serialize_detail(menu_detail)),
+        Benchmark("serialize.order_created", lambda: serialize_order(created)),
+        Benchmark("serialize.order_detail", lambda: serialize_order_detail(order)),
+        Benchmark("serialize.order_list[50]", lambda: serialize_order_list(
+            {'orders': order_page['orders'], 'next_cursor': None})),
+        Benchmark("serialize.active_orders", lambda: serialize_active(active_orders)),
+        Benchmark("serialize.order_history", lambda: serialize_history(history)),
+        Benchmark("serialize.hourly_sales", lambda: serialize_hourly(hourly_sales)),
+        Benchmark("serialize.catalog_bootstrap", lambda: MenuCatalog(
+            catalog.version, catalog.categories, list(catalog.menu_items_by_id.values()),
+            list(catalog.options_by_id.values())
+        ).bootstrap_body),
+        # 쓰기는 마지막에 잰다 (호출 횟수만큼 주문이 늘어나므로 앞에서 재면 조회 결과가 실행마다 달라진다)
+        Benchmark("db.import_menu", lambda: db.import_menu(menu), writes=True),
+        Benchmark("db.place_order", lambda: db.place_order(*fixture.new_order()), writes=True),
+        Benchmark("db.place_order_batch[10]", lambda: db.place_order_batch([fixture.new_order() for _ in range(10)]), writes=True),
+        Benchmark("db.reserve_order_numbers", lambda: db.reserve_order_numbers("BENCH", "20000101", 20), writes=True),
+        Benchmark("db.transition_order", transition, prepare_pending, writes=True),
+    ]
+
+# 저장소에 함께 두는 기준 결과 (--save-baseline으로 갱신)
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+def environment(args: argparse.Namespace) -> Dict[str, Any]:
+    return {
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "menu_items": args.menu_items,
+        "orders": args.orders,
+        "seed": args.seed,
+        "repeat": args.repeat,
+        "warmup": args.warmup,
+        "rounds": args.rounds,
+        "created_at": datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S"),
+    }
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """기준 결과와 비교해서 결과에 변화율을 적고, threshold 넘게 느려진 벤치마크 이름을 반환
+
+    중앙값과 최솟값이 모두 threshold 넘게 느려져야 실패로 본다 (다른 프로세스 때문에 튄 반복 몇 번은 무시).
+    """
+    regressions = []
+    for name, result in results.items():
+        base = baseline['benchmarks'].get(name)
+        if base is None:
+            continue
+        change = result['median_us'] / base['median_us'] - 1
+        result['baseline_median_us'] = base['median_us']
+        result['change'] = round(change, 4)
+        result['regressed'] = change > threshold and result['min_us'] / base['min_us'] - 1 > threshold
+        if result['regressed']:
+            regressions.append(name)
+    return regressions
+
+def print_report(results: Dict[str, Dict[str, Any]], threshold: float):
+    width = max(len(name) for name in results)
+    print(f"  {'name':<{width}} {'median':>12} {'min':>12} {'stdev':>7} {'calls':>7}  baseline")
+    for name, result in results.items():
+        line = (f"  {name:<{width}} {result['median_us']:>10.2f}µs {result['min_us']:>10.2f}µs "
+                f"{result['stdev_us'] / result['median_us'] * 100 if result['median_us'] else 0:>6.1f}% "
+                f"{result['number']:>6}x")
+        if 'change' in result:
+            mark = "❌" if result['regressed'] else ("✅" if result['change'] < -threshold else "  ")
+            line += f"  {mark} {result['change'] * 100:+.1f}%"
+        print(line)
+
+def main():
+    parser = argparse.ArgumentParser(description="DatabaseManager/가격 계산/직렬화 마이크로 벤치마크")
+    parser.add_argument("--menu-items", type=int, default=200, help="임시 DB에 추가할 가짜 메뉴 수")
+    parser.add_argument("--orders", type=int, default=5000, help="임시 DB에 채울 주문 수")
+    parser.add_argument("--seed", type=int, default=1, help="가짜 메뉴/주문 생성 시드")
+    parser.add_argument("--repeat", type=int, default=15, help="벤치마크마다 측정 반복 횟수")
+    parser.add_argument("--warmup", type=int, default=3, help="측정 전에 버리는 반복 횟수")
+    parser.add_argument("--rounds", type=int, default=3, help="전체 목록을 도는 횟수 - 벤치마크마다 가장 빠른 라운드를 쓴다")
+    parser.add_argument("--min-time", type=float, default=0.02, help="반복 한 번의 최소 시간(초) - 호출 횟수를 여기에 맞춘다")
+    parser.add_argument("--filter", action="append", default=[],
+                        help="이 문자열이 들어가거나 glob 패턴에 맞는 벤치마크만 실행 (여러 번 지정 가능)")
+    parser.add_argument("--list", action="store_true", help="벤치마크 이름만 출력")
+    parser.add_argument("--json", help="결과를 JSON 파일로 저장")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="비교할 기준 결과 JSON (기본 benchmarks/baseline.json)")
+    parser.add_argument("--no-baseline", action="store_true", help="기준 결과와 비교하지 않는다")
+    parser.add_argument("--save-baseline", nargs="?", const=DEFAULT_BASELINE,
+                        help="이번 결과를 기준 결과 JSON으로 저장 (경로를 생략하면 benchmarks/baseline.json)")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="중앙값이 기준보다 이 비율 넘게 느려지면 실패 (0.2 = 20%%)")
+    args = parser.parse_args()
+    if args.repeat < 2:
+        parser.error("--repeat는 2 이상이어야 합니다.")
+    if args.rounds < 1:
+        parser.error("--rounds는 1 이상이어야 합니다.")
+    if args.orders < 1:
+        parser.error("--orders는 1 이상이어야 합니다.")
+
+    baseline = None
+    # 기준 결과를 새로 저장할 때는 경로를 직접 주지 않으면 이전 기준과 비교하지 않는다
+    compare_baseline = not args.no_baseline and not (args.save_baseline and args.baseline == DEFAULT_BASELINE)
+    if compare_baseline:
+        if not os.path.exists(args.baseline):
+            parser.error(f"기준 결과 {args.baseline}가 없습니다. --save-baseline으로 만들거나 --no-baseline을 주세요.")
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        base_env = baseline.get('environment', {})
+        for key in ("menu_items", "orders", "python", "sqlite", "machine"):
+            if key in base_env and base_env[key] != environment(args)[key]:
+                print(f"⚠️ 기준 결과와 {key}가 다릅니다: {base_env[key]} -> {environment(args)[key]}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        started = time.perf_counter()
+        fixture = Fixture(os.path.join(tmp, "bench.db"), args.menu_items, args.orders, args.seed)
+        benchmarks = build_benchmarks(fixture)
+        if args.filter:
+            benchmarks = [
+                benchmark for benchmark in benchmarks
+                if any(pattern in benchmark.name or fnmatch.fnmatch(benchmark.name, pattern) for pattern in args.filter)
+            ]
+        if args.list:
+            for benchmark in benchmarks:
+                print(benchmark.name)
+            fixture.db.close()
+            return
+        print(f"📦 임시 DB 준비 {time.perf_counter() - started:.1f}s "
+              f"(메뉴 {len(fixture.catalog.menu_items_by_id)}개, 주문 {args.orders}개)")
+
+        # 라운드마다 전체 목록을 한 번씩 돌고 벤치마크마다 중앙값이 가장 빠른 라운드를 쓴다
+        # (다른 프로세스 때문에 한 라운드가 통째로 느려져도 결과가 흔들리지 않게, timeit의 최솟값과 같은 이유)
+        results: Dict[str, Dict[str, Any]] = {}
+        for group in ([b for b in benchmarks if not b.writes], [b for b in benchmarks if b.writes]):
+            for _ in range(args.rounds):
+                for benchmark in group:
+                    result = benchmark.run(args.repeat, args.warmup, args.min_time)
+                    best = results.get(benchmark.name)
+                    if best is None or result['median_us'] < best['median_us']:
+                        results[benchmark.name] = dict(result, rounds=args.rounds)
+        fixture.db.close()
+
+    regressions = compare(results, baseline, args.threshold) if baseline else []
+    print_report(results, args.threshold)
+
+    report = {"environment": environment(args), "benchmarks": results}
+    for path in filter(None, (args.json, args.save_baseline)):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"💾 {path} 저장")
+
+    if baseline:
+        missing = sorted(set(results) - set(baseline['benchmarks']))
+        if missing:
+            print(f"ℹ️ 기준 결과에 없는 벤치마크: {', '.join(missing)}")
+        if regressions:
+            print(f"❌ 기준보다 {args.threshold * 100:.0f}% 넘게 느려진 벤치마크 {len(regressions)}개: {', '.join(regressions)}")
+            sys.exit(1)
+        print(f"✅ 기준 대비 {args.threshold * 100:.0f}% 넘게 느려진 벤치마크 없음")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+메뉴 카탈로그 - 카테고리, 메뉴, 옵션의 메모리 스냅샷
+메뉴 조회는 DB를 거치지 않고 인덱스된 딕셔너리에서 바로 찾는다
+"""
+import hashlib
+import json
+import threading
+import time
+from functools import cached_property
+from typing import List, Dict, Any, Optional, Tuple
+
+from database import DatabaseManager
+from models import CatalogResponse
+
+# 카테고리별로 선택할 수 있는 옵션 타입
+CATEGORY_OPTION_TYPES = {
+    "돈카츠,카레": ("donkatsu",),
+    "1인정식": ("set_meal",),
+}
+
+class MenuCatalog:
+    """메뉴 테이블의 읽기 전용 스냅샷
+
+    반환하는 딕셔너리는 여러 요청이 공유하므로 수정하면 안 된다.
+    """
+
+    def __init__(self, version: int, categories: List[Dict[str, Any]],
+                 menu_items: List[Dict[str, Any]], options: List[Dict[str, Any]]):
+        self.version = version
+        self.categories = categories
+        self.etag = self._compute_etag(version, categories, menu_items, options)
+        self.categories_by_id = {category['id']: category for category in categories}
+
+        # 메뉴 아이템 (카테고리 이름 포함)
+        self.menu_items_by_id: Dict[int, Dict[str, Any]] = {}
+        self.menu_items_by_category: Dict[int, List[Dict[str, Any]]] = {
+            category['id']: [] for category in categories
+        }
+        for item in menu_items:
+            category = self.categories_by_id.get(item['category_id'])
+            if category is None:
+                continue
+            item = dict(item, category_name=category['name'])
+            self.menu_items_by_id[item['id']] = item
+            if item['is_available']:
+                self.menu_items_by_category[item['category_id']].append(item)
+
+        # 카테고리 id -> 허용 옵션 타입
+        self.option_types_by_category: Dict[int, Tuple[str, ...]] = {
+            category['id']: CATEGORY_OPTION_TYPES.get(category['name'], ())
+            for category in categories
+        }
+
+        # 옵션 (id로 가격, 타입, 판매 여부를 바로 찾는다)
+        self.options_by_id = {option['id']: option for option in options}
+        self.options_by_type: Dict[str, List[Dict[str, Any]]] = {}
+        for option in options:
+            if option['is_available']:
+                self.options_by_type.setdefault(option['option_type'], []).append(option)
+
+    @staticmethod
+    def _compute_etag(version: int, *tables: List[Dict[str, Any]]) -> str:
+        # 버전과 내용 해시를 함께 써서 DB 파일이 바뀌어도 태그가 겹치지 않게 한다
+        digest = hashlib.sha1(
+            json.dumps(tables, ensure_ascii=False, sort_keys=True, default=str).encode('utf-8')
+        ).hexdigest()[:16]
+        return f"menu-v{version}-{digest}"
+
+    @classmethod
+    def load(cls, db_manager: DatabaseManager) -> "MenuCatalog":
+        snapshot = db_manager.load_menu_snapshot()
+        return cls(
+            snapshot['version'],
+            snapshot['categories'],
+            snapshot['menu_items'],
+            snapshot['options']
+        )
+
+    def get_categories(self) -> List[Dict[str, Any]]:
+        return self.categories
+
+    def get_category(self, category_id: int) -> Optional[Dict[str, Any]]:
+        return self.categories_by_id.get(category_id)
+
+    def get_menu_items_by_category(self, category_id: int) -> List[Dict[str, Any]]:
+        return self.menu_items_by_category.get(category_id, [])
+
+    def get_menu_item_by_id(self, item_id: int) -> Optional[Dict[str, Any]]:
+        return self.menu_items_by_id.get(item_id)
+
+    def get_options_by_type(self, option_type: str) -> List[Dict[str, Any]]:
+        return self.options_by_type.get(option_type, [])
+
+    def get_option_by_id(self, option_id: int) -> Optional[Dict[str, Any]]:
+        return self.options_by_id.get(option_id)
+
+    @cached_property
+    def bootstrap_body(self) -> bytes:
+        """키오스크 시작 시 한 번에 받는 전체 카탈로그 JSON (버전마다 한 번만 직렬화)"""
+        return CatalogResponse(
+            version=self.version,
+            categories=[
+                dict(
+                    category,
+                    option_types=list(self.get_option_types(category['id'])),
+                    menu_items=self.get_menu_items_by_category(category['id'])
+                )
+                for category in self.categories
+            ],
+            option_groups=self.options_by_type
+        ).model_dump_json().encode('utf-8')
+
+    def get_option_types(self, category_id: int) -> Tuple[str, ...]:
+        return self.option_types_by_category.get(category_id, ())
+
+    def get_options_for_item(self, menu_item: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """메뉴 아이템에 선택할 수 있는 판매 중인 옵션 목록"""
+        return [
+            option
+            for option_type in self.get_option_types(menu_item['category_id'])
+            for option in self.get_options_by_type(option_type)
+        ]
+
+class CatalogStore:
+    """현재 MenuCatalog를 보관하고 메뉴가 바뀌면 새 스냅샷으로 교체한다
+
+    같은 프로세스에서 메뉴를 바꾸면 refresh()를 호출한다. 다른 프로세스의
+    변경은 check_interval초마다 메뉴 버전을 확인해서 반영한다.
+    """
+
+    def __init__(self, db_manager: DatabaseManager, check_interval: Optional[float] = 5.0):
+        self.db_manager = db_manager
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._catalog = MenuCatalog.load(db_manager)
+        self._checked_at = time.monotonic()
+
+    def check_due(self) -> bool:
+        """메뉴 버전을 다시 확인할 때가 되었는지 여부"""
+        return self.check_interval is not None and time.monotonic() - self._checked_at >= self.check_interval
+
+    @property
+    def current(self) -> MenuCatalog:
+        if self.check_due():
+            self.refresh()
+        return self._catalog
+
+    @property
+    def version(self) -> int:
+        return self.current.version
+
+    def refresh(self, force: bool = False) -> MenuCatalog:
+        """DB의 메뉴 버전이 바뀌었으면 스냅샷을 다시 읽어 교체"""
+        with self._lock:
+            self._checked_at = time.monotonic()
+            if force or self.db_manager.get_menu_version() != self._catalog.version:
+                # 참조 교체는 원자적이므로 읽는 쪽은 잠금 없이 이전/새 스냅샷 중 하나를 본다
+                self._catalog = MenuCatalog.load(self.db_manager)
+            return self._catalog
@@ -1,104 +1,205 @@
+import json
+import os
+import queue
 import sqlite3
-from typing import List, Dict, Any
+import threading
+import time
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
 from contextlib import contextmanager
 
+from migrations import migrate
+from menu_io import load_menu_file
+from order_status import ACTIVE_STATUS_CONDITION, PENDING, can_transition
+from order_numbers import order_number_month
+from rollups import RollupBuilder, record_new_order, record_status_change
+from metrics import count_db_statement, track_db_time
+from menu_search import build_search_query, register_search_functions
+from archive import (
+    MAX_ATTACHED_ARCHIVES, attached_archives, default_archive_dir, list_archive_months,
+    month_bounds, months_in_range, union_source,
+)
+
+SEED_MENU_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "seed_menu.json")
+
+# 주문 조회 시 한 번에 가져오는 행 수 (결과 전체를 메모리에 올리지 않는다)
+ORDER_FETCH_SIZE = 100
+
+def iter_rows(cursor: sqlite3.Cursor, size: int = ORDER_FETCH_SIZE) -> Iterator[sqlite3.Row]:
+    """fetchmany로 size개씩 읽으면서 행을 하나씩 반환"""
+    while True:
+        rows = cursor.fetchmany(size)
+        if not rows:
+            return
+        yield from rows
+
+class ConnectionPool:
+    """체크아웃 방식의 SQLite 커넥션 풀
+
+    커넥션은 생성 시점에 한 번만 PRAGMA를 설정하고 재사용한다.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        size: int = 5,
+        timeout: float = 5.0,
+        journal_mode: str = "WAL",
+        synchronous: str = "NORMAL",
+        busy_timeout: int = 5000,
+        cache_size: int = -16000,
+        mmap_size: int = 134217728,
+    ):
+        if size < 1:
+            raise ValueError("커넥션 풀 크기는 1 이상이어야 합니다.")
+        self.db_path = db_path
+        self.size = size
+        self.timeout = timeout
+        self.pragmas = {
+            "journal_mode": journal_mode,
+            "synchronous": synchronous,
+            "busy_timeout": busy_timeout,
+            "cache_size": cache_size,
+            "mmap_size": mmap_size,
+        }
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue(maxsize=size)
+        self._lock = threading.Lock()
+        self._closed = False
+        self._created = 0
+        self._checkouts = 0
+        self._waits = 0
+        self._wait_time = 0.0
+        self._in_use = 0
+        self._peak_in_use = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+        # 메뉴 검색 색인 트리거가 쓰는 함수 (menu_search.py)
+        register_search_functions(conn)
+        # 요청별 DB 쿼리 수 (metrics.py - 요청 밖에서는 아무것도 하지 않는다)
+        conn.set_trace_callback(count_db_statement)
+        return conn
+
+    def acquire(self) -> sqlite3.Connection:
+        if self._closed:
+            raise RuntimeError("닫힌 커넥션 풀입니다.")
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = None
+            with self._lock:
+                # 아직 풀 크기에 도달하지 않았으면 새 커넥션을 만든다
+                if self._created < self.size:
+                    self._created += 1
+                    create = True
+                else:
+                    create = False
+            if create:
+                try:
+                    conn = self._connect()
+                except Exception:
+                    with self._lock:
+                        self._created -= 1
+                    raise
+            else:
+                started = time.perf_counter()
+                try:
+                    conn = self._idle.get(timeout=self.timeout)
+                except queue.Empty:
+                    raise TimeoutError(f"{self.timeout}초 안에 DB 커넥션을 얻지 못했습니다.")
+                with self._lock:
+                    self._waits += 1
+                    self._wait_time += time.perf_counter() - started
+        with self._lock:
+            self._checkouts += 1
+            self._in_use += 1
+            self._peak_in_use = max(self._peak_in_use, self._in_use)
+        return conn
+
+    def release(self, conn: sqlite3.Connection):
+        # 끝나지 않은 트랜잭션이 다음 사용자에게 넘어가지 않도록 정리
+        if conn.in_transaction:
+            conn.rollback()
+        with self._lock:
+            self._in_use -= 1
+        if self._closed:
+            conn.close()
+            return
+        self._idle.put_nowait(conn)
+
+    @contextmanager
+    def connection(self):
+        """커넥션을 빌려 쓰고 성공하면 커밋, 예외가 나면 롤백한다"""
+        conn = self.acquire()
+        try:
+            with track_db_time():
+                yield conn
+                if conn.in_transaction:
+                    conn.commit()
+        except BaseException:
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+        finally:
+            self.release(conn)
+
+    def close(self):
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "size": self.size,
+                "created": self._created,
+                "idle": self._idle.qsize(),
+                "in_use": self._in_use,
+                "peak_in_use": self._peak_in_use,
+                "checkouts": self._checkouts,
+                "waits": self._waits,
+                "total_wait_ms": round(self._wait_time * 1000, 3),
+                "pragmas": dict(self.pragmas),
+            }
+
 class DatabaseManager:
-    def __init__(self, db_path: str = "menu.db"):
+    def __init__(self, db_path: str = "menu.db", pool_size: int = 5,
+                 archive_dir: Optional[str] = None, **pool_options):
         self.db_path = db_path
+        # 월별 주문 보관 파일 위치 (archive.py)
+        self.archive_dir = archive_dir or default_archive_dir(db_path)
+        self.pool = ConnectionPool(db_path, size=pool_size, **pool_options)
         self.init_database()
     
     @contextmanager
     def get_connection(self):
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        try:
+        with self.pool.connection() as conn:
             yield conn
-        finally:
-            conn.close()
+
+    @contextmanager
+    def _read_with_archives(self, months: List[str]):
+        """보관 파일을 붙인 커넥션에서 읽기 트랜잭션을 연다 - (커넥션, 보관 스키마 목록) 반환"""
+        with self.get_connection() as conn:
+            with attached_archives(conn, self.archive_dir, months) as schemas:
+                conn.execute("BEGIN")
+                yield conn, schemas
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """커넥션 풀 통계 조회"""
+        return self.pool.stats()
+
+    def close(self):
+        self.pool.close()
     
     def init_database(self):
         with self.get_connection() as conn:
-            cursor = conn.cursor()
-            
-            # 카테고리 테이블
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS categories (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT NOT NULL,
-                    display_name TEXT NOT NULL,
-                    description TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # 메뉴 테이블
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS menu_items (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    category_id INTEGER NOT NULL,
-                    name TEXT NOT NULL,
-                    price INTEGER NOT NULL,
-                    description TEXT,
-                    is_available BOOLEAN DEFAULT 1,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (category_id) REFERENCES categories (id)
-                )
-            ''')
-            
-            # 옵션 테이블
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS options (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT NOT NULL,
-                    price INTEGER NOT NULL,
-                    option_type TEXT NOT NULL, -- 'donkatsu' or 'set_meal'
-                    is_available BOOLEAN DEFAULT 1,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # 주문 테이블
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS orders (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    order_number TEXT UNIQUE NOT NULL,
-                    total_amount INTEGER NOT NULL,
-                    status TEXT DEFAULT 'pending',
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # 주문 상세 테이블
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS order_items (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    order_id INTEGER NOT NULL,
-                    menu_item_id INTEGER NOT NULL,
-                    quantity INTEGER DEFAULT 1,
-                    item_price INTEGER NOT NULL,
-                    total_price INTEGER NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (order_id) REFERENCES orders (id),
-                    FOREIGN KEY (menu_item_id) REFERENCES menu_items (id)
-                )
-            ''')
-            
-            # 주문 옵션 테이블
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS order_item_options (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    order_item_id INTEGER NOT NULL,
-                    option_id INTEGER NOT NULL,
-                    quantity INTEGER DEFAULT 1,
-                    option_price INTEGER NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (order_item_id) REFERENCES order_items (id),
-                    FOREIGN KEY (option_id) REFERENCES options (id)
-                )
-            ''')
-            
-            conn.commit()
-            self.seed_data()
+            migrate(conn)
+        self.seed_data()
     
     def seed_data(self):
         with self.get_connection() as conn:
@@ -108,105 +209,98 @@ class DatabaseManager:
             cursor.execute("SELECT COUNT(*) FROM categories")
             if cursor.fetchone()[0] > 0:
                 return  # 이미 데이터가 있으면 스킵
+        
+        # 기본 메뉴 (키오스크 메뉴판 기준)
+        self.import_menu(load_menu_file(SEED_MENU_PATH))
+    
+    def _upsert_rows(self, cursor: sqlite3.Cursor, table: str, key_columns: List[str],
+                     value_columns: List[str], rows: List[Dict[str, Any]],
+                     deactivate_missing: bool = False) -> Dict[str, int]:
+        """자연 키로 기존 행과 비교해서 바뀐 행만 일괄 INSERT/UPDATE"""
+        cursor.execute(f"SELECT id, {', '.join(key_columns + value_columns)} FROM {table}")
+        existing = {tuple(row[column] for column in key_columns): row for row in cursor.fetchall()}
+        
+        inserts, updates, seen = [], [], set()
+        for row in rows:
+            key = tuple(row[column] for column in key_columns)
+            if key in seen:
+                raise ValueError(f"{table}에 중복된 항목이 있습니다: {key}")
+            seen.add(key)
+            current = existing.get(key)
+            if current is None:
+                inserts.append(tuple(row[column] for column in key_columns + value_columns))
+            elif any(current[column] != row[column] for column in value_columns):
+                updates.append(tuple(row[column] for column in value_columns) + (current['id'],))
+        
+        columns = key_columns + value_columns
+        cursor.executemany(
+            f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+            inserts
+        )
+        cursor.executemany(
+            f"UPDATE {table} SET {', '.join(f'{column} = ?' for column in value_columns)} WHERE id = ?",
+            updates
+        )
+        
+        deactivated = []
+        if deactivate_missing and 'is_available' in value_columns:
+            deactivated = [(row['id'],) for key, row in existing.items() if key not in seen and row['is_available']]
+            cursor.executemany(f"UPDATE {table} SET is_available = 0 WHERE id = ?", deactivated)
+        
+        return {
+            'inserted': len(inserts),
+            'updated': len(updates),
+            'unchanged': len(rows) - len(inserts) - len(updates),
+            'deactivated': len(deactivated)
+        }
+    
+    def import_menu(self, menu: Dict[str, List[Dict[str, Any]]], deactivate_missing: bool = False) -> Dict[str, Any]:
+        """카테고리, 메뉴, 옵션을 하나의 트랜잭션으로 일괄 반영 (기존 행은 UPDATE, 새 행은 INSERT)
+
+        menu는 menu_io.normalize_menu()로 정리된 형태여야 한다.
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
             
-            # 카테고리 데이터 삽입
-            categories = [
-                ("쌀국수", "쌀국수", "신선한 쌀국수 메뉴"),
-                ("돈카츠,카레", "돈카츠,카레", "바삭한 돈카츠와 진한 카레 메뉴"),
-                ("1인정식", "1인정식", "1인용 정식 메뉴"),
-                ("사이드&추가메뉴", "사이드&추가메뉴", "사이드 메뉴와 추가 옵션")
-            ]
-            
-            cursor.executemany(
-                "INSERT INTO categories (name, display_name, description) VALUES (?, ?, ?)",
-                categories
+            result = {}
+            result['categories'] = self._upsert_rows(
+                cursor, "categories", ["name"], ["display_name", "description"], menu['categories']
             )
             
-            # 쌀국수 메뉴
-            cursor.execute("SELECT id FROM categories WHERE name = '쌀국수'")
-            ssalguksu_id = cursor.fetchone()[0]
-            
-            ssalguksu_items = [
-                ("차돌양지쌀국수", 9900, "부드러운 차돌양지로 끓인 쌀국수"),
-                ("한우쌀국수", 10900, "한우로 끓인 진한 쌀국수"),
-                ("모듬 쌀국수", 11900, "다양한 고기가 들어간 쌀국수")
-            ]
-            
-            for name, price, desc in ssalguksu_items:
-                cursor.execute(
-                    "INSERT INTO menu_items (category_id, name, price, description) VALUES (?, ?, ?, ?)",
-                    (ssalguksu_id, name, price, desc)
-                )
-            
-            # 돈카츠,카레 메뉴
-            cursor.execute("SELECT id FROM categories WHERE name = '돈카츠,카레'")
-            donkatsu_id = cursor.fetchone()[0]
-            
-            donkatsu_items = [
-                ("프리미엄 로스카츠(등심)", 11900, "등심으로 만든 프리미엄 돈카츠"),
-                ("프리미엄 히레츠(안심)", 12900, "안심으로 만든 프리미엄 돈카츠"),
-                ("통모짜치즈돈카츠", 12900, "통모짜렐라 치즈가 들어간 돈카츠"),
-                ("시그니처 경양식돈카츠", 11900, "경양식 스타일의 시그니처 돈카츠"),
-                ("모듬카츠A[등심+안심]", 13900, "등심과 안심이 함께 들어간 모듬카츠"),
-                ("모듬카츠B[등심+치즈]", 13900, "등심과 치즈가 함께 들어간 모듬카츠"),
-                ("등심카츠 카레라이스", 10900, "등심카츠와 카레라이스"),
-                ("안심카츠 카레라이스", 12900, "안심카츠와 카레라이스"),
-                ("통모짜치즈 카레라이스", 12900, "통모짜렐라 치즈 카레라이스")
-            ]
-            
-            for name, price, desc in donkatsu_items:
-                cursor.execute(
-                    "INSERT INTO menu_items (category_id, name, price, description) VALUES (?, ?, ?, ?)",
-                    (donkatsu_id, name, price, desc)
-                )
-            
-            # 1인정식 메뉴
-            cursor.execute("SELECT id FROM categories WHERE name = '1인정식'")
-            set_meal_id = cursor.fetchone()[0]
-            
-            set_meal_items = [
-                ("정식A(쌀국수S+경양식)", 11900, "쌀국수와 경양식이 함께"),
-                ("정식B(쌀국수S+등심)", 10900, "쌀국수와 등심이 함께"),
-                ("정식C(쌀국수S+안심)", 12900, "쌀국수와 안심이 함께"),
-                ("정식D(쌀국수S+치즈)", 12900, "쌀국수와 치즈가 함께")
-            ]
-            
-            for name, price, desc in set_meal_items:
-                cursor.execute(
-                    "INSERT INTO menu_items (category_id, name, price, description) VALUES (?, ?, ?, ?)",
-                    (set_meal_id, name, price, desc)
-                )
-            
-            # 돈카츠,카레 옵션
-            donkatsu_options = [
-                ("밥많이", 0, "donkatsu"),
-                ("공깃밥 추가", 1000, "donkatsu"),
-                ("레몬추가", 500, "donkatsu"),
-                ("트러플오일 추가 주문", 500, "donkatsu")
-            ]
-            
-            for name, price, option_type in donkatsu_options:
-                cursor.execute(
-                    "INSERT INTO options (name, price, option_type) VALUES (?, ?, ?)",
-                    (name, price, option_type)
-                )
-            
-            # 정식 옵션
-            set_meal_options = [
-                ("쌀국수사이즈업", 3000, "set_meal"),
-                ("밥추가", 1000, "set_meal"),
-                ("고수추가", 500, "set_meal"),
-                ("레몬추가", 500, "set_meal"),
-                ("트러플오일 추가", 500, "set_meal")
-            ]
+            cursor.execute("SELECT id, name FROM categories")
+            category_ids = {row['name']: row['id'] for row in cursor.fetchall()}
+            menu_items = [dict(item, category_id=category_ids[item['category']]) for item in menu['menu_items']]
+            result['menu_items'] = self._upsert_rows(
+                cursor, "menu_items", ["category_id", "name"], ["price", "description", "is_available"],
+                menu_items, deactivate_missing
+            )
             
-            for name, price, option_type in set_meal_options:
-                cursor.execute(
-                    "INSERT INTO options (name, price, option_type) VALUES (?, ?, ?)",
-                    (name, price, option_type)
-                )
+            result['options'] = self._upsert_rows(
+                cursor, "options", ["option_type", "name"], ["price", "is_available"],
+                menu['options'], deactivate_missing
+            )
             
-            conn.commit()
+            # 메뉴 테이블 트리거가 올린 버전
+            cursor.execute("SELECT version FROM menu_version WHERE id = 1")
+            result['version'] = cursor.fetchone()[0]
+            return result
+    
+    def export_menu(self) -> Dict[str, List[Dict[str, Any]]]:
+        """가져오기와 같은 형식으로 전체 메뉴 조회"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("BEGIN")
+            cursor.execute("SELECT name, display_name, description FROM categories ORDER BY id")
+            categories = [dict(row) for row in cursor.fetchall()]
+            cursor.execute(
+                "SELECT c.name AS category, mi.name, mi.price, mi.description, mi.is_available "
+                "FROM menu_items mi JOIN categories c ON mi.category_id = c.id ORDER BY mi.id"
+            )
+            menu_items = [dict(row) for row in cursor.fetchall()]
+            cursor.execute("SELECT name, price, option_type, is_available FROM options ORDER BY id")
+            options = [dict(row) for row in cursor.fetchall()]
+            return {'categories': categories, 'menu_items': menu_items, 'options': options}
     
     def get_categories(self) -> List[Dict[str, Any]]:
         with self.get_connection() as conn:
@@ -232,6 +326,74 @@ class DatabaseManager:
             )
             return [dict(row) for row in cursor.fetchall()]
     
+    def get_menu_version(self) -> int:
+        """메뉴 테이블 버전 조회"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT version FROM menu_version WHERE id = 1")
+            return cursor.fetchone()[0]
+    
+    def load_menu_snapshot(self) -> Dict[str, Any]:
+        """카테고리, 메뉴, 옵션 전체를 같은 시점의 스냅샷으로 조회"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            # 읽기 트랜잭션으로 묶어 중간에 바뀐 내용이 섞이지 않게 한다
+            cursor.execute("BEGIN")
+            cursor.execute("SELECT version FROM menu_version WHERE id = 1")
+            version = cursor.fetchone()[0]
+            cursor.execute("SELECT * FROM categories ORDER BY id")
+            categories = [dict(row) for row in cursor.fetchall()]
+            cursor.execute("SELECT * FROM menu_items ORDER BY id")
+            menu_items = [dict(row) for row in cursor.fetchall()]
+            cursor.execute("SELECT * FROM options ORDER BY id")
+            options = [dict(row) for row in cursor.fetchall()]
+            return {
+                'version': version,
+                'categories': categories,
+                'menu_items': menu_items,
+                'options': options
+            }
+    
+    def get_voice_guide_data(self, sample_size: int = 3) -> List[Dict[str, Any]]:
+        """카테고리별 샘플 메뉴 이름을 한 번의 쿼리로 조회"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                '''
+                SELECT c.*, m.name AS sample_menu
+                FROM categories c
+                LEFT JOIN (
+                    SELECT category_id, name,
+                           ROW_NUMBER() OVER (PARTITION BY category_id ORDER BY id) AS rn
+                    FROM menu_items
+                    WHERE is_available = 1
+                ) m ON m.category_id = c.id AND m.rn <= ?
+                ORDER BY c.id, m.rn
+                ''',
+                (sample_size,)
+            )
+            categories = []
+            for row in cursor.fetchall():
+                row = dict(row)
+                sample_menu = row.pop('sample_menu')
+                if not categories or categories[-1]['id'] != row['id']:
+                    row['sample_menus'] = []
+                    categories.append(row)
+                if sample_menu is not None:
+                    categories[-1]['sample_menus'].append(sample_menu)
+            return categories
+    
+    def search_menu(self, trigram_match: Optional[str], short_match: Optional[str],
+                    limit: int = 10) -> List[Dict[str, Any]]:
+        """판매 중인 메뉴/옵션 검색 (rowid, score) - menu_search.build_search_query 참고"""
+        if trigram_match is None and short_match is None:
+            return []
+        sql, params = build_search_query(trigram_match, short_match, limit)
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(sql, params)
+            return [{'rowid': row[0], 'score': round(row[1], 4)} for row in cursor.fetchall()]
+
     def get_menu_item_by_id(self, item_id: int) -> Dict[str, Any]:
         with self.get_connection() as conn:
             cursor = conn.cursor()
@@ -242,29 +404,503 @@ class DatabaseManager:
             row = cursor.fetchone()
             return dict(row) if row else None
     
-    def create_order(self, order_data: Dict[str, Any]) -> int:
+    def place_order(self, order: Dict[str, Any], items: List[Dict[str, Any]],
+                    options: List[Dict[str, Any]],
+                    idempotency: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """주문, 주문 아이템, 주문 옵션을 하나의 트랜잭션으로 저장
+
+        options의 각 항목은 items 안의 위치를 가리키는 'item_index'를 가진다.
+        idempotency={'key', 'request_hash', 'response', 'ttl'}를 주면 키를 주문과 함께 저장하고,
+        유효한 키가 이미 있으면 주문을 저장하지 않고 'idempotency_record'에 저장된 기록을 담아 반환한다.
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            # 쓰기 잠금을 먼저 잡아 중간에 SQLITE_BUSY로 실패하지 않도록 한다
+            cursor.execute("BEGIN IMMEDIATE")
+            return self._insert_order(cursor, order, items, options, idempotency)
+
+    def place_order_batch(self, orders: List[Tuple[Dict[str, Any], List[Dict[str, Any]], List[Dict[str, Any]],
+                                                   Optional[Dict[str, Any]]]]) -> List[Any]:
+        """여러 주문을 한 트랜잭션(커밋 한 번)으로 저장 - 주문마다 place_order 결과 또는 예외를 반환
+
+        주문마다 SAVEPOINT를 두므로 한 주문이 실패해도 나머지 주문은 저장된다.
+        """
+        results: List[Any] = []
         with self.get_connection() as conn:
             cursor = conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            for order, items, options, idempotency in orders:
+                cursor.execute("SAVEPOINT place_order")
+                try:
+                    results.append(self._insert_order(cursor, order, items, options, idempotency))
+                except Exception as e:
+                    cursor.execute("ROLLBACK TO place_order")
+                    results.append(e)
+                cursor.execute("RELEASE place_order")
+        return results
+
+    def _insert_order(self, cursor: sqlite3.Cursor, order: Dict[str, Any], items: List[Dict[str, Any]],
+                      options: List[Dict[str, Any]], idempotency: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """열려 있는 쓰기 트랜잭션 안에서 주문 한 건 저장 (place_order 참고)"""
+        if idempotency is not None:
+            # 쓰기 잠금 안에서 확인하므로 다른 워커가 같은 키로 동시에 보내도 한 번만 저장된다
+            record = self._find_idempotency_record(cursor, idempotency['key'], idempotency['ttl'])
+            if record is not None:
+                return {'order_id': record['response']['id'], 'idempotency_record': dict(record, replayed=True)}
+        cursor.execute(
+            "INSERT INTO orders (order_number, total_amount, status) VALUES (?, ?, ?)",
+            (order['order_number'], order['total_amount'], order.get('status', 'pending'))
+        )
+        order_id = cursor.lastrowid
+        cursor.execute(
+            "INSERT INTO order_status_history (order_id, from_status, to_status) VALUES (?, NULL, ?)",
+            (order_id, order.get('status', PENDING))
+        )
+        
+        cursor.executemany(
+            "INSERT INTO order_items (order_id, menu_item_id, quantity, item_price, total_price) VALUES (?, ?, ?, ?, ?)",
+            [(order_id, item['menu_item_id'], item['quantity'], item['item_price'], item['total_price'])
+             for item in items]
+        )
+        # 같은 트랜잭션 안에서 삽입 순서대로 id가 증가한다
+        cursor.execute("SELECT id FROM order_items WHERE order_id = ? ORDER BY id", (order_id,))
+        order_item_ids = [row[0] for row in cursor.fetchall()]
+        
+        order_item_option_ids = []
+        if options:
+            cursor.executemany(
+                "INSERT INTO order_item_options (order_item_id, option_id, quantity, option_price) VALUES (?, ?, ?, ?)",
+                [(order_item_ids[option['item_index']], option['option_id'], option['quantity'], option['option_price'])
+                 for option in options]
+            )
             cursor.execute(
-                "INSERT INTO orders (order_number, total_amount, status) VALUES (?, ?, ?)",
-                (order_data['order_number'], order_data['total_amount'], order_data.get('status', 'pending'))
+                f"SELECT id FROM order_item_options WHERE order_item_id IN ({','.join('?' * len(order_item_ids))}) ORDER BY id",
+                order_item_ids
             )
-            return cursor.lastrowid
-    
-    def add_order_item(self, order_id: int, item_data: Dict[str, Any]) -> int:
+            order_item_option_ids = [row[0] for row in cursor.fetchall()]
+        
+        # 매출 집계도 같은 트랜잭션에서 갱신
+        record_new_order(cursor, order_id)
+        
+        result = {
+            'order_id': order_id,
+            'order_item_ids': order_item_ids,
+            'order_item_option_ids': order_item_option_ids
+        }
+        if idempotency is not None:
+            response = dict(idempotency['response'], id=order_id)
+            cursor.execute(
+                "INSERT OR REPLACE INTO idempotency_keys (key, request_hash, order_id, response) VALUES (?, ?, ?, ?)",
+                (idempotency['key'], idempotency['request_hash'], order_id,
+                 json.dumps(response, ensure_ascii=False, separators=(",", ":")))
+            )
+            result['idempotency_record'] = {
+                'request_hash': idempotency['request_hash'], 'response': response, 'replayed': False
+            }
+        return result
+
+    def reserve_order_numbers(self, store_id: str, day: str, count: int) -> int:
+        """매장/날짜의 주문 번호 count개를 예약하고 첫 번호를 반환 (날짜마다 1부터 시작)"""
         with self.get_connection() as conn:
             cursor = conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
             cursor.execute(
-                "INSERT INTO order_items (order_id, menu_item_id, quantity, item_price, total_price) VALUES (?, ?, ?, ?, ?)",
-                (order_id, item_data['menu_item_id'], item_data['quantity'], item_data['item_price'], item_data['total_price'])
+                '''
+                INSERT INTO order_number_blocks (store_id, day, last_number) VALUES (?, ?, ?)
+                ON CONFLICT (store_id, day) DO UPDATE SET last_number = last_number + excluded.last_number
+                RETURNING last_number
+                ''',
+                (store_id, day, count)
             )
-            return cursor.lastrowid
-    
-    def add_order_item_option(self, order_item_id: int, option_data: Dict[str, Any]) -> int:
+            last_number = cursor.fetchone()[0]
+            return last_number - count + 1
+
+    @staticmethod
+    def _find_idempotency_record(cursor: sqlite3.Cursor, key: str, ttl: float) -> Optional[Dict[str, Any]]:
+        cursor.execute(
+            "SELECT request_hash, response FROM idempotency_keys WHERE key = ? AND created_at >= datetime('now', ?)",
+            (key, f"-{int(ttl)} seconds")
+        )
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        return {'request_hash': row['request_hash'], 'response': json.loads(row['response'])}
+
+    def get_idempotency_record(self, key: str, ttl: float) -> Optional[Dict[str, Any]]:
+        """ttl초 안에 저장된 Idempotency-Key 기록 ({'request_hash', 'response'}, 없으면 None)"""
+        with self.get_connection() as conn:
+            return self._find_idempotency_record(conn.cursor(), key, ttl)
+
+    def purge_idempotency_keys(self, ttl: float) -> int:
+        """ttl초가 지난 Idempotency-Key 기록 삭제"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM idempotency_keys WHERE created_at < datetime('now', ?)", (f"-{int(ttl)} seconds",))
+            return cursor.rowcount
+
+    def _attach_order_details(self, cursor: sqlite3.Cursor, orders: List[Dict[str, Any]],
+                              schemas: Iterable[str] = ()) -> List[Dict[str, Any]]:
+        """주문 목록에 아이템과 옵션을 붙인다 (주문 수와 관계없이 쿼리 2번)
+
+        schemas를 주면 붙여 둔 보관 파일의 아이템/옵션도 함께 읽는다.
+        """
+        schemas = list(schemas)
+        if not orders:
+            return orders
+        orders_by_id = {}
+        for order in orders:
+            order['items'] = []
+            orders_by_id[order['id']] = order
+        order_ids = list(orders_by_id)
+        placeholders = ','.join('?' * len(order_ids))
+        
+        cursor.execute(
+            f'''
+            SELECT oi.*, mi.name AS name
+            FROM {union_source('order_items', schemas)} oi
+            LEFT JOIN menu_items mi ON mi.id = oi.menu_item_id
+            WHERE oi.order_id IN ({placeholders})
+            ORDER BY oi.id
+            ''',
+            order_ids
+        )
+        items_by_id = {}
+        for row in iter_rows(cursor):
+            item = dict(row, options=[])
+            items_by_id[item['id']] = item
+            orders_by_id[item['order_id']]['items'].append(item)
+        
+        if not items_by_id:
+            return orders
+        item_ids = list(items_by_id)
+        cursor.execute(
+            f'''
+            SELECT oio.*, o.name AS name
+            FROM {union_source('order_item_options', schemas)} oio
+            LEFT JOIN options o ON o.id = oio.option_id
+            WHERE oio.order_item_id IN ({','.join('?' * len(item_ids))})
+            ORDER BY oio.id
+            ''',
+            item_ids
+        )
+        for row in iter_rows(cursor):
+            items_by_id[row['order_item_id']]['options'].append(dict(row))
+        return orders
+
+    def iter_orders(self, status: Optional[str] = None, since: Optional[str] = None,
+                    until: Optional[str] = None, before: Optional[Tuple[str, int]] = None,
+                    limit: Optional[int] = None,
+                    batch_size: int = ORDER_FETCH_SIZE) -> Iterator[List[Dict[str, Any]]]:
+        """최신순 주문을 batch_size개씩 아이템/옵션과 함께 반환
+
+        since 이상, until 미만의 created_at만 조회하고, before=(created_at, id)를 주면
+        그 주문 다음부터 이어서 조회한다 (키셋 페이지네이션).
+        기간과 겹치는 보관 파일은 ATTACH해서 운영 DB와 UNION ALL로 함께 읽는다.
+        """
+        conditions, params = [], []
+        if status is not None:
+            conditions.append("status = ?")
+            params.append(status)
+        if since is not None:
+            conditions.append("created_at >= ?")
+            params.append(since)
+        if until is not None:
+            conditions.append("created_at < ?")
+            params.append(until)
+        if before is not None:
+            conditions.append("(created_at, id) < (?, ?)")
+            params.extend(before)
+        
+        upper = until
+        if before is not None and (upper is None or before[0] < upper):
+            upper = before[0]
+        months = months_in_range(list_archive_months(self.archive_dir), since, upper)[::-1]
+        # 보관 파일이 많으면 최신 달부터 MAX_ATTACHED_ARCHIVES개월씩 나눠서 차례로 조회
+        groups = [months[i:i + MAX_ATTACHED_ARCHIVES] for i in range(0, len(months), MAX_ATTACHED_ARCHIVES)] or [[]]
+        remaining = limit
+        group_until = None
+        for index, group in enumerate(groups):
+            group_conditions, group_params = list(conditions), list(params)
+            group_since = month_bounds(group[-1])[0] if index < len(groups) - 1 else None
+            if group_since is not None:
+                group_conditions.append("created_at >= ?")
+                group_params.append(group_since)
+            if group_until is not None:
+                group_conditions.append("created_at < ?")
+                group_params.append(group_until)
+            where = " WHERE " + " AND ".join(group_conditions) if group_conditions else ""
+            
+            with self._read_with_archives(group) as (conn, schemas):
+                parts = [f"SELECT * FROM {schema}.orders{where}" for schema in ["main"] + schemas]
+                sql = " UNION ALL ".join(parts) + " ORDER BY created_at DESC, id DESC"
+                query_params = group_params * len(parts)
+                if remaining is not None:
+                    sql += " LIMIT ?"
+                    query_params.append(remaining)
+                # 배치 사이에 새 주문이 들어와도 같은 시점의 데이터를 보도록 읽기 트랜잭션 안에서 읽는다
+                cursor = conn.cursor()
+                detail_cursor = conn.cursor()
+                try:
+                    cursor.execute(sql, query_params)
+                    while True:
+                        rows = cursor.fetchmany(batch_size)
+                        if not rows:
+                            break
+                        if remaining is not None:
+                            remaining -= len(rows)
+                        yield self._attach_order_details(detail_cursor, [dict(row) for row in rows], schemas)
+                finally:
+                    # 실행 중인 문장이 남아 있으면 보관 파일을 떼어 낼 수 없다
+                    cursor.close()
+                    detail_cursor.close()
+            if remaining == 0:
+                return
+            group_until = group_since
+
+    def list_orders(self, status: Optional[str] = None, since: Optional[str] = None,
+                    until: Optional[str] = None, before: Optional[Tuple[str, int]] = None,
+                    limit: int = 50) -> Dict[str, Any]:
+        """주문 한 페이지 조회 - next_before는 다음 페이지의 before 값 (마지막 페이지면 None)"""
+        orders: List[Dict[str, Any]] = []
+        # 한 건 더 읽어서 다음 페이지가 있는지 확인
+        for batch in self.iter_orders(status, since, until, before, limit + 1):
+            orders.extend(batch)
+        next_before = None
+        if len(orders) > limit:
+            orders = orders[:limit]
+            next_before = (orders[-1]['created_at'], orders[-1]['id'])
+        return {'orders': orders, 'next_before': next_before}
+
+    def _order_sources(self, order_number: str) -> Iterator[Optional[str]]:
+        """주문을 찾아볼 곳 - 운영 DB(None), 주문 번호의 달 보관 파일, 나머지 보관 파일(최신순)"""
+        yield None
+        months = list_archive_months(self.archive_dir)[::-1]
+        # 주문 번호에 들어 있는 날짜의 달을 먼저 본다 (번호는 현지 시각, created_at은 UTC라 다를 수 있다)
+        guess = order_number_month(order_number)
+        if guess in months:
+            months.remove(guess)
+            months.insert(0, guess)
+        yield from months
+
+    def _find_order(self, order_number: str, with_details: bool = False) -> Optional[Dict[str, Any]]:
+        """운영 DB와 보관 파일에서 주문을 찾는다 (보관 파일은 한 번에 하나씩 붙인다)"""
+        for month in self._order_sources(order_number):
+            with self._read_with_archives([month] if month else []) as (conn, schemas):
+                cursor = conn.cursor()
+                try:
+                    source = schemas[0] if schemas else "main"
+                    cursor.execute(f"SELECT * FROM {source}.orders WHERE order_number = ?", (order_number,))
+                    row = cursor.fetchone()
+                    if row is None:
+                        continue
+                    order = dict(row)
+                    if with_details:
+                        self._attach_order_details(cursor, [order], schemas)
+                    cursor.execute(
+                        f"SELECT from_status, to_status, note, changed_at FROM {source}.order_status_history "
+                        f"WHERE order_id = ? ORDER BY id",
+                        (order['id'],)
+                    )
+                    order['history'] = [dict(history) for history in cursor.fetchall()]
+                    return order
+                finally:
+                    cursor.close()
+        return None
+
+    def get_order_by_number(self, order_number: str) -> Optional[Dict[str, Any]]:
+        """주문 번호로 주문 조회 (아이템/옵션 포함, 보관된 주문 포함)"""
+        order = self._find_order(order_number, with_details=True)
+        if order is not None:
+            del order['history']
+        return order
+
+    def transition_order(self, order_number: str, new_status: str,
+                         note: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """주문 상태를 바꾸고 기록을 남긴다 (주문이 없으면 None, 바꿀 수 없는 상태면 ValueError)"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            cursor.execute("SELECT * FROM orders WHERE order_number = ?", (order_number,))
+            row = cursor.fetchone()
+            if row is None:
+                return None
+            order = dict(row)
+            if not can_transition(order['status'], new_status):
+                raise ValueError(f"'{order['status']}' 상태의 주문은 '{new_status}' 상태로 바꿀 수 없습니다.")
+            
+            cursor.execute("UPDATE orders SET status = ? WHERE id = ?", (new_status, order['id']))
+            record_status_change(cursor, order, new_status)
+            cursor.execute(
+                "INSERT INTO order_status_history (order_id, from_status, to_status, note) VALUES (?, ?, ?, ?)",
+                (order['id'], order['status'], new_status, note)
+            )
+            cursor.execute("SELECT changed_at FROM order_status_history WHERE id = ?", (cursor.lastrowid,))
+            changed_at = cursor.fetchone()[0]
+            return dict(order, status=new_status, from_status=order['status'], changed_at=changed_at)
+
+    def list_active_orders(self, status: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        """진행 중인 주문을 오래된 순으로 조회 (아이템/옵션 포함, 부분 인덱스 사용)"""
+        sql = f"SELECT * FROM orders WHERE {ACTIVE_STATUS_CONDITION}"
+        params: List[Any] = []
+        if status is not None:
+            sql += " AND status = ?"
+            params.append(status)
+        sql += " ORDER BY created_at, id LIMIT ?"
+        params.append(limit)
+        
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("BEGIN")
+            cursor.execute(sql, params)
+            orders = [dict(row) for row in cursor.fetchall()]
+            return self._attach_order_details(cursor, orders)
+
+    def get_order_status_history(self, order_number: str) -> Optional[List[Dict[str, Any]]]:
+        """주문 상태 변경 기록 (주문이 없으면 None, 보관된 주문 포함)"""
+        order = self._find_order(order_number)
+        return None if order is None else order['history']
+
+    def rebuild_rollups(self) -> Dict[str, int]:
+        """원본 주문(보관 파일 포함)으로 매출 집계 테이블을 다시 만든다
+
+        보관 파일은 하나씩 붙여서 읽으므로 보관 작업(archive.py)과 동시에 실행하지 않는다.
+        """
+        builder = RollupBuilder()
+        with self.get_connection() as conn:
+            for month in list_archive_months(self.archive_dir):
+                with attached_archives(conn, self.archive_dir, [month]) as schemas:
+                    cursor = conn.cursor()
+                    cursor.execute("BEGIN")
+                    builder.scan(cursor, schemas[0])
+                    cursor.close()
+            cursor = conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            builder.scan(cursor)
+            return builder.write(cursor)
+
+    def get_hourly_sales(self, since: str, until: str) -> List[Dict[str, Any]]:
+        """시간대별 매출 (since 이상, until 미만 날짜)"""
         with self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
-                "INSERT INTO order_item_options (order_item_id, option_id, quantity, option_price) VALUES (?, ?, ?, ?)",
-                (order_item_id, option_data['option_id'], option_data['quantity'], option_data['option_price'])
+                "SELECT * FROM sales_hourly WHERE hour >= ? AND hour < ? ORDER BY hour",
+                (since, until)
+            )
+            return [dict(row) for row in cursor.fetchall()]
+
+    def get_menu_item_sales(self, since: str, until: str) -> List[Dict[str, Any]]:
+        """메뉴별 매출 (매출 내림차순)"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                '''
+                SELECT s.menu_item_id, mi.name, SUM(s.quantity) AS quantity, SUM(s.revenue) AS revenue
+                FROM sales_menu_items s
+                LEFT JOIN menu_items mi ON mi.id = s.menu_item_id
+                WHERE s.day >= ? AND s.day < ?
+                GROUP BY s.menu_item_id
+                HAVING SUM(s.quantity) != 0
+                ORDER BY revenue DESC, s.menu_item_id
+                ''',
+                (since, until)
+            )
+            return [dict(row) for row in cursor.fetchall()]
+
+    def get_option_sales(self, since: str, until: str) -> List[Dict[str, Any]]:
+        """옵션별 매출 (매출 내림차순)"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                '''
+                SELECT s.option_id, o.name, o.option_type, SUM(s.quantity) AS quantity, SUM(s.revenue) AS revenue
+                FROM sales_options s
+                LEFT JOIN options o ON o.id = s.option_id
+                WHERE s.day >= ? AND s.day < ?
+                GROUP BY s.option_id
+                HAVING SUM(s.quantity) != 0
+                ORDER BY revenue DESC, s.option_id
+                ''',
+                (since, until)
             )
-            return cursor.lastrowid
+            return [dict(row) for row in cursor.fetchall()]
+
+    def get_status_sales(self, since: str, until: str) -> List[Dict[str, Any]]:
+        """상태별 주문 수와 금액"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                '''
+                SELECT status, SUM(order_count) AS order_count, SUM(revenue) AS revenue
+                FROM sales_status
+                WHERE day >= ? AND day < ?
+                GROUP BY status
+                HAVING SUM(order_count) != 0
+                ORDER BY status
+                ''',
+                (since, until)
+            )
+            return [dict(row) for row in cursor.fetchall()]
+
+    def iter_order_export_rows(self, since: str, until: str,
+                               batch_size: int = ORDER_FETCH_SIZE) -> Iterator[List[sqlite3.Row]]:
+        """정산용 주문/아이템/옵션 행을 주문 batch_size건씩 반환
+
+        한 주문의 행은 한 배치 안에 연속으로 나온다 (옵션이 없는 아이템은 옵션 열이 NULL).
+        배치마다 (created_at, id) 키셋으로 이어서 짧은 읽기 트랜잭션을 새로 열므로, 내려받는 동안
+        커넥션을 붙잡거나 WAL 체크포인트를 막지 않는다. 기간과 겹치는 보관 파일도 함께 읽는다.
+        """
+        months = months_in_range(list_archive_months(self.archive_dir), since, until)
+        if len(months) > MAX_ATTACHED_ARCHIVES:
+            raise ValueError(f"보관된 주문은 한 번에 {MAX_ATTACHED_ARCHIVES}개월까지만 내보낼 수 있습니다.")
+        after: Optional[Tuple[str, int]] = None
+        while True:
+            conditions, params = ["o.created_at >= ?", "o.created_at < ?"], [since, until]
+            if after is not None:
+                conditions.append("(o.created_at, o.id) > (?, ?)")
+                params.extend(after)
+            with self._read_with_archives(months) as (conn, schemas):
+                sources = ["main"] + schemas
+                # 이번 배치의 마지막 주문 (남은 주문이 batch_size건보다 적으면 None)
+                # fetchone 대신 fetchall로 문장을 끝까지 실행해야 보관 파일을 떼어 낼 수 있다
+                bounds = conn.execute(
+                    "SELECT created_at, id FROM ("
+                    + " UNION ALL ".join(
+                        f"SELECT o.created_at, o.id FROM {schema}.orders o WHERE {' AND '.join(conditions)}"
+                        for schema in sources
+                    )
+                    + ") ORDER BY created_at, id LIMIT 1 OFFSET ?",
+                    params * len(sources) + [batch_size - 1]
+                ).fetchall()
+                last = bounds[0] if bounds else None
+                page_conditions, page_params = list(conditions), list(params)
+                if last is not None:
+                    page_conditions.append("(o.created_at, o.id) <= (?, ?)")
+                    page_params.extend(last)
+                parts = [
+                    f'''
+                    SELECT o.id AS order_id, o.order_number, o.created_at, o.status, o.total_amount,
+                           oi.id AS order_item_id, oi.menu_item_id, mi.name AS menu_name,
+                           oi.quantity, oi.item_price, oi.total_price,
+                           oio.option_id, op.name AS option_name,
+                           oio.quantity AS option_quantity, oio.option_price,
+                           oio.id AS order_item_option_id
+                    FROM {schema}.orders o
+                    JOIN {schema}.order_items oi ON oi.order_id = o.id
+                    LEFT JOIN main.menu_items mi ON mi.id = oi.menu_item_id
+                    LEFT JOIN {schema}.order_item_options oio ON oio.order_item_id = oi.id
+                    LEFT JOIN main.options op ON op.id = oio.option_id
+                    WHERE {' AND '.join(page_conditions)}
+                    '''
+                    for schema in sources
+                ]
+                # 3, 1, 6, 16 = created_at, order_id, order_item_id, order_item_option_id
+                # (보관 파일이 없으면 단일 SELECT라 열 번호로 정렬, 아이템/옵션 순서까지 정해야 내보낼 때마다 같은 결과)
+                rows = conn.execute(
+                    " UNION ALL ".join(parts) + " ORDER BY 3, 1, 6, 16", page_params * len(parts)
+                ).fetchall()
+            # 트랜잭션을 닫고 커넥션을 반납한 뒤에 내보낸다
+            if rows:
+                yield rows
+            if last is None:
+                return
+            after = (last['created_at'], last['id'])
@@ -0,0 +1,176 @@
+"""
+한글 자모 기반 퍼지 매칭
+음절을 초성/중성/종성으로 분해해서 STT 오인식("히레카츠" -> "히레츠")과
+초성 검색("ㅎㅇㅆㄱㅅ" -> "한우쌀국수")을 처리한다
+"""
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+HANGUL_BASE = 0xAC00
+HANGUL_LAST = 0xD7A3
+
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+JUNGSEONG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+JONGSEONG = ["", "ㄱ", "ㄲ", "ㄳ", "ㄴ", "ㄵ", "ㄶ", "ㄷ", "ㄹ", "ㄺ", "ㄻ", "ㄼ", "ㄽ", "ㄾ",
+             "ㄿ", "ㅀ", "ㅁ", "ㅂ", "ㅄ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ"]
+
+# 초성/중성/종성을 서로 다른 문자로 구분하기 위해 유니코드 조합형 자모를 사용한다
+_CHO_BASE = 0x1100
+_JUNG_BASE = 0x1161
+_JONG_BASE = 0x11A7
+_JONG_CHARS = {chr(_JONG_BASE + i) for i in range(1, len(JONGSEONG))}
+
+# 발음이 비슷해서 STT가 자주 헷갈리는 자모 묶음
+_SIMILAR_CONSONANTS = ["ㄱㄲㅋ", "ㄷㄸㅌ", "ㅂㅃㅍ", "ㅈㅉㅊ", "ㅅㅆ"]
+_SIMILAR_VOWELS = ["ㅐㅔ", "ㅒㅖ", "ㅙㅚㅞ", "ㅢㅣ", "ㅓㅗ", "ㅡㅜ"]
+
+SIMILAR_COST = 0.4      # 비슷한 자모끼리 바뀐 경우
+JONG_INDEL_COST = 0.5   # 받침이 빠지거나 붙은 경우
+INDEL_COST = 1.0
+
+def _build_similar_pairs() -> Set[Tuple[str, str]]:
+    groups = []
+    for group in _SIMILAR_CONSONANTS:
+        groups.append([chr(_CHO_BASE + CHOSEONG.index(c)) for c in group])
+        groups.append([chr(_JONG_BASE + JONGSEONG.index(c)) for c in group if c in JONGSEONG])
+    for group in _SIMILAR_VOWELS:
+        groups.append([chr(_JUNG_BASE + JUNGSEONG.index(v)) for v in group])
+    return {(a, b) for group in groups for a in group for b in group if a != b}
+
+_SIMILAR_PAIRS = _build_similar_pairs()
+_SIMILAR_BY_CHAR: Dict[str, Set[str]] = defaultdict(set)
+for _a, _b in _SIMILAR_PAIRS:
+    _SIMILAR_BY_CHAR[_a].add(_b)
+
+def decompose(text: str) -> str:
+    """한글 음절을 조합형 자모 문자열로 분해 (한글이 아닌 문자는 그대로 둔다)"""
+    result = []
+    for char in text:
+        code = ord(char)
+        if HANGUL_BASE <= code <= HANGUL_LAST:
+            offset = code - HANGUL_BASE
+            result.append(chr(_CHO_BASE + offset // 588))
+            result.append(chr(_JUNG_BASE + (offset % 588) // 28))
+            if offset % 28:
+                result.append(chr(_JONG_BASE + offset % 28))
+        else:
+            result.append(char)
+    return "".join(result)
+
+def choseong(text: str) -> str:
+    """한글 음절의 초성만 추출 (한글이 아닌 문자는 그대로 둔다)"""
+    result = []
+    for char in text:
+        code = ord(char)
+        if HANGUL_BASE <= code <= HANGUL_LAST:
+            result.append(CHOSEONG[(code - HANGUL_BASE) // 588])
+        else:
+            result.append(char)
+    return "".join(result)
+
+def is_choseong_query(text: str) -> bool:
+    """초성(호환용 자음)만으로 된 검색어인지 여부"""
+    return bool(text) and all(char in CHOSEONG for char in text)
+
+def _indel_cost(char: str) -> float:
+    return JONG_INDEL_COST if char in _JONG_CHARS else INDEL_COST
+
+def substring_distance(query: str, target: str, max_distance: float = float("inf")) -> float:
+    """query를 target의 가장 비슷한 부분 문자열에 맞출 때의 가중 편집 거리
+
+    target의 앞뒤는 무료로 건너뛸 수 있다 (semi-global alignment).
+    중간에 max_distance를 넘는 것이 확실해지면 계산을 멈추고 inf를 반환한다.
+    """
+    target_indel = [_indel_cost(t) for t in target]
+    previous = [0.0] * (len(target) + 1)
+    best = 0.0
+    for q in query:
+        q_cost = _indel_cost(q)
+        similar = _SIMILAR_BY_CHAR.get(q, ())
+        left = previous[0] + q_cost
+        current = [left]
+        best = left
+        for j, t in enumerate(target):
+            # 대각선(치환), 위(query 삭제), 왼쪽(target 삽입) 중 최소값
+            if q == t:
+                cost = previous[j]
+            elif t in similar:
+                cost = previous[j] + SIMILAR_COST
+            else:
+                cost = previous[j] + 1.0
+            up = previous[j + 1] + q_cost
+            if up < cost:
+                cost = up
+            left += target_indel[j]
+            if cost < left:
+                left = cost
+            current.append(left)
+            if left < best:
+                best = left
+        if best > max_distance:
+            return float("inf")
+        previous = current
+    return best
+
+def _trigrams(text: str) -> Set[str]:
+    if len(text) < 3:
+        return {text} if text else set()
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+class FuzzyIndex:
+    """자모 3-gram으로 후보를 거른 뒤 가중 편집 거리로 순위를 매기는 색인
+
+    names는 정규화된 이름 목록이며, 결과는 (names 안의 위치, 유사도) 목록이다.
+    """
+
+    def __init__(self, names: List[str], max_candidates: int = 16):
+        self.names = names
+        self.max_candidates = max_candidates
+        self.jamo = [decompose(name) for name in names]
+        self.choseong = [choseong(name) for name in names]
+        self._by_trigram: Dict[str, List[int]] = defaultdict(list)
+        for position, jamo in enumerate(self.jamo):
+            for gram in _trigrams(jamo):
+                self._by_trigram[gram].append(position)
+
+    def _candidates(self, query_jamo: str) -> List[int]:
+        counts: Dict[int, int] = defaultdict(int)
+        for gram in _trigrams(query_jamo):
+            for position in self._by_trigram.get(gram, ()):
+                counts[position] += 1
+        if not counts:
+            return []
+        # 겹치는 3-gram이 가장 많은 후보의 절반 이상 겹치는 것 중 상위 후보만 편집 거리를 계산한다
+        threshold = max(counts.values()) / 2
+        ranked = sorted(counts, key=lambda position: (-counts[position], position))
+        return [position for position in ranked[:self.max_candidates] if counts[position] >= threshold]
+
+    def _coverage(self, query: str, name: str) -> float:
+        # 같은 거리라면 검색어가 이름의 더 많은 부분을 차지하는 쪽을 우선
+        return 0.85 + 0.15 * min(1.0, len(query) / max(len(name), 1))
+
+    def search(self, query: str, limit: int = 5, min_similarity: float = 0.5,
+               allowed: Optional[Callable[[int], bool]] = None) -> List[Tuple[int, float]]:
+        if not query:
+            return []
+
+        results = []
+        if is_choseong_query(query):
+            for position, initials in enumerate(self.choseong):
+                if (allowed is None or allowed(position)) and query in initials:
+                    results.append((position, self._coverage(query, initials)))
+        else:
+            query_jamo = decompose(query)
+            # 유사도가 min_similarity 이상이 되려면 거리가 이 값을 넘을 수 없다
+            max_distance = len(query_jamo) * (1.0 - min_similarity)
+            for position in self._candidates(query_jamo):
+                if allowed is not None and not allowed(position):
+                    continue
+                distance = substring_distance(query_jamo, self.jamo[position], max_distance)
+                similarity = max(0.0, 1.0 - distance / len(query_jamo))
+                similarity *= self._coverage(query_jamo, self.jamo[position])
+                if similarity >= min_similarity:
+                    results.append((position, similarity))
+
+        results.sort(key=lambda pair: (-pair[1], pair[0]))
+        return results[:limit]
@@ -0,0 +1,21 @@
+"""
+HTTP 조건부 요청(ETag / If-None-Match) 도우미
+"""
+from typing import Optional
+
+def quote_etag(tag: str) -> str:
+    return f'"{tag}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match 헤더가 etag와 일치하는지 확인 (약한 비교, RFC 9110)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
@@ -0,0 +1,119 @@
+"""
+주문 멱등성 키 - 응답을 받지 못한 키오스크가 같은 Idempotency-Key로 다시 보내면 처음 응답을 돌려준다
+
+메모리 LRU+TTL 캐시에서 먼저 찾고, 없으면 DB(idempotency_keys)에서 찾는다.
+DB 기록은 주문과 같은 트랜잭션에서 저장되므로 워커가 여러 개이거나 서버가 재시작돼도 주문이 두 번 생기지 않는다.
+같은 키로 동시에 들어온 요청은 처음 요청 하나만 실행하고 나머지는 그 결과를 함께 받는다.
+"""
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+
+def request_fingerprint(payload: Dict[str, Any]) -> str:
+    """요청 본문 해시 - 같은 키로 다른 주문을 보냈는지 확인하는 데 쓴다"""
+    body = json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+class IdempotencyConflict(Exception):
+    """같은 키로 본문이 다른 요청을 보냈을 때"""
+
+# (요청 본문 해시, 응답, 재사용 여부)
+IdempotentResult = Tuple[str, Dict[str, Any], bool]
+
+class IdempotencyStore:
+    """Idempotency-Key -> (요청 해시, 응답) 메모리 캐시와 처리 중인 요청 목록
+
+    이벤트 루프 스레드에서만 사용한다. max_entries를 넘으면 가장 오래 쓰지 않은 키부터 버린다.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl: float = 86400.0, purge_interval: float = 3600.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.purge_interval = purge_interval
+        self._entries: "OrderedDict[str, Tuple[float, str, Dict[str, Any]]]" = OrderedDict()
+        self._inflight: Dict[str, Tuple[str, asyncio.Future]] = {}
+        self._last_purge = time.monotonic()
+        self._hits = 0
+        self._collapsed = 0
+        self._misses = 0
+
+    def get(self, key: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, request_hash, response = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return request_hash, response
+
+    def put(self, key: str, request_hash: str, response: Dict[str, Any]):
+        self._entries[key] = (time.monotonic() + self.ttl, request_hash, response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def purge_due(self) -> bool:
+        """DB의 만료된 키를 지울 때가 됐는지 (purge_interval마다 한 번 True)"""
+        now = time.monotonic()
+        if now - self._last_purge < self.purge_interval:
+            return False
+        self._last_purge = now
+        return True
+
+    @staticmethod
+    def _check(request_hash: str, stored_hash: str):
+        if request_hash != stored_hash:
+            raise IdempotencyConflict("같은 Idempotency-Key로 다른 주문을 보낼 수 없습니다.")
+
+    async def run(self, key: str, request_hash: str,
+                  create: Callable[[], Awaitable[IdempotentResult]]) -> Tuple[Dict[str, Any], bool]:
+        """처음 보는 키면 create()를 실행하고, 이미 처리한 키면 처음 응답을 반환 - (응답, 재사용 여부)
+
+        create는 DB에서 키를 찾아보고 없으면 주문을 저장해서 (요청 해시, 응답, 재사용 여부)를 반환한다.
+        """
+        cached = self.get(key)
+        if cached is not None:
+            self._check(request_hash, cached[0])
+            self._hits += 1
+            return cached[1], True
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            # 처음 요청이 끝날 때까지 기다린다 (처음 요청이 실패하면 같은 예외를 받는다)
+            self._check(request_hash, inflight[0])
+            self._collapsed += 1
+            response = await asyncio.shield(inflight[1])
+            return response, True
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = (request_hash, future)
+        self._misses += 1
+        try:
+            stored_hash, response, replayed = await create()
+            self._check(request_hash, stored_hash)
+            self.put(key, stored_hash, response)
+            future.set_result(response)
+            return response, replayed
+        except BaseException as e:
+            future.set_exception(e)
+            # 기다리는 요청이 없을 때 'exception was never retrieved' 경고가 나지 않도록 한다
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "inflight": len(self._inflight),
+            "hits": self._hits,
+            "collapsed": self._collapsed,
+            "misses": self._misses,
+        }
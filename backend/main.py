@@ -5,6 +5,8 @@ import uuid
 from datetime import datetime
 
 from database import DatabaseManager
+from catalog import CatalogStore
+from order_pricing import PricingError, price_order
 from models import (
     CategoryResponse, MenuItemResponse, OptionResponse, MenuItemWithCategory,
     CreateOrderRequest, OrderResponse, VoiceGuideResponse, MenuItemDetailResponse
@@ -23,6 +25,7 @@ app.add_middleware(
 
 # 데이터베이스 매니저 인스턴스
 db_manager = DatabaseManager()
+catalog_store = CatalogStore(db_manager)
 
 @app.get("/")
 async def root():
@@ -80,54 +83,21 @@ async def create_order(order_request: CreateOrderRequest):
     order_number = f"ORD-{datetime.now().strftime('%Y%m%d%H%M%S')}-{str(uuid.uuid4())[:8]}"
     
     # 총 금액 계산
-    total_amount = 0
-    order_items_data = []
+    try:
+        total_amount, order_items_data, order_options_data = price_order(catalog_store.current, order_request.items)
+    except PricingError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
     
-    for item in order_request.items:
-        menu_item = db_manager.get_menu_item_by_id(item.menu_item_id)
-        if not menu_item:
-            raise HTTPException(status_code=404, detail=f"메뉴 아이템 ID {item.menu_item_id}를 찾을 수 없습니다.")
-        
-        # 메뉴 아이템 기본 가격
-        item_total = menu_item['price'] * item.quantity
-        
-        # 옵션 가격 추가
-        for option in item.options:
-            options = db_manager.get_options_by_type("donkatsu" if menu_item['category_name'] == "돈카츠,카레" else "set_meal")
-            option_data = next((opt for opt in options if opt['id'] == option.option_id), None)
-            if not option_data:
-                raise HTTPException(status_code=404, detail=f"옵션 ID {option.option_id}를 찾을 수 없습니다.")
-            item_total += option_data['price'] * option.quantity
-        
-        total_amount += item_total
-        order_items_data.append({
-            'menu_item_id': item.menu_item_id,
-            'quantity': item.quantity,
-            'item_price': menu_item['price'],
-            'total_price': item_total,
-            'options': item.options
-        })
-    
-    # 주문 생성
-    order_id = db_manager.create_order({
-        'order_number': order_number,
-        'total_amount': total_amount,
-        'status': 'pending'
-    })
-    
-    # 주문 아이템들 추가
-    for item_data in order_items_data:
-        order_item_id = db_manager.add_order_item(order_id, item_data)
-        
-        # 옵션들 추가
-        for option in item_data['options']:
-            option_data = next((opt for opt in db_manager.get_options_by_type("donkatsu" if menu_item['category_name'] == "돈카츠,카레" else "set_meal") if opt['id'] == option.option_id), None)
-            if option_data:
-                db_manager.add_order_item_option(order_item_id, {
-                    'option_id': option.option_id,
-                    'quantity': option.quantity,
-                    'option_price': option_data['price']
-                })
+    # 주문, 주문 아이템, 옵션을 한 트랜잭션으로 저장 (상태 이력, 매출 집계 포함)
+    order_id = db_manager.place_order(
+        {
+            'order_number': order_number,
+            'total_amount': total_amount,
+            'status': 'pending'
+        },
+        order_items_data,
+        order_options_data
+    )['order_id']
     
     return OrderResponse(
         id=order_id,
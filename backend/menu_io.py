@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+메뉴 일괄 가져오기/내보내기 (JSON, CSV)
+
+JSON 형식:
+    {"categories": [...], "menu_items": [...], "options": [...]}
+
+CSV 형식 (한 파일에 record_type 열로 구분):
+    record_type,category,name,display_name,description,price,option_type,is_available
+
+사용법:
+    python menu_io.py import store_menu.json [--db menu.db] [--deactivate-missing]
+    python menu_io.py export store_menu.csv [--db menu.db]
+"""
+import argparse
+import csv
+import io
+import json
+import sys
+import time
+from typing import List, Dict, Any, Optional
+
+CSV_COLUMNS = [
+    "record_type", "category", "name", "display_name", "description",
+    "price", "option_type", "is_available"
+]
+
+def _to_bool(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    if value is None or value == "":
+        return True  # 비어 있으면 판매 중으로 본다
+    return str(value).strip().lower() in ("1", "true", "y", "yes", "t")
+
+def _required(row: Dict[str, Any], field: str, record_type: str) -> Any:
+    value = row.get(field)
+    if value is None or value == "":
+        raise ValueError(f"{record_type} 항목에 '{field}' 값이 없습니다: {row}")
+    return value
+
+def _to_price(row: Dict[str, Any], record_type: str) -> int:
+    try:
+        return int(_required(row, "price", record_type))
+    except (TypeError, ValueError):
+        raise ValueError(f"{record_type} 항목의 가격이 올바르지 않습니다: {row}")
+
+def _rows(data: Dict[str, Any], record_type: str) -> List[Dict[str, Any]]:
+    rows = data.get(record_type, [])
+    if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+        raise ValueError(f"'{record_type}'는 객체 목록이어야 합니다.")
+    for row in rows:
+        if any(isinstance(value, (list, dict)) for value in row.values()):
+            raise ValueError(f"{record_type} 항목의 값은 문자열이나 숫자여야 합니다: {row}")
+    return rows
+
+def normalize_menu(data: Any) -> Dict[str, List[Dict[str, Any]]]:
+    """가져온 메뉴 데이터를 검증하고 DB에 넣을 형태로 정리"""
+    if not isinstance(data, dict):
+        raise ValueError("메뉴 데이터는 categories, menu_items, options를 가진 객체여야 합니다.")
+    categories = [
+        {
+            "name": _required(row, "name", "categories"),
+            "display_name": row.get("display_name") or row["name"],
+            "description": row.get("description") or None,
+        }
+        for row in _rows(data, "categories")
+    ]
+    category_names = {category["name"] for category in categories}
+
+    menu_items = []
+    for row in _rows(data, "menu_items"):
+        category = _required(row, "category", "menu_items")
+        if category not in category_names:
+            raise ValueError(f"메뉴 '{row.get('name')}'의 카테고리 '{category}'가 categories에 없습니다.")
+        menu_items.append({
+            "category": category,
+            "name": _required(row, "name", "menu_items"),
+            "price": _to_price(row, "menu_items"),
+            "description": row.get("description") or None,
+            "is_available": int(_to_bool(row.get("is_available"))),
+        })
+
+    options = [
+        {
+            "name": _required(row, "name", "options"),
+            "price": _to_price(row, "options"),
+            "option_type": _required(row, "option_type", "options"),
+            "is_available": int(_to_bool(row.get("is_available"))),
+        }
+        for row in _rows(data, "options")
+    ]
+
+    return {"categories": categories, "menu_items": menu_items, "options": options}
+
+def parse_menu_json(text: str) -> Dict[str, List[Dict[str, Any]]]:
+    return normalize_menu(json.loads(text))
+
+def parse_menu_csv(text: str) -> Dict[str, List[Dict[str, Any]]]:
+    data: Dict[str, List[Dict[str, Any]]] = {"categories": [], "menu_items": [], "options": []}
+    record_types = {"category": "categories", "menu_item": "menu_items", "option": "options"}
+    for line_number, row in enumerate(csv.DictReader(io.StringIO(text)), start=2):
+        record_type = (row.get("record_type") or "").strip()
+        if record_type not in record_types:
+            raise ValueError(f"{line_number}행: 알 수 없는 record_type '{record_type}'")
+        data[record_types[record_type]].append(row)
+    return normalize_menu(data)
+
+def parse_menu(text: str, fmt: str) -> Dict[str, List[Dict[str, Any]]]:
+    if fmt == "json":
+        return parse_menu_json(text)
+    if fmt == "csv":
+        return parse_menu_csv(text)
+    raise ValueError(f"지원하지 않는 형식입니다: {fmt} (json, csv)")
+
+def format_menu_json(menu: Dict[str, List[Dict[str, Any]]]) -> str:
+    menu = {
+        "categories": menu["categories"],
+        "menu_items": [dict(row, is_available=bool(row["is_available"])) for row in menu["menu_items"]],
+        "options": [dict(row, is_available=bool(row["is_available"])) for row in menu["options"]],
+    }
+    return json.dumps(menu, ensure_ascii=False, indent=2)
+
+def format_menu_csv(menu: Dict[str, List[Dict[str, Any]]]) -> str:
+    output = io.StringIO()
+    writer = csv.DictWriter(output, fieldnames=CSV_COLUMNS, extrasaction="ignore")
+    writer.writeheader()
+    writer.writerows(dict(row, record_type="category") for row in menu["categories"])
+    writer.writerows(dict(row, record_type="menu_item") for row in menu["menu_items"])
+    writer.writerows(dict(row, record_type="option") for row in menu["options"])
+    return output.getvalue()
+
+def format_menu(menu: Dict[str, List[Dict[str, Any]]], fmt: str) -> str:
+    if fmt == "json":
+        return format_menu_json(menu)
+    if fmt == "csv":
+        return format_menu_csv(menu)
+    raise ValueError(f"지원하지 않는 형식입니다: {fmt} (json, csv)")
+
+def detect_format(path: str, fmt: Optional[str] = None) -> str:
+    if fmt:
+        return fmt
+    return "csv" if path.lower().endswith(".csv") else "json"
+
+def load_menu_file(path: str, fmt: Optional[str] = None) -> Dict[str, List[Dict[str, Any]]]:
+    with open(path, encoding="utf-8-sig") as f:
+        return parse_menu(f.read(), detect_format(path, fmt))
+
+def main():
+    parser = argparse.ArgumentParser(description="메뉴 일괄 가져오기/내보내기")
+    parser.add_argument("command", choices=["import", "export"])
+    parser.add_argument("path", help="메뉴 파일 경로 (.json 또는 .csv)")
+    parser.add_argument("--db", default="menu.db", help="SQLite DB 경로")
+    parser.add_argument("--format", choices=["json", "csv"], help="파일 형식 (기본값: 확장자로 판단)")
+    parser.add_argument("--deactivate-missing", action="store_true",
+                        help="파일에 없는 메뉴/옵션을 판매 중지 처리")
+    args = parser.parse_args()
+
+    from database import DatabaseManager
+    db_manager = DatabaseManager(args.db)
+    fmt = detect_format(args.path, args.format)
+
+    if args.command == "import":
+        menu = load_menu_file(args.path, fmt)
+        started = time.perf_counter()
+        result = db_manager.import_menu(menu, deactivate_missing=args.deactivate_missing)
+        elapsed = (time.perf_counter() - started) * 1000
+        print(f"✅ 메뉴 가져오기 완료 ({elapsed:.1f}ms, 메뉴 버전 {result['version']})")
+        for table in ("categories", "menu_items", "options"):
+            print(f"  - {table}: {result[table]}")
+    else:
+        with open(args.path, "w", encoding="utf-8", newline="") as f:
+            f.write(format_menu(db_manager.export_menu(), fmt))
+        print(f"✅ 메뉴 내보내기 완료: {args.path}")
+    db_manager.close()
+
+if __name__ == "__main__":
+    try:
+        main()
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
@@ -0,0 +1,91 @@
+"""
+메뉴 검색 - 검색어를 FTS5 MATCH 식으로 바꾸고 결과에 카탈로그 정보를 붙인다
+
+trigram 색인(menu_search)은 3글자 이상 단어를 이름 중간에서도 찾고("스카츠" -> "로스카츠"),
+짧은 단어 색인(menu_search_short)은 단어를 1~2글자 조각으로 나눠 넣어서 1~2글자 단어도
+이름/설명 중간에서 MATCH로 찾는다("국수" -> "한우쌀국수"). 한국어 검색어는 두 글자가 흔하므로
+단어 앞부분만이 아니라 중간도 찾아야 한다.
+"""
+import re
+import sqlite3
+from typing import List, Dict, Any, Optional, Tuple
+
+_TERM = re.compile(r"[0-9a-z가-힣]+")
+
+TRIGRAM_MIN_LENGTH = 3
+MAX_TERMS = 8
+
+# menu_search_short 색인 트리거가 쓰는 SQL 함수 (커넥션마다 register_search_functions로 등록)
+SHORT_GRAMS_FUNCTION = "menu_search_grams"
+
+def parse_terms(query: str) -> List[str]:
+    """검색어를 소문자 단어 목록으로 분리 (FTS5 연산자와 따옴표는 버린다)"""
+    return _TERM.findall(query.lower())[:MAX_TERMS]
+
+def search_grams(text: Optional[str]) -> Optional[str]:
+    """단어마다 1~2글자 조각을 공백으로 이어 붙인다 ("쌀국수" -> "쌀 국 수 쌀국 국수")
+
+    unicode61 토크나이저가 조각 하나를 토큰 하나로 색인하므로 1~2글자 검색어가 토큰과 그대로 맞는다.
+    """
+    if text is None:
+        return None
+    grams: List[str] = []
+    for word in _TERM.findall(text.lower()):
+        grams.extend(word)
+        grams.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return " ".join(grams)
+
+def register_search_functions(conn: sqlite3.Connection):
+    """menu_items/options를 바꾸는 커넥션에 색인 트리거용 함수를 등록"""
+    conn.create_function(SHORT_GRAMS_FUNCTION, 1, search_grams, deterministic=True)
+
+def _match(terms: List[str]) -> Optional[str]:
+    return " AND ".join(f'"{term}"' for term in terms) or None
+
+def build_match(terms: List[str]) -> Tuple[Optional[str], Optional[str]]:
+    """(trigram 색인용 MATCH 식, 짧은 단어 색인용 MATCH 식) - 해당하는 단어가 없으면 None"""
+    trigram_match = _match([term for term in terms if len(term) >= TRIGRAM_MIN_LENGTH])
+    short_match = _match([term for term in terms if len(term) < TRIGRAM_MIN_LENGTH])
+    return trigram_match, short_match
+
+def build_search_query(trigram_match: Optional[str], short_match: Optional[str], limit: int) -> Tuple[str, List[Any]]:
+    """DatabaseManager.search_menu의 (SQL, 파라미터) - 결과는 (rowid, 점수), 점수가 높을수록 관련도가 높다
+
+    3글자 이상 단어가 있으면 trigram MATCH 결과를 BM25 순으로 정렬하고, 짧은 단어는
+    menu_search_short MATCH 부분 쿼리로 거른다. 짧은 단어만 있으면 menu_search_short를 BM25 순으로 읽는다.
+    """
+    # bm25는 낮을수록 관련도가 높으므로 부호를 바꿔 점수로 쓴다
+    if trigram_match is None:
+        sql = "SELECT rowid, -rank FROM menu_search_short WHERE menu_search_short MATCH ? AND is_available = 1"
+        return sql + " ORDER BY rank LIMIT ?", [short_match, limit]
+    sql = "SELECT rowid, -rank FROM menu_search WHERE menu_search MATCH ? AND is_available = 1"
+    params: List[Any] = [trigram_match]
+    if short_match is not None:
+        sql += " AND rowid IN (SELECT rowid FROM menu_search_short WHERE menu_search_short MATCH ?)"
+        params.append(short_match)
+    return sql + " ORDER BY rank LIMIT ?", params + [limit]
+
+def describe_results(catalog, hits: List[Dict[str, Any]], limit: int) -> List[Dict[str, Any]]:
+    """검색 결과(rowid, 점수)를 카탈로그의 메뉴/옵션 정보로 바꾼다"""
+    results = []
+    for hit in hits:
+        if hit['rowid'] % 2 == 0:
+            item = catalog.get_menu_item_by_id(hit['rowid'] // 2)
+            if item is None or not item['is_available']:
+                continue  # 카탈로그가 아직 갱신되지 않은 경우
+            results.append({
+                "kind": "menu", "id": item['id'], "name": item['name'], "price": item['price'],
+                "category_id": item['category_id'], "category_name": item['category_name'],
+                "score": hit['score'],
+            })
+        else:
+            option = catalog.get_option_by_id(hit['rowid'] // 2)
+            if option is None or not option['is_available']:
+                continue
+            results.append({
+                "kind": "option", "id": option['id'], "name": option['name'], "price": option['price'],
+                "option_type": option['option_type'], "score": hit['score'],
+            })
+        if len(results) >= limit:
+            break
+    return results
@@ -0,0 +1,203 @@
+"""
+요청 지표 - 라우트 템플릿별 요청 수, 처리 중인 요청 수, 지연 시간, 요청당 DB 쿼리 수/시간 (Prometheus 텍스트 형식)
+
+MetricsMiddleware는 순수 ASGI 미들웨어라 응답 본문을 건드리지 않고(스트리밍 응답 포함) 요청마다
+카운터 몇 개와 히스토그램 버킷 하나씩만 올린다. 지표는 이벤트 루프 스레드에서만 갱신하므로 잠금이 없고,
+워커 프로세스마다 따로 모인다.
+
+DB 사용량은 요청마다 만든 DbUsage를 ContextVar에 넣어 두면 DB 스레드(AsyncDatabaseManager.run이
+컨텍스트를 복사해서 넘긴다)에서 커넥션 풀이 쿼리 수(sqlite3 trace 콜백)와 커넥션 사용 시간을 더한다.
+"""
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# 히스토그램 구간 (이하)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DB_QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+DB_TIME_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+# 라우트에 맞지 않은 요청 (원래 경로를 라벨로 쓰면 라벨 종류가 끝없이 늘어난다)
+UNMATCHED_ROUTE = "<unmatched>"
+
+class DbUsage:
+    """요청 하나가 쓴 DB 쿼리 수와 커넥션 사용 시간(초)"""
+    __slots__ = ("queries", "seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.seconds = 0.0
+
+    def add(self, other: "DbUsage"):
+        self.queries += other.queries
+        self.seconds += other.seconds
+
+_db_usage: ContextVar[Optional[DbUsage]] = ContextVar("db_usage", default=None)
+
+def current_db_usage() -> Optional[DbUsage]:
+    return _db_usage.get()
+
+@contextmanager
+def using_db_usage(usage: DbUsage) -> Iterator[DbUsage]:
+    """이 블록 안의 DB 작업을 usage에 기록"""
+    token = _db_usage.set(usage)
+    try:
+        yield usage
+    finally:
+        _db_usage.reset(token)
+
+def count_db_statement(statement: str):
+    """sqlite3 trace 콜백 - 실행한 SQL 문 하나 (트리거 안의 문은 '--'로 시작하므로 세지 않는다)"""
+    usage = _db_usage.get()
+    if usage is not None and not statement.startswith("--"):
+        usage.queries += 1
+
+@contextmanager
+def track_db_time() -> Iterator[None]:
+    """커넥션을 쓰는 동안의 시간을 현재 요청의 DB 시간에 더한다"""
+    usage = _db_usage.get()
+    if usage is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        usage.seconds += time.perf_counter() - started
+
+class Histogram:
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+def _labels(names: Sequence[str], values: Sequence[Any]) -> str:
+    return ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values))
+
+def _format_bound(bound: float) -> str:
+    return repr(float(bound))
+
+class RequestMetrics:
+    """라우트 템플릿별 요청 지표 모음 (이벤트 루프 스레드에서만 갱신)"""
+
+    def __init__(self):
+        self.in_flight = 0
+        self._requests: Dict[Tuple[str, str, int], int] = {}
+        self._latency: Dict[Tuple[str, str], Histogram] = {}
+        self._db_queries: Dict[Tuple[str, str], Histogram] = {}
+        self._db_seconds: Dict[Tuple[str, str], Histogram] = {}
+
+    def observe(self, method: str, route: str, status: int, elapsed: float, usage: DbUsage):
+        key = (method, route)
+        self._requests[(method, route, status)] = self._requests.get((method, route, status), 0) + 1
+        latency = self._latency.get(key)
+        if latency is None:
+            latency = self._latency[key] = Histogram(LATENCY_BUCKETS)
+            self._db_queries[key] = Histogram(DB_QUERY_BUCKETS)
+            self._db_seconds[key] = Histogram(DB_TIME_BUCKETS)
+        latency.observe(elapsed)
+        self._db_queries[key].observe(usage.queries)
+        self._db_seconds[key].observe(usage.seconds)
+
+    @staticmethod
+    def _render_histograms(lines: List[str], name: str, help_text: str,
+                           histograms: Dict[Tuple[str, str], Histogram]):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} histogram")
+        for key, histogram in sorted(histograms.items()):
+            labels = _labels(("method", "route"), key)
+            cumulative = 0
+            for bound, count in zip(histogram.bounds, histogram.counts):
+                cumulative += count
+                lines.append(f'{name}_bucket{{{labels},le="{_format_bound(bound)}"}} {cumulative}')
+            lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+            lines.append(f"{name}_sum{{{labels}}} {histogram.sum!r}")
+            lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+
+    def render(self) -> str:
+        """Prometheus 텍스트 형식 (version 0.0.4)"""
+        lines = [
+            "# HELP http_requests_total HTTP requests by route template and status.",
+            "# TYPE http_requests_total counter",
+        ]
+        for key, count in sorted(self._requests.items()):
+            lines.append(f"http_requests_total{{{_labels(('method', 'route', 'status'), key)}}} {count}")
+        lines += [
+            "# HELP http_requests_in_flight HTTP requests currently being handled.",
+            "# TYPE http_requests_in_flight gauge",
+            f"http_requests_in_flight {self.in_flight}",
+        ]
+        self._render_histograms(lines, "http_request_duration_seconds",
+                                "HTTP request latency until the response body is sent.", self._latency)
+        self._render_histograms(lines, "http_request_db_queries",
+                                "SQL statements executed per HTTP request.", self._db_queries)
+        self._render_histograms(lines, "http_request_db_seconds",
+                                "Time spent holding a DB connection per HTTP request.", self._db_seconds)
+        return "\n".join(lines) + "\n"
+
+ASGIApp = Callable[..., Any]
+
+class MetricsMiddleware:
+    """HTTP 요청마다 RequestMetrics를 갱신하는 ASGI 미들웨어"""
+
+    def __init__(self, app: ASGIApp, metrics: RequestMetrics):
+        self.app = app
+        self.metrics = metrics
+        # 엔드포인트 함수 -> 라우트 템플릿 (첫 요청 때 애플리케이션의 라우트 목록으로 만든다)
+        self._templates: Optional[Dict[Any, str]] = None
+
+    def _route_template(self, scope: Dict[str, Any]) -> str:
+        route = scope.get("route")
+        if route is not None:
+            return route.path
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return UNMATCHED_ROUTE
+        if self._templates is None or endpoint not in self._templates:
+            # 나중에 추가된 라우트도 찾을 수 있도록 모르는 엔드포인트면 다시 만든다
+            routes = getattr(scope.get("app"), "routes", ())
+            self._templates = {
+                route.endpoint: route.path for route in routes if getattr(route, "endpoint", None) is not None
+            }
+        return self._templates.get(endpoint, UNMATCHED_ROUTE)
+
+    async def __call__(self, scope: Dict[str, Any], receive: ASGIApp, send: ASGIApp):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        metrics = self.metrics
+        status = 500
+
+        async def send_with_status(message: Dict[str, Any]):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        usage = DbUsage()
+        token = _db_usage.set(usage)
+        metrics.in_flight += 1
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            metrics.in_flight -= 1
+            _db_usage.reset(token)
+            metrics.observe(scope["method"], self._route_template(scope), status, elapsed, usage)
@@ -0,0 +1,314 @@
+"""
+DB 스키마 마이그레이션
+PRAGMA user_version으로 적용된 버전을 기록하고, 새 마이그레이션만 한 번에 적용한다
+"""
+import sqlite3
+import sys
+from typing import Callable, List, Tuple
+
+from menu_search import SHORT_GRAMS_FUNCTION, register_search_functions
+from rollups import create_rollup_tables, rebuild_rollups
+
+def _create_base_schema(cursor: sqlite3.Cursor):
+    # 카테고리 테이블
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS categories (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            display_name TEXT NOT NULL,
+            description TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    
+    # 메뉴 테이블
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS menu_items (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            category_id INTEGER NOT NULL,
+            name TEXT NOT NULL,
+            price INTEGER NOT NULL,
+            description TEXT,
+            is_available BOOLEAN DEFAULT 1,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (category_id) REFERENCES categories (id)
+        )
+    ''')
+    
+    # 옵션 테이블
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS options (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            price INTEGER NOT NULL,
+            option_type TEXT NOT NULL, -- 'donkatsu' or 'set_meal'
+            is_available BOOLEAN DEFAULT 1,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    
+    # 주문 테이블
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS orders (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            order_number TEXT UNIQUE NOT NULL,
+            total_amount INTEGER NOT NULL,
+            status TEXT DEFAULT 'pending',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    
+    # 주문 상세 테이블
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS order_items (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            order_id INTEGER NOT NULL,
+            menu_item_id INTEGER NOT NULL,
+            quantity INTEGER DEFAULT 1,
+            item_price INTEGER NOT NULL,
+            total_price INTEGER NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (order_id) REFERENCES orders (id),
+            FOREIGN KEY (menu_item_id) REFERENCES menu_items (id)
+        )
+    ''')
+    
+    # 주문 옵션 테이블
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS order_item_options (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            order_item_id INTEGER NOT NULL,
+            option_id INTEGER NOT NULL,
+            quantity INTEGER DEFAULT 1,
+            option_price INTEGER NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (order_item_id) REFERENCES order_items (id),
+            FOREIGN KEY (option_id) REFERENCES options (id)
+        )
+    ''')
+    
+    # 메뉴 버전 테이블 (메뉴 테이블이 바뀔 때마다 트리거로 증가)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS menu_version (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            version INTEGER NOT NULL
+        )
+    ''')
+    cursor.execute("INSERT OR IGNORE INTO menu_version (id, version) VALUES (1, 0)")
+    
+    for table in ("categories", "menu_items", "options"):
+        for event in ("INSERT", "UPDATE", "DELETE"):
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS {table}_{event.lower()}_bump_menu_version
+                AFTER {event} ON {table}
+                BEGIN
+                    UPDATE menu_version SET version = version + 1 WHERE id = 1;
+                END
+            ''')
+
+def _add_hot_path_indexes(cursor: sqlite3.Cursor):
+    # 카테고리별 판매 중인 메뉴 조회
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_menu_items_category_available ON menu_items (category_id, is_available)")
+    # 옵션 타입별 판매 중인 옵션 조회
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_options_type_available ON options (option_type, is_available)")
+    # 주문별 주문 아이템 / 주문 아이템별 옵션 조회
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_order_items_order_id ON order_items (order_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_order_item_options_order_item_id ON order_item_options (order_item_id)")
+
+# 검색 색인 - 메뉴 rowid는 id * 2, 옵션 rowid는 id * 2 + 1
+# menu_search는 3글자 이상 부분 문자열(trigram), menu_search_prefix는 단어 앞부분(1~2글자) 검색용
+SEARCH_TABLES = (
+    ("menu_search", "tokenize='trigram'"),
+    ("menu_search_prefix", "tokenize='unicode61', prefix='1 2'"),
+)
+SEARCH_SOURCES = (
+    ("menu_items", "new.id * 2", "old.id * 2", "new.description"),
+    ("options", "new.id * 2 + 1", "old.id * 2 + 1", "NULL"),
+)
+
+def _add_search_index(cursor: sqlite3.Cursor):
+    for search_table, tokenizer in SEARCH_TABLES:
+        cursor.execute(f'''
+            CREATE VIRTUAL TABLE IF NOT EXISTS {search_table} USING fts5 (
+                name, description, is_available UNINDEXED, {tokenizer}
+            )
+        ''')
+        # 이름이 설명보다 10배 중요하도록 BM25 가중치 설정 (ORDER BY rank에 적용)
+        cursor.execute(f"INSERT INTO {search_table} ({search_table}, rank) VALUES ('rank', 'bm25(10.0, 1.0)')")
+        
+        for table, new_rowid, old_rowid, description in SEARCH_SOURCES:
+            insert = f'''
+                INSERT INTO {search_table} (rowid, name, description, is_available)
+                VALUES ({new_rowid}, new.name, {description}, new.is_available);
+            '''
+            delete = f"DELETE FROM {search_table} WHERE rowid = {old_rowid};"
+            for event, body in (("INSERT", insert), ("UPDATE", delete + insert), ("DELETE", delete)):
+                cursor.execute(f'''
+                    CREATE TRIGGER IF NOT EXISTS {table}_{event.lower()}_{search_table}
+                    AFTER {event} ON {table}
+                    BEGIN
+                        {body}
+                    END
+                ''')
+        
+        # 기존 메뉴/옵션 색인
+        cursor.execute(f"DELETE FROM {search_table}")
+        cursor.execute(f'''
+            INSERT INTO {search_table} (rowid, name, description, is_available)
+            SELECT id * 2, name, description, is_available FROM menu_items
+            UNION ALL
+            SELECT id * 2 + 1, name, NULL, is_available FROM options
+        ''')
+
+def _add_order_list_indexes(cursor: sqlite3.Cursor):
+    # 주문 목록 키셋 페이지네이션 (created_at, id) - id는 rowid라 인덱스에 포함된다
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_orders_created_at ON orders (created_at)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_orders_status_created_at ON orders (status, created_at)")
+
+def _add_order_status_history(cursor: sqlite3.Cursor):
+    # 주문 상태 변경 기록
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS order_status_history (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            order_id INTEGER NOT NULL,
+            from_status TEXT,
+            to_status TEXT NOT NULL,
+            note TEXT,
+            changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (order_id) REFERENCES orders (id)
+        )
+    ''')
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_order_status_history_order_id ON order_status_history (order_id)")
+    # 기존 주문의 현재 상태를 첫 기록으로 남긴다
+    cursor.execute('''
+        INSERT INTO order_status_history (order_id, from_status, to_status, changed_at)
+        SELECT id, NULL, status, created_at FROM orders
+    ''')
+    # 진행 중인 주문만 담는 부분 인덱스 - 완료된 주문이 쌓여도 작업 대기열 조회 크기는 그대로다
+    # (order_status.ACTIVE_STATUS_CONDITION과 같은 조건)
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_orders_active ON orders (status, created_at)
+        WHERE status IN ('pending', 'accepted', 'cooking', 'ready')
+    ''')
+
+def _add_sales_rollups(cursor: sqlite3.Cursor):
+    create_rollup_tables(cursor)
+    # 기존 주문으로 집계를 채운다
+    rebuild_rollups(cursor)
+
+def _add_idempotency_keys(cursor: sqlite3.Cursor):
+    # 주문 생성 Idempotency-Key - 주문과 같은 트랜잭션에서 저장한다 (idempotency.py)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS idempotency_keys (
+            key TEXT PRIMARY KEY,
+            request_hash TEXT NOT NULL,
+            order_id INTEGER NOT NULL,
+            response TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_idempotency_keys_created_at ON idempotency_keys (created_at)")
+
+def _add_order_number_blocks(cursor: sqlite3.Cursor):
+    # 매장/날짜별 주문 번호 예약 현황 (order_numbers.py) - 행마다 마지막으로 예약한 번호
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS order_number_blocks (
+            store_id TEXT NOT NULL,
+            day TEXT NOT NULL, -- 'YYYYMMDD'
+            last_number INTEGER NOT NULL,
+            PRIMARY KEY (store_id, day)
+        )
+    ''')
+
+def _drop_prefix_search_index(cursor: sqlite3.Cursor):
+    # 단어 앞부분 색인은 1~2글자 검색어를 단어 중간에서 찾지 못한다 (버전 10의 짧은 단어 색인으로 대체)
+    for table, *_ in SEARCH_SOURCES:
+        for event in ("insert", "update", "delete"):
+            cursor.execute(f"DROP TRIGGER IF EXISTS {table}_{event}_menu_search_prefix")
+    cursor.execute("DROP TABLE IF EXISTS menu_search_prefix")
+
+def _add_short_term_search_index(cursor: sqlite3.Cursor):
+    # 1~2글자 검색어용 색인 - 이름/설명을 단어별 1~2글자 조각으로 나눠 넣는다 (menu_search.search_grams)
+    # 트리거가 SQL 함수를 부르므로 menu_items/options를 바꾸는 커넥션은 register_search_functions가 필요하다
+    cursor.execute('''
+        CREATE VIRTUAL TABLE IF NOT EXISTS menu_search_short USING fts5 (
+            name, description, is_available UNINDEXED, tokenize='unicode61'
+        )
+    ''')
+    # trigram 색인과 같은 BM25 가중치 (이름 10, 설명 1)
+    cursor.execute("INSERT INTO menu_search_short (menu_search_short, rank) VALUES ('rank', 'bm25(10.0, 1.0)')")
+    
+    for table, new_rowid, old_rowid, description in SEARCH_SOURCES:
+        insert = f'''
+            INSERT INTO menu_search_short (rowid, name, description, is_available)
+            VALUES ({new_rowid}, {SHORT_GRAMS_FUNCTION}(new.name), {SHORT_GRAMS_FUNCTION}({description}), new.is_available);
+        '''
+        delete = f"DELETE FROM menu_search_short WHERE rowid = {old_rowid};"
+        for event, body in (("INSERT", insert), ("UPDATE", delete + insert), ("DELETE", delete)):
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS {table}_{event.lower()}_menu_search_short
+                AFTER {event} ON {table}
+                BEGIN
+                    {body}
+                END
+            ''')
+    
+    # 기존 메뉴/옵션 색인
+    cursor.execute("DELETE FROM menu_search_short")
+    cursor.execute(f'''
+        INSERT INTO menu_search_short (rowid, name, description, is_available)
+        SELECT id * 2, {SHORT_GRAMS_FUNCTION}(name), {SHORT_GRAMS_FUNCTION}(description), is_available FROM menu_items
+        UNION ALL
+        SELECT id * 2 + 1, {SHORT_GRAMS_FUNCTION}(name), NULL, is_available FROM options
+    ''')
+
+# (버전, 설명, 적용 함수) - 버전은 1부터 순서대로 증가해야 한다
+MIGRATIONS: List[Tuple[int, str, Callable[[sqlite3.Cursor], None]]] = [
+    (1, "기본 스키마", _create_base_schema),
+    (2, "조회용 보조 인덱스", _add_hot_path_indexes),
+    (3, "메뉴 검색 색인 (FTS5)", _add_search_index),
+    (4, "주문 목록 인덱스", _add_order_list_indexes),
+    (5, "주문 상태 기록 및 진행 중 주문 인덱스", _add_order_status_history),
+    (6, "매출 집계 테이블", _add_sales_rollups),
+    (7, "주문 멱등성 키", _add_idempotency_keys),
+    (8, "주문 번호 예약", _add_order_number_blocks),
+    (9, "메뉴 검색 접두어 색인 제거", _drop_prefix_search_index),
+    (10, "메뉴 검색 짧은 단어 색인", _add_short_term_search_index),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+def migrate(conn: sqlite3.Connection) -> int:
+    """적용되지 않은 마이그레이션을 하나의 트랜잭션으로 적용하고 최종 버전을 반환"""
+    if get_schema_version(conn) >= LATEST_VERSION:
+        return LATEST_VERSION  # 스키마가 최신이면 DDL을 실행하지 않는다
+    
+    register_search_functions(conn)
+    cursor = conn.cursor()
+    # 여러 워커가 동시에 시작해도 한 곳에서만 적용되도록 쓰기 잠금 후 다시 확인
+    cursor.execute("BEGIN IMMEDIATE")
+    try:
+        version = get_schema_version(conn)
+        for migration_version, _, apply in MIGRATIONS:
+            if migration_version > version:
+                apply(cursor)
+                version = migration_version
+        cursor.execute(f"PRAGMA user_version = {version}")
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    return version
+
+if __name__ == "__main__":
+    from query_plans import print_query_plans
+
+    db_path = sys.argv[1] if len(sys.argv) > 1 else "menu.db"
+    conn = sqlite3.connect(db_path)
+    print(f"📦 스키마 버전: {get_schema_version(conn)} -> {migrate(conn)}")
+    conn.close()
+    # 실제 DatabaseManager 쿼리가 인덱스를 타는지 EXPLAIN QUERY PLAN으로 확인
+    sys.exit(0 if print_query_plans(db_path) else 1)
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 
 class CategoryResponse(BaseModel):
@@ -55,3 +55,110 @@ class VoiceGuideResponse(BaseModel):
 class MenuItemDetailResponse(MenuItemResponse):
     category_name: str
     available_options: List[OptionResponse]
+
+class CatalogCategory(CategoryResponse):
+    option_types: List[str]
+    menu_items: List[MenuItemResponse]
+
+class CatalogResponse(BaseModel):
+    version: int
+    categories: List[CatalogCategory]
+    option_groups: Dict[str, List[OptionResponse]]  # {option_type: [options]}
+
+class VoiceMatchRequest(BaseModel):
+    transcript: str
+    limit: int = 5
+    menu_item_id: Optional[int] = None  # 지정하면 이 메뉴에 선택 가능한 옵션만 매칭
+
+class VoiceMenuCandidate(BaseModel):
+    id: int
+    name: str
+    price: int
+    category_id: int
+    category_name: str
+    score: float
+
+class VoiceOptionCandidate(BaseModel):
+    id: int
+    name: str
+    price: int
+    option_type: str
+    score: float
+
+class VoiceMatchResponse(BaseModel):
+    version: int
+    transcript: str
+    normalized: str
+    menus: List[VoiceMenuCandidate]
+    options: List[VoiceOptionCandidate]
+
+class SearchResult(BaseModel):
+    kind: str  # 'menu' 또는 'option'
+    id: int
+    name: str
+    price: int
+    category_id: Optional[int] = None
+    category_name: Optional[str] = None
+    option_type: Optional[str] = None
+    score: float
+
+class SearchResponse(BaseModel):
+    query: str
+    results: List[SearchResult]
+
+class OrderItemOptionDetail(BaseModel):
+    id: int
+    option_id: int
+    name: Optional[str] = None  # 삭제된 옵션이면 None
+    quantity: int
+    option_price: int
+
+class OrderItemDetail(BaseModel):
+    id: int
+    menu_item_id: int
+    name: Optional[str] = None  # 삭제된 메뉴면 None
+    quantity: int
+    item_price: int
+    total_price: int
+    options: List[OrderItemOptionDetail]
+
+class OrderDetailResponse(OrderResponse):
+    items: List[OrderItemDetail]
+
+class OrderListResponse(BaseModel):
+    orders: List[OrderDetailResponse]
+    next_cursor: Optional[str] = None  # 다음 페이지 조회용 (마지막 페이지면 None)
+
+class OrderStatusUpdateRequest(BaseModel):
+    status: str  # accepted, cooking, ready, picked_up, cancelled
+    note: Optional[str] = None
+
+class OrderStatusHistoryEntry(BaseModel):
+    from_status: Optional[str] = None
+    to_status: str
+    note: Optional[str] = None
+    changed_at: datetime
+
+class HourlySales(BaseModel):
+    hour: str  # 'YYYY-MM-DD HH:00' (UTC)
+    order_count: int
+    item_quantity: int
+    revenue: int
+
+class MenuItemSales(BaseModel):
+    menu_item_id: int
+    name: Optional[str] = None
+    quantity: int
+    revenue: int
+
+class OptionSales(BaseModel):
+    option_id: int
+    name: Optional[str] = None
+    option_type: Optional[str] = None
+    quantity: int
+    revenue: int
+
+class StatusSales(BaseModel):
+    status: str
+    order_count: int
+    revenue: int
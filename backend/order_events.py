@@ -0,0 +1,124 @@
+"""
+주문 이벤트 방송 - 주방 화면 등이 폴링 없이 새 주문/상태 변경을 받는다
+
+이벤트는 발행할 때 SSE 프레임으로 한 번만 직렬화하고, 구독자마다 크기가 정해진 큐에 넣는다.
+큐가 가득 찬 느린 구독자는 끊고, 다시 연결할 때 Last-Event-ID 이후 이벤트를 최근 기록에서 보내 준다.
+"""
+import asyncio
+import json
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Set
+
+ORDER_CREATED = "order.created"
+ORDER_STATUS_CHANGED = "order.status_changed"
+# 요청한 이벤트가 최근 기록에 없을 때 보내는 이벤트 (클라이언트는 GET /orders로 다시 읽는다)
+STREAM_RESET = "stream.reset"
+
+class OrderEvent:
+    __slots__ = ("seq", "id", "type", "data", "frame")
+
+    def __init__(self, epoch: int, seq: int, event_type: str, data: Dict[str, Any]):
+        self.seq = seq
+        self.id = f"{epoch}-{seq}"
+        self.type = event_type
+        self.data = data
+        payload = json.dumps(data, ensure_ascii=False, separators=(",", ":"), default=str)
+        self.frame = f"id: {self.id}\nevent: {event_type}\ndata: {payload}\n\n".encode("utf-8")
+
+class Subscription:
+    """구독자 한 명의 이벤트 큐 (max_queue개를 넘으면 dropped가 된다)"""
+
+    def __init__(self, max_queue: int):
+        self.max_queue = max_queue
+        self.dropped = False
+        self._events: Deque[OrderEvent] = deque()
+        self._wakeup = asyncio.Event()
+
+    def push(self, event: OrderEvent) -> bool:
+        if len(self._events) >= self.max_queue:
+            self.dropped = True
+            self._wakeup.set()
+            return False
+        self._events.append(event)
+        self._wakeup.set()
+        return True
+
+    async def next_batch(self, timeout: float) -> List[OrderEvent]:
+        """쌓인 이벤트를 모두 꺼낸다 (timeout초 동안 없으면 빈 목록)"""
+        if not self._events and not self.dropped:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        self._wakeup.clear()
+        events = list(self._events)
+        self._events.clear()
+        return events
+
+class OrderEventBroker:
+    """프로세스 안의 주문 이벤트 발행/구독
+
+    publish와 subscribe는 이벤트 루프 스레드에서 호출해야 한다.
+    이벤트 id는 '시작 시각-순번' 형식이라 서버가 재시작되면 이전 id로는 이어 받지 못하고 reset을 받는다.
+    """
+
+    def __init__(self, history_size: int = 1000, max_queue: int = 256):
+        self.epoch = int(time.time() * 1000)
+        self.max_queue = max_queue
+        self._seq = 0
+        self._history: Deque[OrderEvent] = deque(maxlen=history_size)
+        self._subscribers: Set[Subscription] = set()
+        self._published = 0
+        self._dropped = 0
+
+    def publish(self, event_type: str, data: Dict[str, Any]) -> OrderEvent:
+        self._seq += 1
+        event = OrderEvent(self.epoch, self._seq, event_type, data)
+        self._history.append(event)
+        self._published += 1
+
+        slow = [subscription for subscription in self._subscribers if not subscription.push(event)]
+        for subscription in slow:
+            self.unsubscribe(subscription)
+            self._dropped += 1
+        return event
+
+    def _replay_after(self, last_event_id: Optional[str]) -> Optional[List[OrderEvent]]:
+        """last_event_id 다음 이벤트 목록 (이어 줄 수 없으면 None)"""
+        if not last_event_id:
+            return []
+        epoch, _, seq = last_event_id.partition("-")
+        if not (epoch.isdigit() and seq.isdigit()) or int(epoch) != self.epoch:
+            return None
+        seq = int(seq)
+        if seq > self._seq:
+            return None
+        # 기록에서 빠진 이벤트가 있으면 이어 줄 수 없다
+        if seq < self._seq and (not self._history or self._history[0].seq > seq + 1):
+            return None
+        return [event for event in self._history if event.seq > seq]
+
+    def subscribe(self, last_event_id: Optional[str] = None) -> Subscription:
+        subscription = Subscription(self.max_queue)
+        replay = self._replay_after(last_event_id)
+        if replay is None or len(replay) > self.max_queue:
+            subscription.push(OrderEvent(self.epoch, self._seq, STREAM_RESET, {"reason": "history_unavailable"}))
+        else:
+            for event in replay:
+                subscription.push(event)
+        self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        self._subscribers.discard(subscription)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "epoch": self.epoch,
+            "last_event_id": f"{self.epoch}-{self._seq}",
+            "subscribers": len(self._subscribers),
+            "published": self._published,
+            "dropped_subscribers": self._dropped,
+            "history": len(self._history),
+        }
@@ -0,0 +1,93 @@
+"""
+정산용 주문 내보내기 - DB 행 배치를 CSV/NDJSON 조각으로 바꿔 바로 내보낸다
+
+한 번에 한 배치만 메모리에 올리므로 주문 수와 관계없이 사용하는 메모리가 일정하다.
+"""
+import csv
+import io
+import json
+import zlib
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+EXPORT_FORMATS = ("csv", "ndjson")
+
+CSV_COLUMNS = [
+    "order_number", "created_at", "status", "total_amount",
+    "order_item_id", "menu_item_id", "menu_name", "quantity", "item_price", "total_price",
+    "option_id", "option_name", "option_quantity", "option_price",
+]
+
+def csv_chunks(batches: Iterable[List[Any]]) -> Iterator[bytes]:
+    """주문 아이템 옵션 하나당 한 행 (옵션이 없는 아이템은 옵션 열이 빈 한 행)"""
+    output = io.StringIO()
+    writer = csv.writer(output)
+    writer.writerow(CSV_COLUMNS)
+    for rows in batches:
+        writer.writerows([row[column] for column in CSV_COLUMNS] for row in rows)
+        yield output.getvalue().encode("utf-8")
+        output.seek(0)
+        output.truncate()
+    if output.tell():
+        yield output.getvalue().encode("utf-8")
+
+class _OrderGrouper:
+    """연속으로 나오는 한 주문의 행을 아이템/옵션이 중첩된 주문 하나로 묶는다"""
+
+    def __init__(self):
+        self.order: Optional[Dict[str, Any]] = None
+        self._items: Dict[int, Dict[str, Any]] = {}
+
+    def add(self, row) -> Optional[Dict[str, Any]]:
+        """행을 더하고, 이전 주문이 끝났으면 그 주문을 반환"""
+        finished = None
+        if self.order is None or self.order['id'] != row['order_id']:
+            finished = self.order
+            self.order = {
+                'id': row['order_id'], 'order_number': row['order_number'], 'created_at': row['created_at'],
+                'status': row['status'], 'total_amount': row['total_amount'], 'items': [],
+            }
+            self._items = {}
+        item = self._items.get(row['order_item_id'])
+        if item is None:
+            item = {
+                'id': row['order_item_id'], 'menu_item_id': row['menu_item_id'], 'name': row['menu_name'],
+                'quantity': row['quantity'], 'item_price': row['item_price'],
+                'total_price': row['total_price'], 'options': [],
+            }
+            self._items[item['id']] = item
+            self.order['items'].append(item)
+        if row['option_id'] is not None:
+            item['options'].append({
+                'option_id': row['option_id'], 'name': row['option_name'],
+                'quantity': row['option_quantity'], 'option_price': row['option_price'],
+            })
+        return finished
+
+def ndjson_chunks(batches: Iterable[List[Any]]) -> Iterator[bytes]:
+    """주문 하나당 한 줄 (아이템과 옵션은 중첩)"""
+    grouper = _OrderGrouper()
+    for rows in batches:
+        lines = []
+        for row in rows:
+            finished = grouper.add(row)
+            if finished is not None:
+                lines.append(json.dumps(finished, ensure_ascii=False, separators=(",", ":")))
+        if lines:
+            yield ("\n".join(lines) + "\n").encode("utf-8")
+    if grouper.order is not None:
+        yield (json.dumps(grouper.order, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+def gzip_chunks(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """조각 단위로 gzip 압축 (전체를 모으지 않는다)"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # 31: gzip 헤더 포함
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+def export_chunks(batches: Iterable[List[Any]], fmt: str, gzip: bool = False) -> Iterator[bytes]:
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"지원하지 않는 형식입니다: {fmt} ({', '.join(EXPORT_FORMATS)})")
+    chunks = csv_chunks(batches) if fmt == "csv" else ndjson_chunks(batches)
+    return gzip_chunks(chunks) if gzip else chunks
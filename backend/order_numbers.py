@@ -0,0 +1,78 @@
+"""
+주문 번호 발급 - 매장/날짜별로 1부터 증가하는 짧은 번호 ('20240501-A-0042')
+
+워커마다 번호를 block_size개씩 DB에서 예약해 두고(작은 쓰기 트랜잭션 한 번) 메모리에서 하나씩 꺼내 쓰므로
+주문마다 DB를 거치지 않는다. 예약은 DB의 order_number_blocks 행을 올리는 방식이라
+워커가 여러 개이거나 서버가 재시작돼도 번호가 겹치지 않는다.
+워커 사이에서는 블록 단위로 번호가 섞이고, 재시작하면 쓰지 않은 예약 번호는 건너뛴다.
+"""
+import asyncio
+import re
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, Optional
+
+_STORE_ID = re.compile(r"^[A-Za-z0-9]{1,8}$")
+_ORDER_NUMBER_DATE = re.compile(r"(?:^|-)(\d{4})(\d{2})\d{2}")
+
+def format_order_number(day: str, store_id: str, number: int) -> str:
+    """day는 'YYYYMMDD' - 같은 날짜/매장 번호가 이어지도록 날짜를 앞에 둔다 (UNIQUE 인덱스에 순서대로 들어간다)"""
+    return f"{day}-{store_id}-{number:04d}"
+
+def order_number_month(order_number: str) -> Optional[str]:
+    """주문 번호의 달 ('YYYY-MM') - 'YYYYMMDD-A-0001'과 예전 형식 'ORD-YYYYMMDDHHMMSS-xxxx' 모두 지원"""
+    match = _ORDER_NUMBER_DATE.search(order_number)
+    return f"{match.group(1)}-{match.group(2)}" if match else None
+
+# (매장 ID, 'YYYYMMDD', 개수) -> 예약한 첫 번호
+ReserveFunc = Callable[[str, str, int], Awaitable[int]]
+
+class OrderNumberAllocator:
+    """매장 하나의 주문 번호 발급기 (이벤트 루프 스레드에서 사용)"""
+
+    def __init__(self, reserve: ReserveFunc, store_id: str = "A", block_size: int = 20):
+        if not _STORE_ID.match(store_id):
+            raise ValueError("매장 ID는 영문/숫자 1~8자여야 합니다.")
+        if block_size < 1:
+            raise ValueError("주문 번호 예약 크기는 1 이상이어야 합니다.")
+        self.store_id = store_id
+        self.block_size = block_size
+        self._reserve = reserve
+        self._lock = asyncio.Lock()
+        self._day: Optional[str] = None
+        self._next = 0
+        self._end = 0
+        self._issued = 0
+        self._reservations = 0
+
+    def _take(self, day: str) -> Optional[int]:
+        if day != self._day or self._next >= self._end:
+            return None
+        number = self._next
+        self._next += 1
+        self._issued += 1
+        return number
+
+    async def allocate(self, now: Optional[datetime] = None) -> str:
+        """다음 주문 번호 (예약해 둔 번호가 남아 있으면 DB를 거치지 않는다)"""
+        day = (now or datetime.now()).strftime("%Y%m%d")
+        number = self._take(day)
+        if number is None:
+            # 동시에 여러 요청이 블록을 다 썼어도 예약은 한 번만 한다
+            async with self._lock:
+                number = self._take(day)
+                if number is None:
+                    first = await self._reserve(self.store_id, day, self.block_size)
+                    self._day, self._next, self._end = day, first, first + self.block_size
+                    self._reservations += 1
+                    number = self._take(day)
+        return format_order_number(day, self.store_id, number)
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "store_id": self.store_id,
+            "block_size": self.block_size,
+            "day": self._day,
+            "remaining": max(self._end - self._next, 0),
+            "issued": self._issued,
+            "reservations": self._reservations,
+        }
@@ -0,0 +1,66 @@
+"""
+주문 가격 계산 - 카탈로그 스냅샷만으로 주문 아이템/옵션 가격을 정한다 (DB를 거치지 않는다)
+"""
+from typing import Any, Dict, List, Tuple
+
+from catalog import MenuCatalog
+from models import OrderItem
+
+class PricingError(ValueError):
+    """주문할 수 없는 메뉴/옵션 - status_code는 그대로 HTTP 응답 코드로 쓴다"""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+# (총 금액, 주문 아이템, 주문 아이템 옵션)
+PricedOrder = Tuple[int, List[Dict[str, Any]], List[Dict[str, Any]]]
+
+def price_order(catalog: MenuCatalog, items: List[OrderItem]) -> PricedOrder:
+    """DatabaseManager.place_order에 넘길 아이템/옵션 목록과 총 금액을 계산"""
+    if not items:
+        raise PricingError(400, "주문할 메뉴를 한 개 이상 담아주세요.")
+
+    total_amount = 0
+    order_items_data = []
+    order_options_data = []
+
+    for item in items:
+        # 0개나 음수 수량은 총 금액과 매출 집계를 틀어지게 한다
+        if item.quantity < 1:
+            raise PricingError(400, f"메뉴 아이템 ID {item.menu_item_id}의 수량은 1개 이상이어야 합니다.")
+        menu_item = catalog.get_menu_item_by_id(item.menu_item_id)
+        if not menu_item:
+            raise PricingError(404, f"메뉴 아이템 ID {item.menu_item_id}를 찾을 수 없습니다.")
+
+        # 메뉴 아이템 기본 가격
+        item_total = menu_item['price'] * item.quantity
+
+        # 옵션 가격 추가 (옵션 인덱스에서 바로 조회하고 메뉴에 허용된 타입인지 확인)
+        option_types = catalog.get_option_types(menu_item['category_id'])
+        for option in item.options:
+            if option.quantity < 1:
+                raise PricingError(400, f"옵션 ID {option.option_id}의 수량은 1개 이상이어야 합니다.")
+            option_data = catalog.get_option_by_id(option.option_id)
+            if not option_data or not option_data['is_available']:
+                raise PricingError(404, f"옵션 ID {option.option_id}를 찾을 수 없습니다.")
+            if option_data['option_type'] not in option_types:
+                raise PricingError(400, f"옵션 ID {option.option_id}는 메뉴 아이템 ID {item.menu_item_id}에 선택할 수 없습니다.")
+            item_total += option_data['price'] * option.quantity
+            order_options_data.append({
+                'item_index': len(order_items_data),
+                'option_id': option.option_id,
+                'quantity': option.quantity,
+                'option_price': option_data['price']
+            })
+
+        total_amount += item_total
+        order_items_data.append({
+            'menu_item_id': item.menu_item_id,
+            'quantity': item.quantity,
+            'item_price': menu_item['price'],
+            'total_price': item_total
+        })
+
+    return total_amount, order_items_data, order_options_data
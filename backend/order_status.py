@@ -0,0 +1,33 @@
+"""
+주문 상태 - 상태 전이 규칙과 진행 중인 주문 조건
+"""
+from typing import Dict, Tuple
+
+PENDING = "pending"
+ACCEPTED = "accepted"
+COOKING = "cooking"
+READY = "ready"
+PICKED_UP = "picked_up"
+CANCELLED = "cancelled"
+
+STATUSES = (PENDING, ACCEPTED, COOKING, READY, PICKED_UP, CANCELLED)
+
+# 현재 상태 -> 바꿀 수 있는 상태
+TRANSITIONS: Dict[str, Tuple[str, ...]] = {
+    PENDING: (ACCEPTED, CANCELLED),
+    ACCEPTED: (COOKING, CANCELLED),
+    COOKING: (READY, CANCELLED),
+    READY: (PICKED_UP,),
+    PICKED_UP: (),
+    CANCELLED: (),
+}
+
+# 주방 작업 대기열에 남아 있는 상태
+ACTIVE_STATUSES = (PENDING, ACCEPTED, COOKING, READY)
+
+# 부분 인덱스 idx_orders_active의 조건 - SQLite는 쿼리 WHERE에 이 조건이 그대로 있어야
+# 부분 인덱스를 쓰므로 진행 중인 주문 조회는 반드시 이 문자열을 포함한다 (migrations.py와 같아야 함)
+ACTIVE_STATUS_CONDITION = "status IN ('pending', 'accepted', 'cooking', 'ready')"
+
+def can_transition(current: str, new: str) -> bool:
+    return new in TRANSITIONS.get(current, ())
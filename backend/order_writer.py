@@ -0,0 +1,162 @@
+"""
+주문 그룹 커밋 - 동시에 들어온 주문을 전용 쓰기 스레드가 모아서 한 트랜잭션으로 커밋한다
+
+SQLite는 쓰기 잠금을 한 번에 하나만 잡으므로 주문마다 커밋하면 피크 때 잠금 대기와 커밋 비용이 주문 수만큼 쌓인다.
+쓰기 스레드는 큐에서 첫 주문을 꺼낸 뒤 max_delay_ms 동안 또는 max_batch개가 될 때까지 더 모아서
+DatabaseManager.place_order_batch로 한 번에 저장하고, 주문마다 결과(또는 예외)를 Future로 돌려준다.
+요청별 DB 지표(metrics.py)에는 함께 커밋된 배치 전체의 쿼리 수와 시간이 잡힌다.
+"""
+import asyncio
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional
+
+from database import DatabaseManager
+from metrics import DbUsage, current_db_usage, using_db_usage
+
+logger = logging.getLogger(__name__)
+
+# 배치 크기 분포 구간 (이하)
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128)
+
+class GroupCommitWriter:
+    def __init__(self, db_manager: DatabaseManager, max_batch: int = 32, max_delay_ms: float = 5.0):
+        if max_batch < 1:
+            raise ValueError("그룹 커밋 배치 크기는 1 이상이어야 합니다.")
+        self.db_manager = db_manager
+        self.max_batch = max_batch
+        self.max_delay = max_delay_ms / 1000
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._batches = 0
+        self._orders = 0
+        self._failed = 0
+        self._cancelled = 0
+        self._max_batch_seen = 0
+        self._batch_sizes = [0] * (len(BATCH_SIZE_BUCKETS) + 1)
+        self._commit_time = 0.0
+        self._max_commit_time = 0.0
+        self._last_commit_time = 0.0
+        self._peak_queue = 0
+        self._thread = threading.Thread(target=self._run, name="order-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, order: Dict[str, Any], items: List[Dict[str, Any]], options: List[Dict[str, Any]],
+               idempotency: Optional[Dict[str, Any]] = None) -> Future:
+        """주문을 큐에 넣고 place_order 결과를 받을 Future를 반환"""
+        if self._closed:
+            raise RuntimeError("닫힌 주문 쓰기 큐입니다.")
+        future: Future = Future()
+        self._queue.put((future, (order, items, options, idempotency), current_db_usage()))
+        depth = self._queue.qsize()
+        with self._lock:
+            self._peak_queue = max(self._peak_queue, depth)
+        return future
+
+    async def place_order(self, order: Dict[str, Any], items: List[Dict[str, Any]],
+                          options: List[Dict[str, Any]],
+                          idempotency: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """AsyncDatabaseManager.place_order와 같은 결과 (그룹 커밋이 끝나면 반환)"""
+        return await asyncio.wrap_future(self.submit(order, items, options, idempotency))
+
+    def _collect(self, first: tuple) -> List[tuple]:
+        batch = [first]
+        deadline = time.perf_counter() + self.max_delay
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            try:
+                entry = self._queue.get_nowait() if remaining <= 0 else self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if entry is None:
+                # 종료 신호는 이번 배치를 커밋한 뒤 처리한다
+                self._queue.put(None)
+                break
+            batch.append(entry)
+        return batch
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = self._collect(first)
+            # 기다리던 요청이 취소된 주문은 저장하지 않는다 (이후에는 Future를 취소할 수 없다)
+            live = [entry for entry in batch if entry[0].set_running_or_notify_cancel()]
+            if len(live) < len(batch):
+                with self._lock:
+                    self._cancelled += len(batch) - len(live)
+            if not live:
+                continue
+            usage = DbUsage()
+            started = time.perf_counter()
+            try:
+                with using_db_usage(usage):
+                    results = self.db_manager.place_order_batch([request for _, request, _ in live])
+            except BaseException as e:
+                # 커밋 자체가 실패하면 배치 전체가 실패한다
+                results = [e] * len(live)
+            elapsed = time.perf_counter() - started
+            failed = 0
+            for (future, _, request_usage), result in zip(live, results):
+                if isinstance(result, BaseException):
+                    failed += 1
+                try:
+                    # 결과를 넘기기 전에 더해야 요청이 끝날 때 지표에 들어간다
+                    if request_usage is not None:
+                        request_usage.add(usage)
+                    if isinstance(result, BaseException):
+                        future.set_exception(result)
+                    else:
+                        future.set_result(result)
+                except Exception:
+                    # Future 하나 때문에 쓰기 스레드가 끝나면 이후 주문이 모두 멈춘다
+                    logger.exception("주문 그룹 커밋 결과를 전달하지 못했습니다.")
+            self._record(len(live), failed, elapsed)
+
+    def _record(self, size: int, failed: int, elapsed: float):
+        bucket = next((index for index, bound in enumerate(BATCH_SIZE_BUCKETS) if size <= bound), len(BATCH_SIZE_BUCKETS))
+        with self._lock:
+            self._batches += 1
+            self._orders += size
+            self._failed += failed
+            self._max_batch_seen = max(self._max_batch_seen, size)
+            self._batch_sizes[bucket] += 1
+            self._commit_time += elapsed
+            self._max_commit_time = max(self._max_commit_time, elapsed)
+            self._last_commit_time = elapsed
+
+    def close(self, timeout: float = 5.0):
+        """큐에 남은 주문을 모두 커밋한 뒤 쓰기 스레드를 끝낸다"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            batches = self._batches
+            return {
+                "max_batch": self.max_batch,
+                "max_delay_ms": self.max_delay * 1000,
+                "queue_depth": self._queue.qsize(),
+                "peak_queue_depth": self._peak_queue,
+                "batches": batches,
+                "orders": self._orders,
+                "failed_orders": self._failed,
+                "cancelled_orders": self._cancelled,
+                "avg_batch_size": round(self._orders / batches, 2) if batches else 0.0,
+                "max_batch_size": self._max_batch_seen,
+                "batch_size_histogram": {
+                    **{f"le_{bound}": count for bound, count in zip(BATCH_SIZE_BUCKETS, self._batch_sizes)},
+                    "gt_" + str(BATCH_SIZE_BUCKETS[-1]): self._batch_sizes[-1],
+                },
+                "avg_commit_ms": round(self._commit_time / batches * 1000, 3) if batches else 0.0,
+                "max_commit_ms": round(self._max_commit_time * 1000, 3),
+                "last_commit_ms": round(self._last_commit_time * 1000, 3),
+            }
@@ -0,0 +1,21 @@
+"""
+키셋 페이지네이션 커서 - 마지막으로 본 행의 정렬 키를 URL에 넣을 수 있는 문자열로 바꾼다
+"""
+import base64
+import json
+from typing import Any, Tuple
+
+def encode_cursor(key: Tuple[Any, ...]) -> str:
+    raw = json.dumps(list(key), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str, size: int) -> Tuple[Any, ...]:
+    """encode_cursor로 만든 문자열을 정렬 키로 되돌린다 (형식이 틀리면 ValueError)"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        key = json.loads(raw.decode("utf-8"))
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError("올바르지 않은 커서입니다.")
+    if not isinstance(key, list) or len(key) != size:
+        raise ValueError("올바르지 않은 커서입니다.")
+    return tuple(key)
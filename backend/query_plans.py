@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+조회 쿼리 실행 계획 확인 - DatabaseManager 메서드를 실제로 호출하고 실행된 SQL을 sqlite3 trace 콜백으로 모아
+각 SQL의 EXPLAIN QUERY PLAN에 테이블을 훑는 단계가 없는지 확인한다
+
+실제 테이블의 SCAN(인덱스 전체를 훑는 SCAN ... USING INDEX 포함)과 MATCH 조건 없는 FTS5 가상 테이블
+SCAN은 실패다. 카탈로그 스냅샷처럼 작은 메뉴 테이블 전체를 일부러 읽는 호출만 FULL_SCANS에 적은
+테이블을 훑어도 된다.
+
+손으로 옮긴 SQL이 아니라 실제로 실행된 SQL을 보므로 쿼리를 고치면 확인 대상도 함께 바뀐다.
+DB 파일은 임시 파일로 복사해서 확인하므로 원본은 바뀌지 않는다 (주문 저장/상태 변경도 호출한다).
+
+사용법:
+    python query_plans.py [menu.db]
+"""
+import os
+import re
+import sqlite3
+import sys
+import tempfile
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
+
+from archive import attached_archives, default_archive_dir
+from catalog import MenuCatalog
+from database import DatabaseManager
+from menu_io import normalize_menu
+from menu_search import build_match, parse_terms
+from order_status import ACCEPTED, PENDING
+
+# 실행 계획을 확인하지 않는 문 (트랜잭션 제어, 설정, 트리거 안의 문 등)
+_SKIPPED_STATEMENT = re.compile(r"^\s*(--|BEGIN|COMMIT|ROLLBACK|SAVEPOINT|RELEASE|PRAGMA|ATTACH|DETACH|CREATE|DROP)",
+                                re.IGNORECASE)
+
+# FTS5가 내부 테이블을 읽는 문 (예: SELECT k, v FROM 'main'.'menu_search_config')
+_INTERNAL_STATEMENT = re.compile(r"'\w+'\.'\w+'")
+
+# 보관 파일 스키마 이름 (archive.archive_schema)
+_ARCHIVE_SCHEMA = re.compile(r"\barchive_(\d{4})_(\d{2})\.")
+
+# FTS5 가상 테이블을 MATCH 색인으로 읽는 단계 (예: 'SCAN menu_search VIRTUAL TABLE INDEX 32:M3')
+_FTS_MATCH_PLAN = re.compile(r"VIRTUAL TABLE INDEX \d+:\S*M")
+
+# 실행 계획의 SCAN 대상 (테이블 이름 또는 별칭, '(subquery-1)'처럼 괄호로 시작하면 부분 쿼리)
+_SCAN_STEP = re.compile(r"^SCAN (\S+)")
+
+# FROM/JOIN 뒤의 테이블과 별칭 (예: 'FROM archive_2024_03.orders o', 'JOIN categories AS c')
+_TABLE_REFERENCE = re.compile(r"\b(?:FROM|JOIN)\s+(?:\w+\.)?(\w+)(?:\s+(?:AS\s+)?(\w+))?", re.IGNORECASE)
+
+_SQL_KEYWORDS = {"WHERE", "ON", "JOIN", "LEFT", "INNER", "CROSS", "ORDER", "GROUP", "LIMIT", "UNION", "USING", "SET",
+                 "NATURAL", "WINDOW", "HAVING"}
+
+def _report_range() -> Tuple[str, str]:
+    today = datetime.now(timezone.utc).date()
+    return str(today - timedelta(days=7)), str(today + timedelta(days=1))
+
+def _place_sample_order(db: DatabaseManager, sample: Dict[str, Any]):
+    order = {'order_number': "19990101-PLAN-0001", 'total_amount': 0, 'status': PENDING}
+    db.place_order(order, [{'menu_item_id': sample['menu_item_id'], 'quantity': 1, 'item_price': 0, 'total_price': 0}],
+                   [], None)
+
+# 인덱스를 타야 하는 DatabaseManager 호출 (이름, 호출) - sample은 확인용으로 만든 주문 번호 등
+PLAN_CHECKS: List[Tuple[str, Callable[[DatabaseManager, Dict[str, Any]], Any]]] = [
+    ("get_menu_version", lambda db, sample: db.get_menu_version()),
+    ("load_menu_snapshot (MenuCatalog.load)", lambda db, sample: MenuCatalog.load(db)),
+    ("get_categories", lambda db, sample: db.get_categories()),
+    ("get_voice_guide_data", lambda db, sample: db.get_voice_guide_data()),
+    ("export_menu", lambda db, sample: db.export_menu()),
+    ("import_menu", lambda db, sample: db.import_menu(normalize_menu(db.export_menu()))),
+    ("get_menu_items_by_category", lambda db, sample: db.get_menu_items_by_category(sample['category_id'])),
+    ("get_options_by_type", lambda db, sample: db.get_options_by_type("donkatsu")),
+    ("get_menu_item_by_id", lambda db, sample: db.get_menu_item_by_id(sample['menu_item_id'])),
+    ("search_menu", lambda db, sample: db.search_menu(*build_match(parse_terms("로스카츠")), 10)),
+    ("search_menu (short)", lambda db, sample: db.search_menu(*build_match(parse_terms("국수")), 10)),
+    ("search_menu (trigram + short)", lambda db, sample: db.search_menu(*build_match(parse_terms("로스카츠 등심")), 10)),
+    ("place_order", _place_sample_order),
+    ("reserve_order_numbers", lambda db, sample: db.reserve_order_numbers("PLAN", "19990101", 20)),
+    ("get_idempotency_record", lambda db, sample: db.get_idempotency_record("plan-check", 86400)),
+    ("purge_idempotency_keys", lambda db, sample: db.purge_idempotency_keys(86400)),
+    ("list_orders", lambda db, sample: db.list_orders(limit=50)),
+    ("list_orders (status)", lambda db, sample: db.list_orders(status=PENDING, limit=50)),
+    ("list_orders (since/until/before)", lambda db, sample: db.list_orders(
+        since="2024-01-01 00:00:00", until="2099-01-01 00:00:00", before=("2099-01-01 00:00:00", 1 << 62), limit=50)),
+    ("get_order_by_number", lambda db, sample: db.get_order_by_number(sample['order_number'])),
+    ("get_order_status_history", lambda db, sample: db.get_order_status_history(sample['order_number'])),
+    ("transition_order", lambda db, sample: db.transition_order(sample['order_number'], ACCEPTED)),
+    ("list_active_orders", lambda db, sample: db.list_active_orders(limit=50)),
+    ("list_active_orders (status)", lambda db, sample: db.list_active_orders(ACCEPTED, limit=1)),
+    ("get_hourly_sales", lambda db, sample: db.get_hourly_sales(*_report_range())),
+    ("get_menu_item_sales", lambda db, sample: db.get_menu_item_sales(*_report_range())),
+    ("get_option_sales", lambda db, sample: db.get_option_sales(*_report_range())),
+    ("get_status_sales", lambda db, sample: db.get_status_sales(*_report_range())),
+    ("iter_order_export_rows", lambda db, sample: [batch for batch in db.iter_order_export_rows(*_report_range())]),
+]
+
+# 메뉴 테이블 전체를 일부러 읽는 호출 - 이름: 훑어도 되는 테이블 (메뉴/옵션 수만큼만 읽는다)
+FULL_SCANS: Dict[str, FrozenSet[str]] = {
+    "load_menu_snapshot (MenuCatalog.load)": frozenset({"categories", "menu_items", "options"}),
+    "get_categories": frozenset({"categories"}),
+    "get_voice_guide_data": frozenset({"categories", "menu_items"}),
+    "export_menu": frozenset({"categories", "menu_items", "options"}),
+    "import_menu": frozenset({"categories", "menu_items", "options"}),
+}
+
+def table_aliases(sql: str) -> Dict[str, str]:
+    """SQL의 별칭 -> 테이블 이름 (테이블 이름은 자기 자신으로)"""
+    aliases: Dict[str, str] = {}
+    for table, alias in _TABLE_REFERENCE.findall(sql):
+        aliases[table] = table
+        if alias and alias.upper() not in _SQL_KEYWORDS:
+            aliases[alias] = table
+    return aliases
+
+def scan_violations(sql: str, plan: List[str], tables: FrozenSet[str],
+                    allowed: FrozenSet[str] = frozenset()) -> List[str]:
+    """테이블을 훑는 실행 계획 단계 목록 - tables는 실제 테이블 이름, allowed는 훑어도 되는 테이블"""
+    aliases = table_aliases(sql)
+    violations = []
+    for detail in plan:
+        match = _SCAN_STEP.match(detail)
+        if match is None:
+            continue
+        if "VIRTUAL TABLE" in detail:
+            # FTS5는 MATCH 조건이 있어야 색인을 쓴다
+            if not _FTS_MATCH_PLAN.search(detail):
+                violations.append(detail)
+            continue
+        table: Optional[str] = aliases.get(match.group(1), match.group(1))
+        if table in tables and table not in allowed:
+            violations.append(detail)
+    return violations
+
+def check_query_plans(db_path: str) -> List[Tuple[str, bool, List[Tuple[str, List[str], List[str]]]]]:
+    """PLAN_CHECKS의 호출마다 (이름, 훑는 단계가 없는지, [(SQL, 실행 계획, 훑는 단계)]) 반환"""
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        copy_path = os.path.join(tmp, "plan.db")
+        with sqlite3.connect(db_path) as source, sqlite3.connect(copy_path) as target:
+            source.backup(target)
+        # 커넥션이 하나뿐이어야 모든 호출이 trace 콜백을 건 커넥션을 쓴다
+        db = DatabaseManager(copy_path, pool_size=1, archive_dir=default_archive_dir(db_path))
+        try:
+            statements: List[str] = []
+            conn = db.pool.acquire()
+            db.pool.release(conn)
+            # 보관 파일도 같은 테이블 이름을 쓴다
+            tables = frozenset(row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'"))
+            menu_item = conn.execute("SELECT id, category_id FROM menu_items ORDER BY id LIMIT 1").fetchone()
+            sample = {'menu_item_id': menu_item['id'], 'category_id': menu_item['category_id'],
+                      'order_number': "19990101-PLAN-0001"}
+            for name, call in PLAN_CHECKS:
+                statements.clear()
+                conn.set_trace_callback(statements.append)
+                try:
+                    call(db, sample)
+                finally:
+                    conn.set_trace_callback(None)
+                checked = []
+                for sql in statements:
+                    if _SKIPPED_STATEMENT.match(sql) or _INTERNAL_STATEMENT.search(sql):
+                        continue
+                    # 보관 파일을 읽은 SQL은 그 파일들을 다시 붙여서 확인한다
+                    months = sorted({f"{year}-{month}" for year, month in _ARCHIVE_SCHEMA.findall(sql)})
+                    with attached_archives(conn, db.archive_dir, months):
+                        plan = [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}").fetchall()]
+                    checked.append((sql, plan, scan_violations(sql, plan, tables, FULL_SCANS.get(name, frozenset()))))
+                results.append((name, not any(violations for _, _, violations in checked), checked))
+        finally:
+            db.close()
+    return results
+
+def print_query_plans(db_path: str) -> bool:
+    """확인 결과를 출력하고 훑는 단계가 없으면 True (실패한 SQL만 실행 계획까지 출력)"""
+    ok = True
+    for name, passed, checked in check_query_plans(db_path):
+        allowed = FULL_SCANS.get(name)
+        note = f", 전체 읽기 허용: {', '.join(sorted(allowed))}" if allowed else ""
+        print(f"{'✅' if passed else '❌'} {name} (SQL {len(checked)}개{note})")
+        for sql, plan, violations in checked:
+            if not violations:
+                continue
+            print(f"    {' '.join(sql.split())}")
+            for detail in plan:
+                print(f"      {'❌ ' if detail in violations else ''}{detail}")
+        ok = ok and passed
+    return ok
+
+if __name__ == "__main__":
+    sys.exit(0 if print_query_plans(sys.argv[1] if len(sys.argv) > 1 else "menu.db") else 1)
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+매출 집계 테이블 - 주문을 저장하는 트랜잭션 안에서 증분으로 갱신한다
+
+- sales_hourly: 시간대별 주문 수, 수량, 매출
+- sales_menu_items: 날짜/메뉴별 수량, 매출 (옵션 제외 메뉴 가격 기준)
+- sales_options: 날짜/옵션별 수량, 매출
+- sales_status: 날짜/상태별 주문 수, 매출
+
+취소된 주문은 시간대/메뉴/옵션 집계에서 빠지고 상태 집계에만 남는다.
+보관 파일로 옮긴 주문도 집계에는 그대로 남는다 (backfill은 보관 파일까지 훑는다).
+날짜와 시간대는 orders.created_at(UTC) 기준이다.
+
+사용법:
+    python rollups.py backfill [--db menu.db]
+"""
+import argparse
+import sqlite3
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+from order_status import CANCELLED
+
+def hour_bucket(created_at: str) -> str:
+    return f"{created_at[:13]}:00"
+
+def day_bucket(created_at: str) -> str:
+    return created_at[:10]
+
+def create_rollup_tables(cursor: sqlite3.Cursor):
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS sales_hourly (
+            hour TEXT PRIMARY KEY, -- 'YYYY-MM-DD HH:00'
+            order_count INTEGER NOT NULL DEFAULT 0,
+            item_quantity INTEGER NOT NULL DEFAULT 0,
+            revenue INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS sales_menu_items (
+            day TEXT NOT NULL, -- 'YYYY-MM-DD'
+            menu_item_id INTEGER NOT NULL,
+            quantity INTEGER NOT NULL DEFAULT 0,
+            revenue INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (day, menu_item_id)
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS sales_options (
+            day TEXT NOT NULL,
+            option_id INTEGER NOT NULL,
+            quantity INTEGER NOT NULL DEFAULT 0,
+            revenue INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (day, option_id)
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS sales_status (
+            day TEXT NOT NULL,
+            status TEXT NOT NULL,
+            order_count INTEGER NOT NULL DEFAULT 0,
+            revenue INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (day, status)
+        )
+    ''')
+
+_UPSERT_HOURLY = '''
+    INSERT INTO sales_hourly (hour, order_count, item_quantity, revenue) VALUES (?, ?, ?, ?)
+    ON CONFLICT (hour) DO UPDATE SET
+        order_count = order_count + excluded.order_count,
+        item_quantity = item_quantity + excluded.item_quantity,
+        revenue = revenue + excluded.revenue
+'''
+_UPSERT_MENU_ITEMS = '''
+    INSERT INTO sales_menu_items (day, menu_item_id, quantity, revenue) VALUES (?, ?, ?, ?)
+    ON CONFLICT (day, menu_item_id) DO UPDATE SET
+        quantity = quantity + excluded.quantity,
+        revenue = revenue + excluded.revenue
+'''
+_UPSERT_OPTIONS = '''
+    INSERT INTO sales_options (day, option_id, quantity, revenue) VALUES (?, ?, ?, ?)
+    ON CONFLICT (day, option_id) DO UPDATE SET
+        quantity = quantity + excluded.quantity,
+        revenue = revenue + excluded.revenue
+'''
+_UPSERT_STATUS = '''
+    INSERT INTO sales_status (day, status, order_count, revenue) VALUES (?, ?, ?, ?)
+    ON CONFLICT (day, status) DO UPDATE SET
+        order_count = order_count + excluded.order_count,
+        revenue = revenue + excluded.revenue
+'''
+
+def apply_order_sales(cursor: sqlite3.Cursor, order_id: int, created_at: str, total_amount: int,
+                      sign: int = 1):
+    """주문 한 건을 시간대/메뉴/옵션 집계에 더한다 (sign=-1이면 뺀다)"""
+    day = day_bucket(created_at)
+
+    cursor.execute(
+        "SELECT menu_item_id, SUM(quantity), SUM(item_price * quantity) FROM order_items WHERE order_id = ? GROUP BY menu_item_id",
+        (order_id,)
+    )
+    menu_items = cursor.fetchall()
+    cursor.execute(
+        '''
+        SELECT oio.option_id, SUM(oio.quantity), SUM(oio.option_price * oio.quantity)
+        FROM order_items oi
+        JOIN order_item_options oio ON oio.order_item_id = oi.id
+        WHERE oi.order_id = ?
+        GROUP BY oio.option_id
+        ''',
+        (order_id,)
+    )
+    options = cursor.fetchall()
+
+    item_quantity = sum(row[1] for row in menu_items)
+    cursor.execute(_UPSERT_HOURLY, (hour_bucket(created_at), sign, sign * item_quantity, sign * total_amount))
+    cursor.executemany(_UPSERT_MENU_ITEMS, [(day, row[0], sign * row[1], sign * row[2]) for row in menu_items])
+    cursor.executemany(_UPSERT_OPTIONS, [(day, row[0], sign * row[1], sign * row[2]) for row in options])
+
+def apply_status_change(cursor: sqlite3.Cursor, created_at: str, total_amount: int,
+                        from_status, to_status: str):
+    """상태 집계에서 주문 한 건을 from_status에서 to_status로 옮긴다 (새 주문은 from_status=None)"""
+    day = day_bucket(created_at)
+    if from_status is not None:
+        cursor.execute(_UPSERT_STATUS, (day, from_status, -1, -total_amount))
+    cursor.execute(_UPSERT_STATUS, (day, to_status, 1, total_amount))
+
+def record_new_order(cursor: sqlite3.Cursor, order_id: int):
+    """새 주문을 모든 집계에 반영 (place_order 트랜잭션 안에서 호출)"""
+    cursor.execute("SELECT created_at, total_amount, status FROM orders WHERE id = ?", (order_id,))
+    created_at, total_amount, status = cursor.fetchone()
+    if status != CANCELLED:
+        apply_order_sales(cursor, order_id, created_at, total_amount)
+    apply_status_change(cursor, created_at, total_amount, None, status)
+
+def record_status_change(cursor: sqlite3.Cursor, order: Dict, to_status: str):
+    """주문 상태 변경을 집계에 반영 - 취소되면 시간대/메뉴/옵션 매출에서 뺀다"""
+    apply_status_change(cursor, order['created_at'], order['total_amount'], order['status'], to_status)
+    if to_status == CANCELLED and order['status'] != CANCELLED:
+        apply_order_sales(cursor, order['id'], order['created_at'], order['total_amount'], sign=-1)
+
+class RollupBuilder:
+    """원본 주문을 훑어서 집계 값을 모은 뒤 집계 테이블에 한 번에 쓴다
+
+    scan은 스키마마다 한 번씩 호출할 수 있다 (운영 DB와 ATTACH한 보관 파일).
+    """
+
+    def __init__(self):
+        self.hourly: Dict[str, List[int]] = defaultdict(lambda: [0, 0, 0])
+        self.menu_items: Dict[Tuple[str, int], List[int]] = defaultdict(lambda: [0, 0])
+        self.options: Dict[Tuple[str, int], List[int]] = defaultdict(lambda: [0, 0])
+        self.statuses: Dict[Tuple[str, str], List[int]] = defaultdict(lambda: [0, 0])
+        self.orders = 0
+
+    def scan(self, cursor: sqlite3.Cursor, schema: str = "main"):
+        hourly, menu_items, options, statuses = self.hourly, self.menu_items, self.options, self.statuses
+        # 주문 -> 아이템 -> 옵션 순으로 정렬된 한 번의 조인 (집계 크기만큼만 메모리를 쓴다)
+        cursor.execute(f'''
+            SELECT o.id, o.created_at, o.total_amount, o.status,
+                   oi.id, oi.menu_item_id, oi.quantity, oi.item_price,
+                   oio.option_id, oio.quantity, oio.option_price
+            FROM {schema}.orders o
+            LEFT JOIN {schema}.order_items oi ON oi.order_id = o.id
+            LEFT JOIN {schema}.order_item_options oio ON oio.order_item_id = oi.id
+            ORDER BY o.id, oi.id, oio.id
+        ''')
+        last_order_id = last_item_id = None
+        while True:
+            rows = cursor.fetchmany(500)
+            if not rows:
+                break
+            for (order_id, created_at, total_amount, status, item_id, menu_item_id, quantity, item_price,
+                 option_id, option_quantity, option_price) in rows:
+                day = day_bucket(created_at)
+                counted = status != CANCELLED
+                if order_id != last_order_id:
+                    last_order_id, last_item_id = order_id, None
+                    self.orders += 1
+                    statuses[(day, status)][0] += 1
+                    statuses[(day, status)][1] += total_amount
+                    if counted:
+                        bucket = hourly[hour_bucket(created_at)]
+                        bucket[0] += 1
+                        bucket[2] += total_amount
+                if not counted or item_id is None:
+                    continue
+                if item_id != last_item_id:
+                    last_item_id = item_id
+                    hourly[hour_bucket(created_at)][1] += quantity
+                    menu_items[(day, menu_item_id)][0] += quantity
+                    menu_items[(day, menu_item_id)][1] += item_price * quantity
+                if option_id is not None:
+                    options[(day, option_id)][0] += option_quantity
+                    options[(day, option_id)][1] += option_price * option_quantity
+
+    def write(self, cursor: sqlite3.Cursor) -> Dict[str, int]:
+        """집계 테이블을 모은 값으로 바꾼다 (호출하는 쪽에서 쓰기 트랜잭션을 연다)"""
+        for table in ("sales_hourly", "sales_menu_items", "sales_options", "sales_status"):
+            cursor.execute(f"DELETE FROM {table}")
+        cursor.executemany(_UPSERT_HOURLY, [(key, *values) for key, values in self.hourly.items()])
+        cursor.executemany(_UPSERT_MENU_ITEMS, [(*key, *values) for key, values in self.menu_items.items()])
+        cursor.executemany(_UPSERT_OPTIONS, [(*key, *values) for key, values in self.options.items()])
+        cursor.executemany(_UPSERT_STATUS, [(*key, *values) for key, values in self.statuses.items()])
+        return {
+            "orders": self.orders,
+            "sales_hourly": len(self.hourly),
+            "sales_menu_items": len(self.menu_items),
+            "sales_options": len(self.options),
+            "sales_status": len(self.statuses),
+        }
+
+def rebuild_rollups(cursor: sqlite3.Cursor) -> Dict[str, int]:
+    """운영 DB의 주문만으로 집계 테이블을 다시 만든다 (호출하는 쪽에서 트랜잭션을 연다)"""
+    builder = RollupBuilder()
+    builder.scan(cursor)
+    return builder.write(cursor)
+
+def main():
+    parser = argparse.ArgumentParser(description="매출 집계 테이블 관리")
+    parser.add_argument("command", choices=["backfill"])
+    parser.add_argument("--db", default="menu.db", help="SQLite DB 경로")
+    args = parser.parse_args()
+
+    from database import DatabaseManager
+    db_manager = DatabaseManager(args.db)
+    started = time.perf_counter()
+    result = db_manager.rebuild_rollups()
+    elapsed = (time.perf_counter() - started) * 1000
+    print(f"✅ 매출 집계 재생성 완료 ({elapsed:.1f}ms, 주문 {result['orders']}건)")
+    for table in ("sales_hourly", "sales_menu_items", "sales_options", "sales_status"):
+        print(f"  - {table}: {result[table]}행")
+    db_manager.close()
+
+if __name__ == "__main__":
+    try:
+        main()
+    except sqlite3.Error as e:
+        print(f"❌ {e}")
+        sys.exit(1)
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# backend 모듈은 backend 폴더를 기준으로 import한다 (app.py와 같은 방식)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,43 @@
+"""
+order_pricing.price_order - 카탈로그 스냅샷으로 주문 가격을 계산하고 주문할 수 없는 장바구니를 거른다
+"""
+import pytest
+
+from catalog import MenuCatalog
+from models import OrderItem, OrderItemOption
+from order_pricing import PricingError, price_order
+
+@pytest.fixture
+def catalog() -> MenuCatalog:
+    categories = [{'id': 1, 'name': "돈카츠,카레", 'display_name': "돈카츠/카레", 'description': None}]
+    menu_items = [{'id': 10, 'category_id': 1, 'name': "로스카츠", 'price': 9900, 'description': None, 'is_available': 1}]
+    options = [{'id': 100, 'name': "치즈 추가", 'price': 2000, 'option_type': "donkatsu", 'is_available': 1}]
+    return MenuCatalog(1, categories, menu_items, options)
+
+def test_prices_items_and_options(catalog):
+    items = [OrderItem(menu_item_id=10, quantity=2, options=[OrderItemOption(option_id=100, quantity=1)])]
+    total_amount, order_items, order_options = price_order(catalog, items)
+    assert total_amount == 9900 * 2 + 2000
+    assert order_items == [{'menu_item_id': 10, 'quantity': 2, 'item_price': 9900, 'total_price': 21800}]
+    assert order_options == [{'item_index': 0, 'option_id': 100, 'quantity': 1, 'option_price': 2000}]
+
+def test_rejects_empty_cart(catalog):
+    with pytest.raises(PricingError) as error:
+        price_order(catalog, [])
+    assert error.value.status_code == 400
+
+def test_rejects_zero_quantity(catalog):
+    with pytest.raises(PricingError) as error:
+        price_order(catalog, [OrderItem(menu_item_id=10, quantity=0)])
+    assert error.value.status_code == 400
+
+def test_rejects_negative_quantity(catalog):
+    with pytest.raises(PricingError) as error:
+        price_order(catalog, [OrderItem(menu_item_id=10, quantity=-3)])
+    assert error.value.status_code == 400
+
+def test_rejects_non_positive_option_quantity(catalog):
+    items = [OrderItem(menu_item_id=10, options=[OrderItemOption(option_id=100, quantity=0)])]
+    with pytest.raises(PricingError) as error:
+        price_order(catalog, items)
+    assert error.value.status_code == 400
@@ -0,0 +1,69 @@
+"""
+음성 안내 생성 및 캐시
+메뉴 버전이 바뀔 때까지 렌더링한 안내 텍스트와 JSON을 재사용한다
+"""
+import asyncio
+import json
+from typing import List, Dict, Any, Optional
+
+from async_database import AsyncDatabaseManager
+from models import VoiceGuideResponse
+
+GUIDE_GREETING = "안녕하세요. 반갑습니다. 주문하고 싶은 메뉴가 있으시면 메뉴명을 말씀해주시고, 못 정하셨으면 '메뉴'라고 말해 주세요."
+GUIDE_CLOSING = "주문하고 싶은 메뉴가 있으시면 메뉴명을 말씀해주세요."
+
+def render_guide_text(categories: List[Dict[str, Any]]) -> str:
+    """카테고리별 샘플 메뉴로 음성 안내 텍스트 생성"""
+    lines = []
+    for category in categories:
+        sample_menus = category['sample_menus']
+        if sample_menus:
+            lines.append(f"• {category['display_name']} 탭을 누르시면 {', '.join(sample_menus)} 등의 메뉴가 있습니다.")
+        else:
+            lines.append(f"• {category['display_name']} 탭을 누르시면 다양한 메뉴가 있습니다.")
+    return (
+        f"{GUIDE_GREETING}\n\n"
+        "저희 매장에는 다음과 같은 메뉴가 있습니다:\n\n"
+        + "".join(f"{line}\n" for line in lines)
+        + f"\n{GUIDE_CLOSING}"
+    )
+
+class VoiceGuide:
+    """특정 메뉴 버전의 렌더링된 음성 안내"""
+
+    def __init__(self, version: int, categories: List[Dict[str, Any]]):
+        self.version = version
+        self.sample_menus = {
+            category['display_name']: category['sample_menus'] for category in categories
+        }
+        self.guide_text = render_guide_text(categories)
+        # 응답 본문을 미리 직렬화해 둔다
+        self.json_body = VoiceGuideResponse(
+            categories=categories,
+            sample_menus=self.sample_menus
+        ).model_dump_json().encode('utf-8')
+        self.text_body = json.dumps(
+            {"guide_text": self.guide_text}, ensure_ascii=False, separators=(",", ":")
+        ).encode('utf-8')
+
+class VoiceGuideCache:
+    """메뉴 버전별 음성 안내 캐시"""
+
+    def __init__(self, async_db: AsyncDatabaseManager, sample_size: int = 3):
+        self.async_db = async_db
+        self.sample_size = sample_size
+        self._guide: Optional[VoiceGuide] = None
+        self._lock = asyncio.Lock()
+
+    async def get(self, version: int) -> VoiceGuide:
+        guide = self._guide
+        if guide is not None and guide.version == version:
+            return guide
+        # 동시에 들어온 캐시 미스는 한 번만 조회한다
+        async with self._lock:
+            guide = self._guide
+            if guide is None or guide.version != version:
+                categories = await self.async_db.get_voice_guide_data(self.sample_size)
+                guide = VoiceGuide(version, categories)
+                self._guide = guide
+            return guide
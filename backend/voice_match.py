@@ -0,0 +1,154 @@
+"""
+음성 명령 매칭 - STT 결과 문장에서 메뉴/옵션 후보를 점수순으로 찾는다
+카탈로그 버전마다 정규화한 이름과 2-gram 역색인, 자모 퍼지 색인을 한 번만 만든다
+"""
+import re
+from collections import defaultdict
+from typing import List, Dict, Any, Optional, Iterable, Set
+
+from hangul import FuzzyIndex
+
+_NON_WORD = re.compile(r"[^0-9a-z가-힣ㄱ-ㅣ]")
+
+# 퍼지 매칭 전에 문장에서 떼어 내는 주문 표현 (정규화된 형태)
+FILLER_WORDS = ("주문할게요", "주세요", "할게요", "줘요", "하나", "한개", "두개", "좀")
+
+# "정식 에이"처럼 알파벳을 한글 발음으로 받아 적은 단어
+SPOKEN_LETTERS = {"에이": "a", "비": "b", "씨": "c", "디": "d", "에스": "s"}
+
+MIN_SCORE = 0.35
+FUZZY_WEIGHT = 0.85  # 자모 유사도는 이름 전체/일부가 그대로 들어 있는 경우보다 낮게 둔다
+
+def normalize_name(text: str) -> str:
+    """소문자로 바꾸고 공백, 괄호, 문장부호를 모두 제거"""
+    return _NON_WORD.sub("", text.lower())
+
+def spell_letters(transcript: str) -> str:
+    """띄어 쓴 알파벳 발음("에이", "비")을 알파벳으로 바꾼다"""
+    return " ".join(SPOKEN_LETTERS.get(word, word) for word in transcript.split())
+
+def strip_fillers(query: str) -> str:
+    for word in FILLER_WORDS:
+        query = query.replace(word, "")
+    return query
+
+def ngrams(text: str, n: int = 2) -> Set[str]:
+    if len(text) < n:
+        return {text} if text else set()
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+def score_name(query: str, query_grams: Set[str], name: str, name_grams: Set[str]) -> float:
+    """정규화된 문장과 이름의 유사도 (0~1)"""
+    if not query or not name:
+        return 0.0
+    if query == name:
+        return 1.0
+    if name in query:
+        # "한우쌀국수 주세요"처럼 이름 전체를 말한 경우 - 문장에서 차지하는 비율이 클수록 우선
+        return 0.9 + 0.09 * len(name) / len(query)
+    if query in name:
+        # "로스카츠"처럼 이름 일부만 말한 경우
+        return 0.6 + 0.25 * len(query) / len(name)
+    shared = len(query_grams & name_grams)
+    if not shared:
+        return 0.0
+    # 2-gram Dice 계수
+    return 0.75 * 2 * shared / (len(query_grams) + len(name_grams))
+
+class _Entry:
+    __slots__ = ("kind", "item", "key", "grams")
+
+    def __init__(self, kind: str, item: Dict[str, Any]):
+        self.kind = kind
+        self.item = item
+        self.key = normalize_name(item['name'])
+        self.grams = ngrams(self.key)
+
+class MenuNameIndex:
+    """메뉴/옵션 이름 역색인 (카탈로그 한 버전용)"""
+
+    def __init__(self, catalog):
+        self.version = catalog.version
+        self.catalog = catalog
+        self.entries: List[_Entry] = []
+        for items in catalog.menu_items_by_category.values():
+            self.entries.extend(_Entry("menu", item) for item in items)
+        for options in catalog.options_by_type.values():
+            self.entries.extend(_Entry("option", option) for option in options)
+
+        self._by_gram: Dict[str, List[int]] = defaultdict(list)
+        for position, entry in enumerate(self.entries):
+            for gram in entry.grams:
+                self._by_gram[gram].append(position)
+
+        # 오인식/초성 검색용 자모 색인
+        self.fuzzy = FuzzyIndex([entry.key for entry in self.entries])
+
+    def _candidates(self, query_grams: Iterable[str]) -> Set[int]:
+        positions: Set[int] = set()
+        for gram in query_grams:
+            positions.update(self._by_gram.get(gram, ()))
+        return positions
+
+    def match(self, transcript: str, limit: int = 5,
+              menu_item_id: Optional[int] = None) -> Dict[str, Any]:
+        """문장과 비슷한 메뉴/옵션 후보를 점수 내림차순으로 반환
+
+        menu_item_id를 주면 그 메뉴에 선택할 수 있는 옵션만 후보로 삼는다.
+        """
+        query = normalize_name(spell_letters(transcript))
+        query_grams = ngrams(query)
+
+        option_types = None
+        if menu_item_id is not None:
+            menu_item = self.catalog.get_menu_item_by_id(menu_item_id)
+            option_types = self.catalog.get_option_types(menu_item['category_id']) if menu_item else ()
+
+        def allowed(position: int) -> bool:
+            entry = self.entries[position]
+            return entry.kind != "option" or option_types is None or entry.item['option_type'] in option_types
+
+        scores: Dict[int, float] = {}
+        for position in self._candidates(query_grams):
+            if allowed(position):
+                entry = self.entries[position]
+                scores[position] = score_name(query, query_grams, entry.key, entry.grams)
+        # 이름이 그대로 들어 있는 후보가 없을 때만 자모 퍼지 매칭을 한다
+        if max(scores.values(), default=0.0) < FUZZY_WEIGHT:
+            for position, similarity in self.fuzzy.search(strip_fillers(query), limit=limit * 2, allowed=allowed):
+                scores[position] = max(scores.get(position, 0.0), FUZZY_WEIGHT * similarity)
+
+        scored = {"menu": [], "option": []}
+        for position, score in scores.items():
+            if score >= MIN_SCORE:
+                entry = self.entries[position]
+                scored[entry.kind].append((score, entry.item))
+
+        def ranked(candidates, fields):
+            # 점수가 같으면 id 순으로 정렬해 키오스크마다 같은 결과가 나오게 한다
+            candidates.sort(key=lambda pair: (-pair[0], pair[1]['id']))
+            return [
+                dict({field: item[field] for field in fields}, score=round(score, 4))
+                for score, item in candidates[:limit]
+            ]
+
+        return {
+            "version": self.version,
+            "transcript": transcript,
+            "normalized": query,
+            "menus": ranked(scored["menu"], ("id", "name", "price", "category_id", "category_name")),
+            "options": ranked(scored["option"], ("id", "name", "price", "option_type")),
+        }
+
+class NameIndexCache:
+    """최근 카탈로그 버전의 MenuNameIndex 보관"""
+
+    def __init__(self):
+        self._index: Optional[MenuNameIndex] = None
+
+    def get(self, catalog) -> MenuNameIndex:
+        index = self._index
+        if index is None or index.catalog is not catalog:
+            index = MenuNameIndex(catalog)
+            self._index = index
+        return index
@@ -28,6 +28,11 @@ class APIClient {
         }
     }
 
+    // 전체 카탈로그 조회 (카테고리, 메뉴, 옵션 그룹)
+    async getCatalog() {
+        return this.request('/catalog');
+    }
+
     // 카테고리 조회
     async getCategories() {
         return this.request('/categories');
@@ -48,12 +53,27 @@ class APIClient {
         return this.request(`/options/${optionType}`);
     }
 
-    // 주문 생성
-    async createOrder(orderData) {
-        return this.request('/orders', {
-            method: 'POST',
-            body: JSON.stringify(orderData)
-        });
+    // 주문 생성 (응답을 못 받으면 같은 Idempotency-Key로 다시 보내서 주문이 두 번 생기지 않게 한다)
+    async createOrder(orderData, retries = 2) {
+        const idempotencyKey = crypto.randomUUID ? crypto.randomUUID() : `${Date.now()}-${Math.random().toString(36).slice(2)}`;
+        for (let attempt = 0; ; attempt++) {
+            try {
+                return await this.request('/orders', {
+                    method: 'POST',
+                    headers: {
+                        'Content-Type': 'application/json',
+                        'Idempotency-Key': idempotencyKey
+                    },
+                    body: JSON.stringify(orderData)
+                });
+            } catch (error) {
+                // 네트워크 오류(TypeError)만 재시도한다
+                if (!(error instanceof TypeError) || attempt >= retries) {
+                    throw error;
+                }
+                await new Promise(resolve => setTimeout(resolve, 500 * (attempt + 1)));
+            }
+        }
     }
 
     // 음성 안내 텍스트 조회
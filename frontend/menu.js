@@ -3,17 +3,22 @@ let categories = [];
 let menuItems = {};
 
 document.addEventListener('DOMContentLoaded', async function() {
-    await loadCategories();
-    await loadMenuItems();
+    await loadCatalog();
     setupEventListeners();
 });
 
-async function loadCategories() {
+// 카테고리와 메뉴를 /catalog 한 번으로 로드
+async function loadCatalog() {
     try {
-        categories = await apiClient.getCategories();
-        console.log('카테고리 로드 완료:', categories);
+        const catalog = await apiClient.getCatalog();
+        categories = catalog.categories;
+        categories.forEach(category => {
+            menuItems[category.id] = category.menu_items;
+        });
+        console.log('카탈로그 로드 완료:', categories);
+        renderMenuItems();
     } catch (error) {
-        console.error('카테고리 로드 실패:', error);
+        console.error('카탈로그 로드 실패:', error);
         // 기본 카테고리 사용
         categories = [
             { id: 1, name: '쌀국수', display_name: '쌀국수' },
@@ -24,19 +29,6 @@ async function loadCategories() {
     }
 }
 
-async function loadMenuItems() {
-    try {
-        for (const category of categories) {
-            const items = await apiClient.getMenuByCategory(category.id);
-            menuItems[category.id] = items;
-        }
-        console.log('메뉴 아이템 로드 완료:', menuItems);
-        renderMenuItems();
-    } catch (error) {
-        console.error('메뉴 아이템 로드 실패:', error);
-    }
-}
-
 function renderMenuItems() {
     const menuContainer = document.getElementById('menuItems');
     if (!menuContainer) return;